@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+"""
+Benchmark runner and regression check.
+
+    python -m s120_inequality_innovation.bench run --horizon 1000 --mc 4
+    python -m s120_inequality_innovation.bench run --only slice2 mc_baseline --save-baseline
+    python -m s120_inequality_innovation.bench compare reports/bench/latest.json --threshold 0.15
+
+``run`` writes ``reports/bench/<timestamp>.json`` and ``reports/bench/latest.json``
+(``--save-baseline`` also ``reports/bench/baseline.json``). ``compare`` flags
+cases whose throughput dropped, or whose peak RSS or bytes written grew, by
+more than the threshold relative to the baseline, and exits non-zero if any did.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .suite import CASES, BenchConfig, _run_in_process, run_case
+
+
+DEFAULT_DIR = Path("reports") / "bench"
+BASELINE_NAME = "baseline.json"
+LATEST_NAME = "latest.json"
+DEFAULT_THRESHOLD = 0.15
+# (result key, True if larger is better)
+COMPARED = [("rate", True), ("peak_rss_mb", False), ("bytes_written", False)]
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_suite(cfg: BenchConfig, names: List[str], repeat: int = 1) -> Dict:
+    results = {}
+    for name in names:
+        trials = [run_case(name, cfg) for _ in range(max(1, repeat))]
+        # Best throughput over repeats; the worst memory seen
+        best = max(trials, key=lambda r: r["rate"])
+        best["peak_rss_mb"] = max(r["peak_rss_mb"] for r in trials)
+        best["repeats"] = len(trials)
+        results[name] = best
+        print(f"{name:16s} {best['rate']:14.1f} {best['unit']}/s  {best['seconds']:8.3f}s  "
+              f"{best['peak_rss_mb']:8.1f} MB RSS  {best['bytes_written'] / 1e6:8.2f} MB written")
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "git_rev": _git_rev(),
+            "python": platform.python_version(), "platform": platform.platform(), "config": asdict(cfg),
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """Regression messages for cases present in both result sets."""
+    out: List[str] = []
+    if current["meta"].get("config") != baseline["meta"].get("config"):
+        print(f"note: configs differ (baseline {baseline['meta'].get('config')}, "
+              f"current {current['meta'].get('config')})")
+    for name, cur in sorted(current["results"].items()):
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        for key, higher_better in COMPARED:
+            b, c = float(base.get(key, 0.0)), float(cur.get(key, 0.0))
+            if b <= 0:
+                continue
+            change = (c - b) / b
+            worse = -change if higher_better else change
+            status = "REGRESSION" if worse > threshold else "ok"
+            line = f"{status:10s} {name:16s} {key:14s} {b:14.4g} -> {c:14.4g} ({change:+.1%})"
+            print(line)
+            if worse > threshold:
+                out.append(line)
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Benchmarks for s120_inequality_innovation")
+    sub = p.add_subparsers(dest="cmd", required=True)
+    r = sub.add_parser("run", help="Run benchmark cases and store results as JSON")
+    r.add_argument("--only", nargs="+", choices=sorted(CASES), default=None, help="Cases to run (default all)")
+    r.add_argument("--horizon", type=int, default=BenchConfig.horizon)
+    r.add_argument("--mc", type=int, default=BenchConfig.mc, help="Replications (and gini rows)")
+    r.add_argument("--agents", type=int, default=BenchConfig.agents, help="Values per gini row")
+    r.add_argument("-j", "--jobs", type=int, default=BenchConfig.jobs, help="Worker processes for mc_baseline")
+    r.add_argument("--repeat", type=int, default=1, help="Repeat each case, keeping the best throughput")
+    r.add_argument("--out-dir", default=str(DEFAULT_DIR))
+    r.add_argument("--save-baseline", action="store_true", help=f"Also write {BASELINE_NAME}")
+    c = sub.add_parser("compare", help="Flag regressions against a saved baseline")
+    c.add_argument("current", nargs="?", default=str(DEFAULT_DIR / LATEST_NAME))
+    c.add_argument("--baseline", default=str(DEFAULT_DIR / BASELINE_NAME))
+    c.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Relative change tolerated")
+    one = sub.add_parser("_case")  # internal: one case in this interpreter, JSON on stdout
+    one.add_argument("name", choices=sorted(CASES))
+    one.add_argument("--config", required=True)
+    a = p.parse_args(argv)
+
+    if a.cmd == "_case":
+        print(json.dumps(_run_in_process(a.name, BenchConfig(**json.loads(a.config)))))
+        return 0
+    if a.cmd == "run":
+        cfg = BenchConfig(horizon=a.horizon, mc=a.mc, agents=a.agents, jobs=a.jobs)
+        res = run_suite(cfg, a.only or list(CASES), repeat=a.repeat)
+        out_dir = Path(a.out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        names = [time.strftime("%Y%m%d-%H%M%S") + ".json", LATEST_NAME] + ([BASELINE_NAME] if a.save_baseline else [])
+        for n in names:
+            (out_dir / n).write_text(json.dumps(res, indent=2, sort_keys=True), encoding="utf-8")
+        print(f"wrote {out_dir / names[0]}")
+        return 0
+    current = json.loads(Path(a.current).read_text(encoding="utf-8"))
+    baseline_p = Path(a.baseline)
+    if not baseline_p.exists():
+        print(f"no baseline at {baseline_p}; save one with 'run --save-baseline'")
+        return 2
+    regressions = compare(current, json.loads(baseline_p.read_text(encoding="utf-8")), a.threshold)
+    print(f"{len(regressions)} regression(s) beyond {a.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+"""
+Benchmark cases for the engines, the flow ledger, metrics and I/O.
+
+Each case runs once in a fresh interpreter (see ``run_case``), so its peak
+RSS is its own and imports are paid before the clock starts. A case gets a
+scratch directory and a ``BenchConfig`` and returns how many periods (or
+items, for ``gini``/``fm_check``) it processed; bytes written are measured
+from the scratch directory afterwards.
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+@dataclass
+class BenchConfig:
+    horizon: int = 1000
+    mc: int = 4
+    agents: int = 100_000
+    jobs: int = 1
+
+
+# name -> (unit, case)
+CASES: Dict[str, Tuple[str, Callable[[Path, BenchConfig], int]]] = {}
+
+
+def case(name: str, unit: str = "periods"):
+    def deco(fn: Callable[[Path, BenchConfig], int]):
+        CASES[name] = (unit, fn)
+        return fn
+    return deco
+
+
+def _params():
+    from s120_inequality_innovation.core.registry import ParameterRegistry
+
+    return ParameterRegistry.from_files()
+
+
+@case("slice1")
+def _slice1(out: Path, cfg: BenchConfig) -> int:
+    from s120_inequality_innovation.core.slice1_engine import run_slice1
+
+    run_slice1(_params(), horizon=cfg.horizon, outdir=out)
+    return cfg.horizon
+
+
+@case("slice2")
+def _slice2(out: Path, cfg: BenchConfig) -> int:
+    from s120_inequality_innovation.core.slice2_engine import run_slice2
+
+    run_slice2(_params(), horizon=cfg.horizon, outdir=out)
+    return cfg.horizon
+
+
+@case("slice3")
+def _slice3(out: Path, cfg: BenchConfig) -> int:
+    from s120_inequality_innovation.core.slice3_engine import run_slice3
+
+    run_slice3(_params(), horizon=cfg.horizon, outdir=out)
+    return cfg.horizon
+
+
+@case("scheduler")
+def _scheduler(out: Path, cfg: BenchConfig) -> int:
+    from s120_inequality_innovation.core.scheduler import run_simulation
+
+    run_simulation(_params(), horizon=cfg.horizon, artifacts_dir=out)
+    return cfg.horizon
+
+
+@case("mc_baseline")
+def _mc_baseline(out: Path, cfg: BenchConfig) -> int:
+    from s120_inequality_innovation.mc.runner import run_baseline_smoke
+
+    run_baseline_smoke(out, overrides={"meta": {"horizon": cfg.horizon, "mc_runs": cfg.mc}}, jobs=cfg.jobs)
+    return cfg.horizon * cfg.mc
+
+
+@case("fm_check", unit="checks")
+def _fm_check(out: Path, cfg: BenchConfig) -> int:
+    from s120_inequality_innovation.core.flowmatrix_glue import fm_assert_ok, fm_new_context, fm_start_period
+
+    ctx = fm_new_context()
+    acc = ctx.accounts
+    agents = ["HH", "FirmC", "FirmK", "BankB", "GovG", "CB"]
+    n = 0
+    for t in range(1, cfg.horizon + 1):
+        fm_start_period(ctx, t)
+        # Roughly a slice3 period: a dozen balanced flow pairs between checks
+        for k in range(12):
+            a, b = agents[k % 6], agents[(k + 1) % 6]
+            ctx.fm.log_flow((acc.CA, acc.CA), 1.0 + k, a, b, f"flow_{k}")
+            ctx.fm.log_flow((acc.KA, acc.KA), 1.0 + k, b, a, f"flow_{k}")
+            if k % 3 == 2:
+                fm_assert_ok(ctx)
+                n += 1
+    return n
+
+
+@case("gini", unit="values")
+def _gini(out: Path, cfg: BenchConfig) -> int:
+    import numpy as np
+
+    from s120_inequality_innovation.io.metrics import gini
+
+    x = np.random.default_rng(0).lognormal(size=(cfg.mc, cfg.agents))
+    gini(x)
+    return x.size
+
+
+def _innovation_gains(cfg: BenchConfig, xi_inn: float) -> int:
+    import numpy as np
+
+    from s120_inequality_innovation.core.rng import innovation_gains
+
+    n = cfg.horizon * cfg.mc * 25
+    innovation_gains(np.random.default_rng(0), xi_inn, n)
+    return n
+
+
+@case("rnd_gains", unit="draws")
+def _rnd_gains(out: Path, cfg: BenchConfig) -> int:
+    return _innovation_gains(cfg, float(_params().get("innovation.xi_inn")))
+
+
+@case("rnd_gains_xi03", unit="draws")
+def _rnd_gains_xi03(out: Path, cfg: BenchConfig) -> int:
+    # Frequent successes, where the block path hands over to per-period draws
+    return _innovation_gains(cfg, 0.3)
+
+
+@case("writer")
+def _writer(out: Path, cfg: BenchConfig) -> int:
+    from s120_inequality_innovation.io.writer import ArtifactWriter
+
+    for run in range(1, cfg.mc + 1):
+        with ArtifactWriter.create(out / f"run_{run:03d}", {"run_id": run}) as aw:
+            for t in range(1, cfg.horizon + 1):
+                aw.append_series(t, 100.0 + t, 60.0, 20.0, 0.02, 0.07)
+                aw.append_timeline_row([t, 19, "19_cb_advances", time.time_ns()])
+    return cfg.horizon * cfg.mc
+
+
+def write_raw_reports(raw: Path, horizon: int, firms: int = 50):
+    """Synthetic JMAB raw report CSVs with the names the oracle collector looks for."""
+    import numpy as np
+
+    raw.mkdir(parents=True, exist_ok=True)
+    t = np.arange(1, horizon + 1)
+    cols = {
+        "data_nominalGDP.csv": 100.0 + t,
+        "data_unemployment.csv": 0.05 + 0.0 * t,
+        "data_nominalInvestment.csv": 5.0 * t,
+        "data_workersNominalConsumption.csv": 40.0 + t,
+        "data_managersNominalConsumption.csv": 10.0 + 0.0 * t,
+        "data_cAvPrice.csv": 1.001 ** t,
+        "data_cFirmsAggregateDebt.csv": 50.0 + 0.0 * t,
+    }
+    for name, v in cols.items():
+        np.savetxt(raw / name, np.column_stack([t, v]), delimiter=",", header="t,v", comments="", fmt="%.10g")
+    wide = np.column_stack([t] + [1.0 + 0.001 * t * (i + 1) for i in range(firms)])
+    header = ",".join(["t"] + [f"f{i}" for i in range(firms)])
+    np.savetxt(raw / "data_cProductivity.csv", wide, delimiter=",", header=header, comments="", fmt="%.10g")
+
+
+@case("oracle_collect")
+def _oracle_collect(out: Path, cfg: BenchConfig) -> int:
+    from s120_inequality_innovation.oracle.cli import _collect_from_raw_dir
+
+    # Inputs are generated before the clock in run_case; this times a cold collect (no parse cache)
+    _collect_from_raw_dir(out / "raw", use_cache=False)
+    return cfg.horizon
+
+
+_SETUP: Dict[str, Callable[[Path, BenchConfig], None]] = {
+    "oracle_collect": lambda out, cfg: write_raw_reports(out / "raw", cfg.horizon),
+}
+
+
+def _tree_bytes(p: Path) -> int:
+    return sum(f.stat().st_size for f in p.rglob("*") if f.is_file())
+
+
+def _peak_rss_bytes() -> int:
+    ru = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    ch = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return max(ru, ch) * scale
+
+
+def _run_in_process(name: str, cfg: BenchConfig) -> Dict[str, float]:
+    unit, fn = CASES[name]
+    with tempfile.TemporaryDirectory(prefix=f"s120_bench_{name}_") as d:
+        out = Path(d)
+        # Runs made by benchmarks must not land in the shared run catalog
+        os.environ["S120_CATALOG"] = "off"
+        if name in _SETUP:
+            _SETUP[name](out, cfg)
+        before = _tree_bytes(out)
+        t0 = time.perf_counter()
+        c0 = time.process_time()
+        n = fn(out, cfg)
+        wall = time.perf_counter() - t0
+        cpu = time.process_time() - c0
+        written = _tree_bytes(out) - before
+    return {
+        "unit": unit, "count": n, "seconds": wall, "cpu_seconds": cpu,
+        "rate": n / wall if wall > 0 else float("inf"),
+        "peak_rss_mb": _peak_rss_bytes() / 2 ** 20, "bytes_written": written,
+    }
+
+
+def run_case(name: str, cfg: BenchConfig) -> Dict[str, float]:
+    """Run one case in a fresh interpreter and return its measurements."""
+    proc = subprocess.run(
+        [sys.executable, "-m", "s120_inequality_innovation.bench", "_case", name, "--config", json.dumps(asdict(cfg))],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"benchmark {name} failed:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
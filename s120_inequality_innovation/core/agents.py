@@ -0,0 +1,445 @@
+from __future__ import annotations
+
+"""
+Struct-of-arrays agent store.
+
+Each agent class is an ``AgentTable``: one contiguous NumPy column per field
+of its schema plus an integer ``id`` column, with spare capacity so bulk
+``add`` amortizes growth. Rows stay dense: ``remove`` compacts survivors in
+place (keeping their order) and ids are never reused, so ``rows(ids)`` maps
+ids back to rows through an id -> row index. Cross-class links (a
+household's ``employer``, an agent's ``bank``) hold ids, -1 for none.
+
+``table["wealth"]`` is a view of the live rows, so in-place updates write
+through; ``table.where(mask)`` selects a subset for gathered reads and
+scattered writes. Step functions take whole tables and do a handful of
+vectorized operations per period whatever the population. Payments always
+have a payer: with ``banks`` the deposit moves are rebooked at both sides'
+banks, and with a ``FMContext`` each class total is logged as a flow pair,
+so the period passes the FlowMatrix checks:
+
+    store = AgentStore.initial(params, seed=seed)
+    hire(store.households, store.cfirms, vacancies, rng)
+    pay_wages(store.households, store.cfirms, store.banks, ctx)
+    inequality(store.households)   # Gini_income, Gini_wealth, Top10_*
+
+``slice2_engine`` runs its labour and consumption markets on a store when
+given ``households`` and writes the per-period inequality through an
+``InequalityBlock``, which batches the metrics over blocks of periods.
+"""
+
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Dict, Iterator, Mapping, Optional
+
+import numpy as np
+
+from .flowmatrix_glue import FMContext
+from .registry import ParameterRegistry
+from .rng import AGENT_CLASSES, SeedLike, class_stream
+from ..io.sinks import Schema
+
+
+HOUSEHOLD_SCHEMA: Schema = [
+    ("wealth", "f8"), ("income", "f8"), ("deposits", "f8"), ("employer", "i8"),
+    ("wage", "f8"), ("reservation_wage", "f8"), ("bank", "i8"),
+]
+CFIRM_SCHEMA: Schema = [
+    ("productivity", "f8"), ("deposits", "f8"), ("loans", "f8"), ("price", "f8"), ("markup", "f8"),
+    ("inventories", "f8"), ("capital", "f8"), ("employees", "i8"), ("bank", "i8"),
+]
+KFIRM_SCHEMA: Schema = [
+    ("productivity", "f8"), ("deposits", "f8"), ("loans", "f8"), ("price", "f8"), ("markup", "f8"),
+    ("inventories", "f8"), ("employees", "i8"), ("bank", "i8"),
+]
+BANK_SCHEMA: Schema = [
+    ("deposits", "f8"), ("loans", "f8"), ("reserves", "f8"), ("bonds", "f8"), ("capital", "f8"),
+]
+AGENT_SCHEMAS: Dict[str, Schema] = dict(zip(AGENT_CLASSES, (HOUSEHOLD_SCHEMA, CFIRM_SCHEMA, KFIRM_SCHEMA, BANK_SCHEMA)))
+# Id-valued columns start unlinked
+LINK_COLUMNS = ("employer", "bank")
+# Paper's benchmark population; override with population.<class> in the parameters
+DEFAULT_POPULATION: Dict[str, int] = {"households": 8000, "cfirms": 200, "kfirms": 50, "banks": 10}
+
+
+class AgentTable:
+    """One agent class as contiguous columns; see the module docstring."""
+
+    def __init__(self, schema: Schema, capacity: int = 0):
+        self.schema = list(schema)
+        cap = max(1, int(capacity))
+        self._cols: Dict[str, np.ndarray] = {name: np.zeros(cap, dtype=dt) for name, dt in self.schema}
+        self._ids = np.zeros(cap, dtype=np.int64)
+        # id -> row, -1 once removed; ids are issued in order so this is indexed directly
+        self._row = np.full(cap, -1, dtype=np.int64)
+        self.n = 0
+        self.next_id = 0
+
+    def __len__(self) -> int:
+        return self.n
+
+    @property
+    def columns(self) -> list:
+        return [name for name, _ in self.schema]
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self._ids[: self.n]
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._cols[name][: self.n]
+
+    def __setitem__(self, name: str, values):
+        self._cols[name][: self.n] = values
+
+    def _reserve(self, n: int):
+        cap = self._ids.size
+        if n > cap:
+            new = max(n, 2 * cap)
+            for name, col in self._cols.items():
+                grown = np.zeros(new, dtype=col.dtype)
+                grown[: self.n] = col[: self.n]
+                self._cols[name] = grown
+            ids = np.zeros(new, dtype=np.int64)
+            ids[: self.n] = self._ids[: self.n]
+            self._ids = ids
+        if self.next_id + (n - self.n) > self._row.size:
+            row = np.full(max(self.next_id + n - self.n, 2 * self._row.size), -1, dtype=np.int64)
+            row[: self._row.size] = self._row
+            self._row = row
+
+    def add(self, n: int = 1, **values) -> np.ndarray:
+        """Append ``n`` agents; ``values`` are scalars or length-``n`` arrays per column. Returns their ids."""
+        unknown = set(values) - set(self._cols)
+        if unknown:
+            raise KeyError(f"Unknown columns {sorted(unknown)}; expected a subset of {self.columns}")
+        lo, hi = self.n, self.n + int(n)
+        self._reserve(hi)
+        for name, col in self._cols.items():
+            col[lo:hi] = values.get(name, -1 if name in LINK_COLUMNS else 0)
+        ids = np.arange(self.next_id, self.next_id + (hi - lo), dtype=np.int64)
+        self._ids[lo:hi] = ids
+        self._row[ids] = np.arange(lo, hi)
+        self.n, self.next_id = hi, self.next_id + (hi - lo)
+        return ids
+
+    def rows(self, ids) -> np.ndarray:
+        """Row of each id; raises ``KeyError`` for ids that were never issued or were removed."""
+        ids = np.asarray(ids, dtype=np.int64)
+        ok = (ids >= 0) & (ids < self.next_id)
+        rows = np.full(ids.shape, -1, dtype=np.int64)
+        rows[ok] = self._row[ids[ok]]
+        if (rows < 0).any():
+            raise KeyError(f"Unknown agent ids {ids[rows < 0][:5].tolist()}")
+        return rows
+
+    def remove(self, which) -> np.ndarray:
+        """Drop agents given by a boolean row mask or an array of ids; returns the removed ids."""
+        which = np.asarray(which)
+        drop = np.zeros(self.n, dtype=bool)
+        if which.dtype == bool:
+            drop[:] = which
+        else:
+            drop[self.rows(which)] = True
+        gone = self.ids[drop].copy()
+        keep = ~drop
+        k = int(keep.sum())
+        for col in self._cols.values():
+            col[:k] = col[: self.n][keep]
+        self._ids[:k] = self._ids[: self.n][keep]
+        self._row[gone] = -1
+        self._row[self._ids[:k]] = np.arange(k)
+        self.n = k
+        return gone
+
+    def where(self, mask) -> "AgentView":
+        """Rows where ``mask`` holds; valid until the next ``add``/``remove``."""
+        return AgentView(self, np.flatnonzero(mask))
+
+    def to_dict(self) -> Dict[str, np.ndarray]:
+        """Copies of the live columns, ``id`` first."""
+        return {"id": self.ids.copy(), **{name: self[name].copy() for name in self.columns}}
+
+
+class AgentView:
+    """Subset of an ``AgentTable``'s rows: reads gather, writes scatter back."""
+
+    def __init__(self, table: AgentTable, rows: np.ndarray):
+        self.table = table
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return self.rows.size
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self.table.ids[self.rows]
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.table[name][self.rows]
+
+    def __setitem__(self, name: str, values):
+        self.table[name][self.rows] = values
+
+
+@dataclass
+class AgentStore:
+    households: AgentTable
+    cfirms: AgentTable
+    kfirms: AgentTable
+    banks: AgentTable
+
+    @classmethod
+    def empty(cls, population: Optional[Mapping[str, int]] = None) -> "AgentStore":
+        """Tables with capacity reserved for ``population`` (default ``DEFAULT_POPULATION``)."""
+        pop = {**DEFAULT_POPULATION, **(population or {})}
+        return cls(**{c: AgentTable(AGENT_SCHEMAS[c], pop[c]) for c in AGENT_CLASSES})
+
+    @classmethod
+    def initial(cls, params: ParameterRegistry, population: Optional[Mapping[str, int]] = None,
+                seed: SeedLike | None = None) -> "AgentStore":
+        """Homogeneous starting population, sized by ``population.<class>`` in ``params``.
+
+        Stocks are the slice engines' aggregates split evenly; with ``seed``
+        every household and firm is attached to a random bank drawn from its
+        class's ``"init"`` ``rng.class_stream``, otherwise round-robin. Bank deposits
+        are the sum of their customers' deposits.
+        """
+        pop = {c: int(params.get(f"population.{c}", n)) for c, n in DEFAULT_POPULATION.items()}
+        pop.update(population or {})
+        store = cls.empty(pop)
+        banks = store.banks.add(pop["banks"], loans=50.0 / pop["banks"], reserves=10.0 / pop["banks"],
+                                capital=20.0 / pop["banks"])
+
+        def lenders(agent_class: str, n: int) -> np.ndarray:
+            if seed is not None:
+                return class_stream(seed, agent_class, "init").choice(banks, size=n)
+            return banks[np.arange(n) % banks.size]
+
+        n_c, n_k = pop["cfirms"], pop["kfirms"]
+        mu_c, mu_k = float(params.get("markups.mu_c0", 0.3)), float(params.get("markups.mu_k0", 0.05))
+        store.cfirms.add(n_c, productivity=1.0, markup=mu_c, price=1.0 + mu_c, inventories=10.0 / n_c,
+                         capital=100.0 / n_c, loans=50.0 / n_c, bank=lenders("cfirms", n_c))
+        store.kfirms.add(n_k, productivity=1.0, markup=mu_k, price=1.0 + mu_k, bank=lenders("kfirms", n_k))
+        n_h = pop["households"]
+        dep = 100.0 / n_h
+        hh = store.households
+        hh.add(n_h, deposits=dep, wealth=dep, wage=1.0, reservation_wage=1.0, bank=lenders("households", n_h))
+        store.banks["deposits"] = np.bincount(store.banks.rows(hh["bank"]), weights=hh["deposits"],
+                                              minlength=len(store.banks))
+        return store
+
+    def save(self, path: Path):
+        """Every table's live columns and id counter in one ``.npz`` (for checkpoints)."""
+        arrays = {}
+        for name, table in self:
+            arrays.update({f"{name}.{col}": v for col, v in table.to_dict().items()})
+            arrays[f"{name}.next_id"] = np.array(table.next_id)
+        tmp = Path(path).with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+        # Atomic like Checkpoint.save: a crash mid-write keeps the previous snapshot
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "AgentStore":
+        with np.load(path) as z:
+            tables = {}
+            for c in AGENT_CLASSES:
+                ids = z[f"{c}.id"]
+                t = AgentTable(AGENT_SCHEMAS[c], max(ids.size, int(z[f"{c}.next_id"])))
+                t.add(ids.size, **{col: z[f"{c}.{col}"] for col in t.columns})
+                t._ids[: ids.size] = ids
+                t._row[:] = -1
+                t._row[ids] = np.arange(ids.size)
+                t.next_id = int(z[f"{c}.next_id"])
+                tables[c] = t
+        return cls(**tables)
+
+    def __iter__(self) -> Iterator[tuple]:
+        return ((f.name, getattr(self, f.name)) for f in fields(self))
+
+    def __getitem__(self, agent_class: str) -> AgentTable:
+        if agent_class not in AGENT_CLASSES:
+            raise KeyError(f"Unknown agent class {agent_class!r}; expected one of {AGENT_CLASSES}")
+        return getattr(self, agent_class)
+
+
+def hire(households: AgentTable, firms: AgentTable, vacancies, rng: np.random.Generator) -> int:
+    """Fill each firm's ``vacancies`` (per row) from the unemployed, in random order; returns hires."""
+    unemployed = np.flatnonzero(households["employer"] < 0)
+    slots = np.repeat(firms.ids, np.maximum(0, np.asarray(vacancies, dtype=np.int64)))
+    n = min(unemployed.size, slots.size)
+    if n == 0:
+        return 0
+    who = rng.permutation(unemployed)[:n]
+    where = rng.permutation(slots)[:n]
+    households["employer"][who] = where
+    firms["employees"] += np.bincount(firms.rows(where), minlength=len(firms))
+    return n
+
+
+def fire(households: AgentTable, firms: AgentTable, mask) -> int:
+    """Separate the households selected by ``mask``; returns how many were employed."""
+    leaving = np.flatnonzero(np.asarray(mask) & (households["employer"] >= 0))
+    if leaving.size:
+        firms["employees"] -= np.bincount(firms.rows(households["employer"][leaving]), minlength=len(firms))
+        households["employer"][leaving] = -1
+    return int(leaving.size)
+
+
+def match_employment(households: AgentTable, firms: AgentTable, unemployment: float,
+                     rng: np.random.Generator) -> int:
+    """Hire or fire at random until the unemployment rate is ``unemployment``; returns the net change.
+
+    Vacancies are spread evenly over ``firms``.
+    """
+    employed = households["employer"] >= 0
+    gap = int(round((1.0 - unemployment) * len(households))) - int(employed.sum())
+    if gap > 0 and len(firms):
+        vacancies = np.full(len(firms), gap // len(firms))
+        vacancies[: gap % len(firms)] += 1
+        return hire(households, firms, vacancies, rng)
+    if gap < 0:
+        mask = np.zeros(len(households), dtype=bool)
+        mask[rng.choice(np.flatnonzero(employed), size=-gap, replace=False)] = True
+        return -fire(households, firms, mask)
+    return 0
+
+
+def _log_tx(ctx: Optional[FMContext], agent_from: str, agent_to: str, amount: float, subject: str):
+    if ctx is None or amount == 0.0:
+        return
+    acc = ctx.accounts
+    ctx.fm.log_flow((acc.CA, acc.CA), float(amount), agent_from, agent_to, subject)
+    ctx.fm.log_flow((acc.KA, acc.KA), float(amount), agent_to, agent_from, subject)
+
+
+def _transfer_between_banks(banks: Optional[AgentTable], payer_bank, payee_bank, amounts):
+    """Rebook deposit liabilities, settled in reserves, when deposits move between customers' banks."""
+    if banks is None:
+        return
+    n = len(banks)
+    net = (np.bincount(banks.rows(payee_bank), weights=amounts, minlength=n)
+           - np.bincount(banks.rows(payer_bank), weights=amounts, minlength=n))
+    banks["deposits"] += net
+    banks["reserves"] += net
+
+
+def pay_wages(households: AgentTable, firms: AgentTable, banks: Optional[AgentTable] = None,
+              ctx: Optional[FMContext] = None, dole: float = 0.0) -> float:
+    """Employed households earn their wage from their employer's deposits, the rest ``dole``.
+
+    Sets ``income`` for the period and credits it to ``deposits`` and
+    ``wealth``. Firm deposits fall by the wage bill, which is returned;
+    ``dole`` is paid by the government (``GovG``, outside the store). With
+    ``banks`` both sides are rebooked at the agents' banks; with ``ctx`` the
+    class totals are logged as ``wages`` and ``dole`` flows.
+    """
+    employer = households["employer"]
+    employed = employer >= 0
+    income = np.where(employed, households["wage"], dole)
+    households["income"] = income
+    households["deposits"] += income
+    households["wealth"] += income
+    firm_rows = firms.rows(employer[employed])
+    bill = np.bincount(firm_rows, weights=income[employed], minlength=len(firms))
+    firms["deposits"] -= bill
+    _transfer_between_banks(banks, firms["bank"][firm_rows], households["bank"][employed], income[employed])
+    if banks is not None and dole:
+        # Government pays out of its reserve account, so the households' banks gain both
+        paid = np.bincount(banks.rows(households["bank"][~employed]), weights=income[~employed], minlength=len(banks))
+        banks["deposits"] += paid
+        banks["reserves"] += paid
+    wage_bill = float(bill.sum())
+    _log_tx(ctx, "FirmC", "HH", wage_bill, "wages")
+    _log_tx(ctx, "GovG", "HH", float(income[~employed].sum()), "dole")
+    return wage_bill
+
+
+def consume(households: AgentTable, firms: AgentTable, amount: float, banks: Optional[AgentTable] = None,
+            ctx: Optional[FMContext] = None) -> float:
+    """Households spend ``amount`` in proportion to their deposits (never more than
+    they hold), split evenly over ``firms``; returns what was spent."""
+    dep = np.maximum(households["deposits"], 0.0)
+    total = float(dep.sum())
+    if total <= 0.0 or amount <= 0.0 or len(firms) == 0:
+        return 0.0
+    spend = dep * min(1.0, amount / total)
+    households["deposits"] -= spend
+    households["wealth"] -= spend
+    spent = float(spend.sum())
+    receipts = np.full(len(firms), spent / len(firms))
+    firms["deposits"] += receipts
+    if banks is not None:
+        n = len(banks)
+        net = (np.bincount(banks.rows(firms["bank"]), weights=receipts, minlength=n)
+               - np.bincount(banks.rows(households["bank"]), weights=spend, minlength=n))
+        banks["deposits"] += net
+        banks["reserves"] += net
+    _log_tx(ctx, "HH", "FirmC", spent, "consumption")
+    return spent
+
+
+def pay_deposit_interest(households: AgentTable, banks: AgentTable, rate: float,
+                         ctx: Optional[FMContext] = None) -> np.ndarray:
+    """Each household's bank pays ``rate`` on its deposits; returns the interest per household.
+
+    The interest is credited to the households' ``deposits``, ``wealth`` and
+    ``income``; each bank's deposit liabilities rise and its capital falls
+    by what it pays, and with ``ctx`` the total is logged as
+    ``interest_deposit``.
+    """
+    interest = rate * np.maximum(households["deposits"], 0.0)
+    households["deposits"] += interest
+    households["wealth"] += interest
+    households["income"] += interest
+    paid = np.bincount(banks.rows(households["bank"]), weights=interest, minlength=len(banks))
+    banks["deposits"] += paid
+    banks["capital"] -= paid
+    _log_tx(ctx, "BankB", "HH", float(paid.sum()), "interest_deposit")
+    return interest
+
+
+def inequality(households: AgentTable, weights=None):
+    """``Gini_income``/``Gini_wealth`` and top-10% shares of the current household columns."""
+    from ..io.metrics import compute_inequality_df
+
+    return compute_inequality_df(households["income"], households["wealth"], weights,
+                                 top_shares=True).iloc[0].to_dict()
+
+
+class InequalityBlock:
+    """Household income and wealth buffered over periods, summarised per block.
+
+    ``add`` copies the period's columns into ``(block, N)`` buffers;
+    ``flush`` computes every buffered period with one batched
+    ``io.metrics.compute_inequality_df`` call (one sort per column for the
+    whole block) and returns ``(t, Gini_income, Gini_wealth, Top10_income,
+    Top10_wealth)`` rows. The population must not change within a block.
+    """
+
+    def __init__(self, n: int, block: int = 64):
+        self.t = np.empty(block, dtype=np.int64)
+        self.income = np.empty((block, n))
+        self.wealth = np.empty((block, n))
+        self.k = 0
+
+    def add(self, t: int, households: AgentTable) -> bool:
+        """Buffer period ``t``; True when the block is full and should be flushed."""
+        if len(households) != self.income.shape[1]:
+            raise ValueError(f"InequalityBlock holds {self.income.shape[1]} households, got {len(households)}")
+        self.t[self.k] = t
+        self.income[self.k] = households["income"]
+        self.wealth[self.k] = households["wealth"]
+        self.k += 1
+        return self.k == len(self.t)
+
+    def flush(self):
+        from ..io.metrics import compute_inequality_df
+
+        if self.k == 0:
+            return []
+        k, self.k = self.k, 0
+        df = compute_inequality_df(self.income[:k], self.wealth[:k], top_shares=True)
+        return list(zip(self.t[:k].tolist(), *(df[c].tolist() for c in df.columns)))
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+"""
+Batched ("ensemble") variants of the slice1/slice2 engines.
+
+Every state field is an array of shape (n_runs,) and each step is a single
+vectorized expression across replications. Step functions mirror the scalar
+ones in ``slice1_engine``/``slice2_engine`` operation for operation, so each
+run reproduces its scalar counterpart up to floating-point tolerance.
+"""
+
+import csv
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from .registry import CompiledParams, ParameterRegistry
+from .flowmatrix_glue import FMContext, fm_new_context, fm_start_period, fm_assert_ok, fm_end_period
+from .profiling import profiler_from_env
+from .rng import SeedLike, innovation_gains
+from .slice1_engine import Slice1State, _log_tx
+from .slice2_engine import Slice2State
+
+
+def _broadcast_defaults(scalar_cls, n_runs: int) -> dict:
+    # Seed every array field from the scalar dataclass defaults
+    out = {}
+    for f in fields(scalar_cls):
+        dtype = np.int64 if isinstance(f.default, int) and not isinstance(f.default, bool) else float
+        out[f.name] = np.full(n_runs, f.default, dtype=dtype)
+    return out
+
+
+@dataclass
+class Slice1EnsembleState:
+    s_expected: np.ndarray
+    s_realized: np.ndarray
+    inventories: np.ndarray
+    markup: np.ndarray
+    price: np.ndarray
+    wage: np.ndarray
+    prod: np.ndarray
+    labor_supply: np.ndarray
+    inflation: np.ndarray
+    unemployment: np.ndarray
+
+    @classmethod
+    def initial(cls, n_runs: int) -> "Slice1EnsembleState":
+        return cls(**_broadcast_defaults(Slice1State, n_runs))
+
+
+@dataclass
+class Slice2EnsembleState:
+    prod_c: np.ndarray
+    wage: np.ndarray
+    markup: np.ndarray
+    price: np.ndarray
+    inventories: np.ndarray
+    expected_sales: np.ndarray
+    realized_sales: np.ndarray
+    labor_supply: np.ndarray
+    unemployment: np.ndarray
+    capital_stock: np.ndarray
+    orders_pending_next: np.ndarray
+    inn_success: np.ndarray
+    inn_trials: np.ndarray
+
+    @classmethod
+    def initial(cls, n_runs: int) -> "Slice2EnsembleState":
+        return cls(**_broadcast_defaults(Slice2State, n_runs))
+
+
+# --- Slice 1 -----------------------------------------------------------------
+
+def step1_production_planning(state: Slice1EnsembleState, p: CompiledParams) -> Tuple[np.ndarray, np.ndarray]:
+    lam = 0.2
+    state.s_expected = state.s_expected + lam * (state.s_realized - state.s_expected)
+    nu = p.inventories.nu_target
+    yD = np.maximum(0.0, state.s_expected * (1.0 + nu) - state.inventories)
+    inv_target = state.s_expected * nu
+    return yD, inv_target
+
+
+def step2_labor_demand(state: Slice1EnsembleState, yD: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    N = yD / np.maximum(1e-9, state.prod)
+    u = np.maximum(0.0, np.minimum(0.5, 1.0 - N / np.maximum(1e-9, state.labor_supply)))
+    state.unemployment = u
+    return N, u
+
+
+def _markup_update(markup: np.ndarray, inventories: np.ndarray, inv_target: np.ndarray) -> np.ndarray:
+    adj = np.where(inventories - inv_target > 0, -0.01, 0.01)
+    return np.minimum(1.0, np.maximum(0.0, markup + adj))
+
+
+def step3_pricing_markup(state: Slice1EnsembleState, p: CompiledParams, yD: np.ndarray, inv_target: np.ndarray):
+    state.markup = _markup_update(state.markup, state.inventories, inv_target)
+    ulc = state.wage / np.maximum(1e-9, state.prod)
+    p_old = state.price
+    state.price = (1.0 + state.markup) * ulc
+    state.inflation = state.price / np.maximum(1e-9, p_old) - 1.0
+
+
+def step12_consumption_and_sales(ctx: FMContext, state: Slice1EnsembleState, p: CompiledParams, y: np.ndarray):
+    alpha = 0.6
+    desired_cons = alpha * state.s_expected
+    sales = np.minimum(state.inventories + y, desired_cons)
+    state.inventories = np.maximum(0.0, state.inventories + y - sales)
+    value = sales * state.price
+    # One balanced pair for the whole ensemble keeps the SFC check per period
+    _log_tx(ctx, "HH", "FirmC", float(value.sum()), "consumption")
+    state.s_realized = sales
+
+
+def _wage_drift(wage: np.ndarray, unemployment: np.ndarray, tu: float) -> np.ndarray:
+    drift = np.where(unemployment > 0.1, -0.001 * tu, 0.001)
+    return np.maximum(0.1, wage * (1.0 + drift))
+
+
+def step14_wages(ctx: FMContext, state: Slice1EnsembleState, N: np.ndarray, p: CompiledParams) -> np.ndarray:
+    tu = p.wage_rigidity.tu
+    state.wage = _wage_drift(state.wage, state.unemployment, tu)
+    wage_bill = state.wage * N
+    _log_tx(ctx, "FirmC", "HH", float(wage_bill.sum()), "wages")
+    return wage_bill
+
+
+def _write_run_csvs(outdir: Path, fname: str, header: List[str], columns: List[np.ndarray]) -> List[Path]:
+    """Write (horizon, n_runs) ``columns`` as ``run_XXX/<fname>`` with a leading t column."""
+    paths = []
+    horizon = columns[0].shape[0]
+    t = list(range(1, horizon + 1))
+    for i in range(columns[0].shape[1]):
+        run_dir = outdir / f"run_{i + 1:03d}"
+        run_dir.mkdir(parents=True, exist_ok=True)
+        path = run_dir / fname
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(header)
+            w.writerows(zip(t, *[c[:, i].tolist() for c in columns]))
+        paths.append(path)
+    return paths
+
+
+SERIES_HEADER = ["t", "GDP", "CONS", "INV", "INFL", "UNEMP", "PROD_C"]
+
+
+def run_slice1_ensemble(params: ParameterRegistry, horizon: int, outdir: Path, n_runs: int) -> List[Path]:
+    """Advance ``n_runs`` slice1 economies together; returns per-run series.csv paths."""
+    outdir.mkdir(parents=True, exist_ok=True)
+    ctx = fm_new_context()
+    p = params.compiled()
+    state = Slice1EnsembleState.initial(n_runs)
+    # (t, run, [GDP, CONS, INV, INFL, UNEMP, PROD_C])
+    table = np.empty((horizon, n_runs, 6))
+    prof = profiler_from_env()
+    step1, step2, step3 = (prof.wrap(step1_production_planning, 1), prof.wrap(step2_labor_demand, 2),
+                           prof.wrap(step3_pricing_markup, 3))
+    step12, step14 = prof.wrap(step12_consumption_and_sales, 12), prof.wrap(step14_wages, 14)
+    check = prof.wrap(fm_assert_ok, "fm_check")
+    end_period = fm_end_period if ctx.verify.strict else prof.wrap(fm_end_period, "fm_check")
+    for t in range(1, horizon + 1):
+        fm_start_period(ctx, t)
+        yD, inv_target = step1(state, p)
+        N, u = step2(state, yD)
+        step3(state, p, yD, inv_target)
+        check(ctx, 3)
+        check(ctx, 7)
+        y = yD
+        step12(ctx, state, p, y)
+        check(ctx, 12)
+        step14(ctx, state, N, p)
+        check(ctx, 16)
+        check(ctx, 19)
+        end_period(ctx)
+        row = table[t - 1]
+        row[:, 0] = state.s_realized * state.price
+        row[:, 1] = row[:, 0]
+        row[:, 2] = 0.0
+        row[:, 3] = state.inflation
+        row[:, 4] = state.unemployment
+        row[:, 5] = state.prod
+    tok = prof.start()
+    paths = _write_run_csvs(outdir, "series.csv", SERIES_HEADER, list(np.moveaxis(table, 2, 0)))
+    prof.stop("output", tok)
+    prof.save(outdir)
+    return paths
+
+
+# --- Slice 2 -----------------------------------------------------------------
+
+def step1_expected_sales_and_target(state: Slice2EnsembleState, p: CompiledParams) -> Tuple[np.ndarray, np.ndarray]:
+    lam = 0.2
+    state.expected_sales = state.expected_sales + lam * (state.realized_sales - state.expected_sales)
+    nu = p.inventories.nu_target
+    yD = np.maximum(0.0, state.expected_sales * (1.0 + nu) - state.inventories)
+    inv_target = state.expected_sales * nu
+    return yD, inv_target
+
+
+def step3_markup_and_price(state: Slice2EnsembleState, inv_target: np.ndarray):
+    state.markup = _markup_update(state.markup, state.inventories, inv_target)
+    ulc = state.wage / np.maximum(1e-9, state.prod_c)
+    state.price = (1.0 + state.markup) * ulc
+
+
+def step4_desired_capacity_and_investment(state: Slice2EnsembleState, p: CompiledParams, yD: np.ndarray) -> np.ndarray:
+    r_target = p.capital_and_loans.target_profit_rate
+    u_target = p.capital_and_loans.target_utilization
+    gamma1 = p.capital_and_loans.gamma1
+    gamma2 = p.capital_and_loans.gamma2
+    capacity = np.maximum(1e-9, state.capital_stock * state.prod_c)
+    u = np.minimum(1.0, yD / capacity)
+    profit_rate = (state.markup / np.maximum(1e-9, (1.0 + state.markup))) * u
+    g = gamma1 * (profit_rate - r_target) + gamma2 * (u - u_target)
+    g = np.maximum(-0.2, np.minimum(0.2, g))
+    desired_capacity_next = capacity * (1.0 + g)
+    return np.maximum(0.0, (desired_capacity_next - capacity) / np.maximum(1e-9, state.prod_c))
+
+
+def step10_11_deliver_capital_and_update_prod(state: Slice2EnsembleState, new_orders: np.ndarray, prod_gain_next: np.ndarray):
+    state.capital_stock = state.capital_stock + state.orders_pending_next
+    state.orders_pending_next = new_orders
+    state.prod_c = np.where(prod_gain_next > 0, state.prod_c * (1.0 + prod_gain_next), state.prod_c)
+
+
+def step12_sales(state: Slice2EnsembleState, y: np.ndarray) -> np.ndarray:
+    alpha = 0.6
+    desired_cons = alpha * state.expected_sales
+    sales = np.minimum(state.inventories + y, desired_cons)
+    state.inventories = np.maximum(0.0, state.inventories + y - sales)
+    state.realized_sales = sales
+    return sales
+
+
+def step14_wages_and_unemployment(state: Slice2EnsembleState, yD: np.ndarray, p: CompiledParams) -> np.ndarray:
+    N = yD / np.maximum(1e-9, state.prod_c)
+    u = np.maximum(0.0, np.minimum(0.5, 1.0 - N / np.maximum(1e-9, state.labor_supply)))
+    state.unemployment = u
+    tu = p.wage_rigidity.tu
+    state.wage = _wage_drift(state.wage, u, tu)
+    return state.wage * N
+
+
+def run_slice2_ensemble(params: ParameterRegistry, horizon: int, outdir: Path, seeds: Sequence[SeedLike]) -> List[Path]:
+    """Advance one slice2 economy per seed; run i matches ``run_slice2(seed=seeds[i])``."""
+    outdir.mkdir(parents=True, exist_ok=True)
+    n_runs = len(seeds)
+    ctx = fm_new_context()
+    p = params.compiled()
+    state = Slice2EnsembleState.initial(n_runs)
+    xi_inn = p.innovation.xi_inn
+    # (t, run) gains; R&D draws do not depend on state so they are drawn up front
+    gains = np.stack(
+        [innovation_gains(np.random.default_rng(s), xi_inn, horizon) for s in seeds], axis=1
+    ) if n_runs else np.zeros((horizon, 0))
+    table = np.empty((horizon, n_runs, 6))
+    success = np.empty((horizon, n_runs), dtype=np.int64)
+    trials = np.empty((horizon, n_runs), dtype=np.int64)
+    prod_gain_buffer = np.zeros(n_runs)
+    prof = profiler_from_env()
+    step1, step3 = prof.wrap(step1_expected_sales_and_target, 1), prof.wrap(step3_markup_and_price, 3)
+    step4 = prof.wrap(step4_desired_capacity_and_investment, 4)
+    step10_11, step12, step14 = (prof.wrap(step10_11_deliver_capital_and_update_prod, 10),
+                                 prof.wrap(step12_sales, 12), prof.wrap(step14_wages_and_unemployment, 14))
+    check = prof.wrap(fm_assert_ok, "fm_check")
+    end_period = fm_end_period if ctx.verify.strict else prof.wrap(fm_end_period, "fm_check")
+    for t in range(1, horizon + 1):
+        fm_start_period(ctx, t)
+        yD, inv_target = step1(state, p)
+        step3(state, inv_target)
+        inv_units = step4(state, p, yD)
+        prod_gain_next = gains[t - 1]
+        state.inn_trials += 1
+        state.inn_success += prod_gain_next > 0
+        check(ctx, 3)
+        y = yD
+        step10_11(state, inv_units, prod_gain_buffer)
+        prod_gain_buffer = prod_gain_next
+        sales = step12(state, y)
+        check(ctx, 12)
+        step14(state, yD, p)
+        check(ctx, 16)
+        check(ctx, 19)
+        end_period(ctx)
+        row = table[t - 1]
+        row[:, 0] = sales * state.price
+        row[:, 1] = row[:, 0]
+        row[:, 2] = inv_units * state.price
+        row[:, 3] = 0.0
+        row[:, 4] = state.unemployment
+        row[:, 5] = state.prod_c
+        success[t - 1] = state.inn_success
+        trials[t - 1] = state.inn_trials
+    tok = prof.start()
+    paths = _write_run_csvs(outdir, "series.csv", SERIES_HEADER, list(np.moveaxis(table, 2, 0)))
+    _write_run_csvs(
+        outdir, "diag_innovation.csv", ["t", "inn_success_cum", "inn_trials_cum", "prod_c"],
+        [success, trials, table[:, :, 5]],
+    )
+    prof.stop("output", tok)
+    prof.save(outdir)
+    return paths
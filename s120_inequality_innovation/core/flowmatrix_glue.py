@@ -1,34 +1,332 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional, Tuple
+"""
+Flow ledger glue between the engines and the SFC consistency check.
+
+Engines log flows through ``fm_log``/``_log_tx``, call ``fm_assert_ok(ctx, step)``
+at their cut-points and ``fm_end_period(ctx)`` when a period is complete.
+How much of that is actually verified is a ``VerifyPolicy``
+(``$S120_FM_VERIFY``):
+
+  - ``strict``: full check at every cut-point (default).
+  - ``end-of-period``: one check per period, at ``fm_end_period``.
+  - ``every:K``: like ``end-of-period`` on periods divisible by K only.
+  - ``checksum``: the native ledger skips its running totals and keeps two
+    weighted running sums instead, one over column entries (per agent) and
+    one over row entries (per subject and account), both compared with zero
+    at the end of each period. Nothing is stored per flow.
+  - ``checksum+journal``: ``checksum`` that also journals, see below.
+
+In ``end-of-period``, ``every:K`` and ``checksum+journal`` the native ledger
+journals the period's flows and cut-points: one tuple per ``log_flow``,
+kept until the period ends. When a period fails, the journal is replayed
+through a strict ledger to report the first cut-point whose check fails,
+so no engine state has to be rewound; the replay is authoritative, so a
+checksum mismatch that is within the strict tolerances passes. Plain
+``checksum`` only reports the failing period and identity: rerun that
+period under ``strict``, e.g. with ``resume_from`` the last checkpoint
+before it, to find the step.
+"""
+
+import os
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-from sfctools import FlowMatrix  # type: ignore
-from sfctools.core.flow_matrix import Accounts  # type: ignore
 import numpy as np
 
+if TYPE_CHECKING:
+    from sfctools import FlowMatrix  # type: ignore
+
+
+FM_BACKENDS = ("ledger", "sfctools")
+VERIFY_ENV = "S120_FM_VERIFY"
+VERIFY_MODES = ("strict", "end-of-period", "every", "checksum")
+# Spacing of the per-agent checksum weights (golden ratio: distinct, no RNG involved)
+_PHI = 0.6180339887498949
+_EPS = np.finfo(float).eps
+
+
+class LedgerAccounts(Enum):
+    """Account ids for the native ledger, matching ``sfctools``' ``Accounts`` values.
+
+    sfctools costs about a second to import, so it is only loaded for the
+    ``sfctools`` backend; ``FMContext.accounts`` is the enum to log with.
+    """
+
+    CA = 0
+    KA = 1
+
+
+class FlowLedger:
+    """Array-backed flow ledger with the FlowMatrix calls the engines use.
+
+    Agents and subjects (transaction rows) are interned to integer ids and
+    every ``log_flow`` updates running totals, so the consistency check is a
+    max-abs over O(agents + subjects) floats. A row is a subject on one
+    account (CA or KA), so a leg booked on one account without its
+    counterpart on the same account leaves a row residual; a column is an
+    agent with its CA and KA entries netted, which is the identity the
+    ``_log_tx`` flow/stock pairs are built to close.
+    """
+
+    def __init__(self, rtol: float = 1e-9, atol: float = 1e-12, capacity: int = 16,
+                 journal: bool = False, checksum: bool = False):
+        self.rtol = rtol
+        self.atol = atol
+        self._agents: Dict[str, int] = {}
+        self._subjects: Dict[str, int] = {}
+        # (agent, account) running column totals; (subject, account) running row totals
+        self._cols = np.zeros((capacity, 2))
+        self._rows = np.zeros((capacity, 2))
+        self._scale = 0.0
+        # This period's log_flow arguments, with cut-point step numbers interleaved
+        self.journal: Optional[List[Any]] = [] if journal else None
+        self.checksum = checksum
+        self._weights: List[float] = []
+        self._row_weights: List[float] = []
+        self._hash = 0.0
+        self._row_hash = 0.0
+        self._mass = 0.0
+
+    def reset(self, verbose: bool = False):
+        # Keep interned ids across periods; agents and subjects recur every period
+        self._cols[:] = 0.0
+        self._rows[:] = 0.0
+        self._scale = 0.0
+        self._hash = 0.0
+        self._row_hash = 0.0
+        self._mass = 0.0
+        if self.journal is not None:
+            self.journal.clear()
+
+    def _intern(self, table: Dict[str, int], key) -> int:
+        idx = table.get(key)
+        if idx is None:
+            idx = table[key] = len(table)
+        return idx
+
+    def _grow(self):
+        n = max(len(self._agents), len(self._subjects))
+        if n > self._rows.shape[0]:
+            cap = max(n, 2 * self._rows.shape[0])
+            cols = np.zeros((cap, 2))
+            cols[: self._cols.shape[0]] = self._cols
+            rows = np.zeros((cap, 2))
+            rows[: self._rows.shape[0]] = self._rows
+            self._cols, self._rows = cols, rows
+
+    def _weight(self, agent) -> float:
+        idx = self._intern(self._agents, str(agent))
+        w = self._weights
+        while len(w) <= idx:
+            w.append(1.0 + (len(w) * _PHI) % 1.0)
+        return w[idx]
+
+    def _row_weight(self, subject, account: int) -> float:
+        idx = 2 * self._intern(self._subjects, str(subject)) + account
+        w = self._row_weights
+        while len(w) <= idx:
+            w.append(1.0 + (len(w) * _PHI) % 1.0)
+        return w[idx]
+
+    def log_flow(self, direction, quantity, agent_from, agent_to, subject, price=None, invert=False):
+        q = float(quantity) * (price if price is not None else 1.0)
+        if invert:
+            q = -q
+        if self.journal is not None:
+            self.journal.append((direction, quantity, agent_from, agent_to, subject, price, invert))
+        src, dst = direction[0].value, direction[1].value
+        if self.checksum:
+            # Column entries weighted per agent, row entries per (subject, account); a
+            # same-account flow adds nothing to the row sum, as it nets to zero in its row
+            self._hash += q * (self._weight(agent_to) - self._weight(agent_from))
+            if src != dst:
+                self._row_hash += q * (self._row_weight(subject, dst) - self._row_weight(subject, src))
+            self._mass += abs(q)
+            self._scale = max(self._scale, abs(q))
+            return
+        a = self._intern(self._agents, str(agent_from))
+        b = self._intern(self._agents, str(agent_to))
+        s = self._intern(self._subjects, str(subject))
+        self._grow()
+        self._cols[a, src] -= q
+        self._cols[b, dst] += q
+        # Each leg lands in the subject's row on its own account
+        self._rows[s, src] -= q
+        self._rows[s, dst] += q
+        self._scale = max(self._scale, abs(q))
+
+    def residuals(self) -> Tuple[float, float]:
+        """(max |(subject, account) row total|, max |agent column total|) for the current period."""
+        n_s, n_a = len(self._subjects), len(self._agents)
+        r = float(np.abs(self._rows[:n_s]).max()) if n_s else 0.0
+        c = float(np.abs(self._cols[:n_a].sum(axis=1)).max()) if n_a else 0.0
+        return r, c
+
+    def mark(self, step: int | None):
+        """Record a cut-point in the journal (deferred verification); no-op without one."""
+        if self.journal is not None:
+            self.journal.append(-1 if step is None else int(step))
+
+    def verify_period(self):
+        """End-of-period check for the deferred modes; raises naming the first failing cut-point."""
+        if self.checksum:
+            # Rounding of the weighted sum grows with the flow volume (weights are < 2)
+            tol = max(self.atol, self.rtol * self._scale) + 8 * _EPS * self._mass
+            if abs(self._hash) <= tol and abs(self._row_hash) <= tol:
+                return
+            if self.journal is None:
+                which = "Column" if abs(self._hash) > tol else "Row"
+                value = self._hash if which == "Column" else self._row_hash
+                raise RuntimeError(f"Inconsistent {which} checksum In Flow Ledger: weighted total = {value:.6e} "
+                                   "(rerun the period under strict verification to locate the step)")
+        else:
+            try:
+                self.check_consistency()
+                return
+            except RuntimeError:
+                if self.journal is None:
+                    raise
+        self.replay()
+
+    def replay(self):
+        """Re-log this period's journal into a strict ledger, checking at each recorded cut-point."""
+        strict = FlowLedger(self.rtol, self.atol)
+        for entry in self.journal:
+            if isinstance(entry, int):
+                try:
+                    strict.check_consistency()
+                except RuntimeError as e:
+                    where = f"step {entry}" if entry >= 0 else "an unnumbered cut-point"
+                    raise RuntimeError(f"{e} (first failing check: {where})") from None
+            else:
+                strict.log_flow(*entry)
+        try:
+            strict.check_consistency()
+        except RuntimeError as e:
+            raise RuntimeError(f"{e} (first failing check: after the last cut-point)") from None
+
+    def check_consistency(self):
+        r, c = self.residuals()
+        tol = max(self.atol, self.rtol * self._scale)
+        if r > tol:
+            raise RuntimeError(f"Inconsistent Row In Flow Ledger: max |row total| = {r:.6e}")
+        if c > tol:
+            worst = int(np.abs(self._cols[: len(self._agents)].sum(axis=1)).argmax())
+            agent = next(k for k, v in self._agents.items() if v == worst)
+            raise RuntimeError(f"Inconsistent Column In Flow Ledger: agent {agent} total = {c:.6e}")
+
+
+@dataclass(frozen=True)
+class VerifyPolicy:
+    mode: str = "strict"
+    every: int = 1
+    # Only read for ``checksum``; the other deferred modes always journal
+    journal: bool = False
+
+    @classmethod
+    def parse(cls, spec: Optional[str]) -> "VerifyPolicy":
+        """``strict``, ``end-of-period``, ``every:K``, ``checksum`` or ``checksum+journal``
+        (``_`` and ``-`` are interchangeable)."""
+        s = (spec or "strict").strip().lower().replace("_", "-")
+        if s == "checksum+journal":
+            return cls("checksum", journal=True)
+        if s.startswith("every"):
+            k = s[len("every"):].lstrip(":-=")
+            if not k.isdigit() or int(k) < 1:
+                raise ValueError(f"Bad verification policy {spec!r}; use every:K with K >= 1")
+            return cls("every", int(k))
+        if s not in VERIFY_MODES or s == "every":
+            raise ValueError(f"Unknown verification policy {spec!r}; "
+                             "expected strict, end-of-period, every:K, checksum or checksum+journal")
+        return cls(s)
+
+    @property
+    def strict(self) -> bool:
+        return self.mode == "strict"
+
+    def due(self, t: int) -> bool:
+        return self.mode != "every" or t % self.every == 0
+
 
 @dataclass
 class FMContext:
-    fm: FlowMatrix
+    fm: FlowLedger | FlowMatrix
     period: int = -1
-    # Track simple residuals (placeholder: zeros if not available)
+    accounts: Any = LedgerAccounts
+    # (max |row|, max |col|) of the latest full check in this period, None until one runs;
+    # ``last_checked`` is the (period, step) it was computed at (step None for end of period)
     last_residuals: Tuple[float, float] | None = None
+    last_checked: Tuple[int, Optional[int]] | None = None
+    verify: VerifyPolicy = field(default_factory=VerifyPolicy)
+
+
+def fm_new_context(backend: Optional[str] = None, verify: VerifyPolicy | str | None = None) -> FMContext:
+    """Context on the native ledger, or on sfctools' FlowMatrix for validation.
+
+    ``backend`` defaults to ``$S120_FM_BACKEND`` or ``"ledger"``; ``verify``
+    to ``$S120_FM_VERIFY`` or ``"strict"``.
+    """
+    backend = backend or os.environ.get("S120_FM_BACKEND", "ledger")
+    if not isinstance(verify, VerifyPolicy):
+        verify = VerifyPolicy.parse(verify or os.environ.get(VERIFY_ENV))
+    if backend == "ledger":
+        checksum = verify.mode == "checksum"
+        journal = verify.journal if checksum else not verify.strict
+        return FMContext(FlowLedger(journal=journal, checksum=checksum), verify=verify)
+    if backend == "sfctools":
+        if verify.mode == "checksum":
+            raise ValueError("checksum verification needs the native ledger backend")
+        from sfctools import FlowMatrix  # type: ignore
+        from sfctools.core.flow_matrix import Accounts  # type: ignore
+
+        return FMContext(FlowMatrix(), accounts=Accounts, verify=verify)
+    raise ValueError(f"Unknown FlowMatrix backend {backend!r}; expected one of {FM_BACKENDS}")
 
 
 def fm_start_period(ctx: FMContext, t: int):
     ctx.period = t
     # The real FlowMatrix is global and period-agnostic; we reset per period.
     ctx.fm.reset()
+    # Deferred policies may not check this period at all; never report the last one's residuals
+    ctx.last_residuals = ctx.last_checked = None
 
 
 def fm_log(ctx: FMContext, source: str, sink: str, amount: float, label: Optional[str] = None):
-    kind = (Accounts.CA, Accounts.CA)
+    kind = (ctx.accounts.CA, ctx.accounts.CA)
     subject = label or "flow"
     ctx.fm.log_flow(kind, float(amount), source, sink, subject)
 
 
-def fm_assert_ok(ctx: FMContext):
+def fm_assert_ok(ctx: FMContext, step: Optional[int] = None):
+    """Cut-point check: full under ``strict``, otherwise only marked for ``fm_end_period``."""
+    if not ctx.verify.strict:
+        if isinstance(ctx.fm, FlowLedger):
+            ctx.fm.mark(step)
+        return
+    _check_now(ctx, step)
+
+
+def fm_end_period(ctx: FMContext):
+    """Verify the finished period under the deferred policies (no-op under ``strict``)."""
+    if ctx.verify.strict or not ctx.verify.due(ctx.period):
+        return
+    try:
+        if isinstance(ctx.fm, FlowLedger):
+            ctx.fm.verify_period()
+        else:
+            _check_now(ctx)
+    except RuntimeError as e:
+        raise RuntimeError(f"period {ctx.period}: {e}") from None
+
+
+def _check_now(ctx: FMContext, step: Optional[int] = None):
+    ctx.last_checked = (ctx.period, step)
+    if isinstance(ctx.fm, FlowLedger):
+        ctx.last_residuals = ctx.fm.residuals()
+        ctx.fm.check_consistency()
+        return
     # Compute residual diagnostics then assert consistency (raises on failure)
     try:
         df = ctx.fm.to_dataframe(group=True)
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+"""
+Per-step profiling keyed by the scheduler's ``STEP_LABELS``.
+
+A ``StepProfiler`` keeps, per step, call counts, wall and CPU nanoseconds,
+optionally allocated-block deltas, and a log2 histogram of wall time per
+call, all in ``np.int64`` arrays preallocated for ``PROFILE_LABELS`` (the
+19 steps plus the FlowMatrix check, output and checkpoint sections). Engines profile
+step functions through ``wrap``, which returns the function itself when
+profiling is off, and time inline sections with ``start``/``stop``.
+
+Profiling is enabled by ``S120_PROFILE=1`` (``S120_PROFILE=alloc`` also
+counts allocations). Each run writes ``profile.json`` next to its series;
+sweeps merge them into a ``profile.json``/``profile.txt`` at their root, and
+
+    python -m s120_inequality_innovation.core.profiling artifacts/experiments/tax_sweep
+
+prints the merged per-step report for any set of run directories.
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .scheduler import STEP_LABELS
+
+
+PROFILE_ENV = "S120_PROFILE"
+PROFILE_NAME = "profile.json"
+REPORT_NAME = "profile.txt"
+# Sections that are not scheduler steps but compete with them for time
+EXTRA_LABELS = ["fm_check", "output", "checkpoint"]
+PROFILE_LABELS: List[str] = list(STEP_LABELS) + EXTRA_LABELS
+# Histogram bucket b holds calls with wall time in [2**(b-1), 2**b) ns
+HIST_BUCKETS = 48
+
+
+class NullProfiler:
+    """Disabled profiler: ``wrap`` hands back the function, everything else is a no-op."""
+
+    enabled = False
+
+    def wrap(self, fn: Callable, step: int | str) -> Callable:
+        return fn
+
+    def start(self) -> None:
+        return None
+
+    def stop(self, step: int | str, token: Any = None):
+        pass
+
+    def save(self, run_dir: Path):
+        pass
+
+
+class StepProfiler:
+    enabled = True
+
+    def __init__(self, labels: List[str] = PROFILE_LABELS, alloc: bool = False):
+        self.labels = list(labels)
+        self.alloc = alloc
+        n = len(self.labels)
+        self._index = {lab: i for i, lab in enumerate(self.labels)}
+        self.calls = np.zeros(n, dtype=np.int64)
+        self.wall_ns = np.zeros(n, dtype=np.int64)
+        self.cpu_ns = np.zeros(n, dtype=np.int64)
+        self.alloc_blocks = np.zeros(n, dtype=np.int64)
+        self.hist = np.zeros((n, HIST_BUCKETS), dtype=np.int64)
+
+    def index(self, step: int | str) -> int:
+        """Counter slot for a 1-based scheduler step number or a label."""
+        if isinstance(step, int):
+            return step - 1
+        return self._index[step]
+
+    def wrap(self, fn: Callable, step: int | str) -> Callable:
+        i = self.index(step)
+        start, stop = self.start, self._stop
+
+        def timed(*args, **kwargs):
+            tok = start()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                stop(i, tok)
+
+        timed.__wrapped__ = fn  # type: ignore[attr-defined]
+        return timed
+
+    def start(self) -> Tuple[int, int, int]:
+        blocks = sys.getallocatedblocks() if self.alloc else 0
+        return time.perf_counter_ns(), time.process_time_ns(), blocks
+
+    def stop(self, step: int | str, token: Tuple[int, int, int]):
+        self._stop(self.index(step), token)
+
+    def _stop(self, i: int, token: Tuple[int, int, int]):
+        wall = time.perf_counter_ns() - token[0]
+        cpu = time.process_time_ns() - token[1]
+        self.calls[i] += 1
+        self.wall_ns[i] += wall
+        self.cpu_ns[i] += cpu
+        if self.alloc:
+            self.alloc_blocks[i] += sys.getallocatedblocks() - token[2]
+        self.hist[i, min(wall.bit_length(), HIST_BUCKETS - 1)] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "labels": self.labels, "alloc": self.alloc,
+            "calls": self.calls.tolist(), "wall_ns": self.wall_ns.tolist(), "cpu_ns": self.cpu_ns.tolist(),
+            "alloc_blocks": self.alloc_blocks.tolist(), "hist": self.hist.tolist(),
+        }
+
+    def save(self, run_dir: Path):
+        run_dir.mkdir(parents=True, exist_ok=True)
+        (run_dir / PROFILE_NAME).write_text(json.dumps(self.to_dict()), encoding="utf-8")
+
+
+def profiler_from_env(enabled: Optional[bool] = None) -> StepProfiler | NullProfiler:
+    """A ``StepProfiler`` when ``enabled`` (default: ``$S120_PROFILE``), else a ``NullProfiler``."""
+    flag = os.environ.get(PROFILE_ENV, "").strip().lower()
+    if enabled is None:
+        enabled = flag not in ("", "0", "off", "false")
+    if not enabled:
+        return NullProfiler()
+    return StepProfiler(alloc=flag == "alloc")
+
+
+def merge(profiles: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum profiles (e.g. every run of a sweep); labels must match."""
+    out: Optional[Dict[str, Any]] = None
+    n = 0
+    for p in profiles:
+        n += 1
+        if out is None:
+            out = {k: (np.asarray(v, dtype=np.int64) if isinstance(v, list) and k != "labels" else v)
+                   for k, v in p.items()}
+            continue
+        if p["labels"] != out["labels"]:
+            raise ValueError("cannot merge profiles with different step labels")
+        for k in ("calls", "wall_ns", "cpu_ns", "alloc_blocks", "hist"):
+            out[k] = out[k] + np.asarray(p[k], dtype=np.int64)
+        out["alloc"] = out["alloc"] or p["alloc"]
+    if out is None:
+        return {}
+    out = {k: (v.tolist() if isinstance(v, np.ndarray) else v) for k, v in out.items()}
+    out["runs"] = n
+    return out
+
+
+def load_profiles(paths: Iterable[Path]) -> List[Dict[str, Any]]:
+    """Every ``profile.json`` under ``paths`` (files or directories, searched recursively)."""
+    out = []
+    for p in paths:
+        files = [p] if p.is_file() else sorted(p.rglob(PROFILE_NAME))
+        for f in files:
+            d = json.loads(f.read_text(encoding="utf-8"))
+            # Skip already-merged sweep reports so runs are not counted twice
+            if "runs" not in d:
+                out.append(d)
+    return out
+
+
+def _hist_quantile(hist: np.ndarray, q: float) -> float:
+    """Upper edge (ns) of the log2 bucket holding quantile ``q``."""
+    total = hist.sum()
+    if total == 0:
+        return 0.0
+    b = int(np.searchsorted(np.cumsum(hist), q * total))
+    return float(2 ** b)
+
+
+def report(profile: Dict[str, Any]) -> str:
+    """Per-step table sorted by wall time: calls, totals, share, mean and p50/p99 buckets."""
+    if not profile:
+        return "no profile data\n"
+    calls = np.asarray(profile["calls"])
+    wall = np.asarray(profile["wall_ns"], dtype=float)
+    cpu = np.asarray(profile["cpu_ns"], dtype=float)
+    allocs = np.asarray(profile["alloc_blocks"])
+    hist = np.asarray(profile["hist"])
+    total = wall.sum() or 1.0
+    head = f"{'step':48s} {'calls':>9s} {'wall ms':>10s} {'cpu ms':>10s} {'share':>6s} {'mean us':>9s} {'p50<=us':>8s} {'p99<=us':>8s}"
+    if profile.get("alloc"):
+        head += f" {'blocks':>9s}"
+    lines = [f"runs: {profile.get('runs', 1)}", head]
+    for i in np.argsort(-wall, kind="stable"):
+        if calls[i] == 0:
+            continue
+        row = (
+            f"{profile['labels'][i]:48s} {calls[i]:9d} {wall[i] / 1e6:10.2f} {cpu[i] / 1e6:10.2f} "
+            f"{wall[i] / total:6.1%} {wall[i] / calls[i] / 1e3:9.2f} "
+            f"{_hist_quantile(hist[i], 0.5) / 1e3:8.2f} {_hist_quantile(hist[i], 0.99) / 1e3:8.2f}"
+        )
+        if profile.get("alloc"):
+            row += f" {allocs[i]:9d}"
+        lines.append(row)
+    return "\n".join(lines) + "\n"
+
+
+def write_report(root: Path, sources: Optional[List[Path]] = None) -> Optional[Path]:
+    """Merge the run profiles under ``root`` (or ``sources``) into ``root/profile.json`` and ``profile.txt``."""
+    merged = merge(load_profiles(sources or [root]))
+    if not merged:
+        return None
+    root.mkdir(parents=True, exist_ok=True)
+    (root / PROFILE_NAME).write_text(json.dumps(merged), encoding="utf-8")
+    out = root / REPORT_NAME
+    out.write_text(report(merged), encoding="utf-8")
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    p = argparse.ArgumentParser(description="Merged per-step profile of run directories")
+    p.add_argument("paths", nargs="+", help="Run or sweep directories (searched for profile.json)")
+    a = p.parse_args(argv)
+    print(report(merge(load_profiles([Path(x) for x in a.paths]))), end="")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,17 +1,95 @@
 from __future__ import annotations
 
+import copy
 import hashlib
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, Sequence, Tuple
 
 import yaml
 
 
+# Parsed YAML keyed by (resolved path, mtime_ns, size); callers get deep copies
+_YAML_CACHE: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+
+
+def load_yaml_cached(path: str | Path) -> Dict[str, Any]:
+    """``yaml.safe_load`` of ``path``, parsed once per file version."""
+    p = Path(path).resolve()
+    st = p.stat()
+    key = (str(p), st.st_mtime_ns, st.st_size)
+    if key not in _YAML_CACHE:
+        with open(p, "r", encoding="utf-8") as f:
+            _YAML_CACHE[key] = yaml.safe_load(f)
+    return copy.deepcopy(_YAML_CACHE[key])
+
+
+class ParamSection:
+    """Immutable attribute view of one parameter group (``params.compiled().rates.i_l0``).
+
+    Concrete subclasses with ``__slots__`` for the group's keys are built by
+    ``_section_class``; nested groups compile to nested sections.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __repr__(self) -> str:
+        body = ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__)
+        return f"{type(self).__name__}({body})"
+
+    def get(self, dotted_key: str, default: Any | None = None) -> Any:
+        node: Any = self
+        for part in dotted_key.split("."):
+            if not isinstance(node, ParamSection) or part not in node.__slots__:
+                return default
+            node = getattr(node, part)
+        return node
+
+
+_SECTION_CLASSES: Dict[Tuple[str, Tuple[str, ...]], type] = {}
+
+
+def _section_class(name: str, keys: Tuple[str, ...]) -> type:
+    ck = (name, keys)
+    if ck not in _SECTION_CLASSES:
+        cls_name = "".join(w.capitalize() for w in name.split("_")) or "CompiledParams"
+        _SECTION_CLASSES[ck] = type(cls_name, (ParamSection,), {"__slots__": keys})
+    return _SECTION_CLASSES[ck]
+
+
+def compile_params(data: Dict[str, Any], name: str = "") -> ParamSection:
+    """Freeze a nested parameter dict into slotted ``ParamSection`` objects.
+
+    Keys must be identifiers; lists become tuples so the view stays immutable.
+    """
+    keys = tuple(str(k) for k in data)
+    bad = [k for k in keys if not k.isidentifier()]
+    if bad:
+        raise KeyError(f"parameter keys are not identifiers: {bad}")
+    obj = object.__new__(_section_class(name, keys))
+    for k, v in data.items():
+        if isinstance(v, dict):
+            v = compile_params(v, str(k))
+        elif isinstance(v, list):
+            v = tuple(v)
+        object.__setattr__(obj, str(k), v)
+    return obj
+
+
+CompiledParams = ParamSection
+
+
 @dataclass
 class ParameterRegistry:
     data: Dict[str, Any]
+    _compiled: ParamSection | None = field(default=None, init=False, repr=False, compare=False)
 
     @classmethod
     def from_files(
@@ -20,13 +98,37 @@ class ParameterRegistry:
         / "config" / "params_default.yaml",
         overrides: Dict[str, Any] | None = None,
     ) -> "ParameterRegistry":
-        with open(default_yaml, "r", encoding="utf-8") as f:
-            base = yaml.safe_load(f)
+        base = load_yaml_cached(default_yaml)
         if overrides:
             base = deep_merge(base, overrides)
         _validate_params(base)
         return cls(base)
 
+    def with_overrides(self, overrides: Dict[str, Any]) -> "ParameterRegistry":
+        """A validated copy with ``overrides`` merged in, without touching the files."""
+        data = deep_merge(copy.deepcopy(self.data), overrides)
+        _validate_params(data)
+        return type(self)(data)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The compiled view's section classes are built at runtime and do not
+        # pickle; process-pool workers rebuild it on first use
+        return {"data": self.data}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.data = state["data"]
+        self._compiled = None
+
+    def compiled(self) -> CompiledParams:
+        """Frozen attribute view of ``data``, built once per registry.
+
+        Resolve it once per run and read ``p.wage_rigidity.tu`` in step
+        functions instead of ``get("wage_rigidity.tu")`` every period.
+        """
+        if self._compiled is None:
+            self._compiled = compile_params(self.data)
+        return self._compiled
+
     def get(self, dotted_key: str, default: Any | None = None) -> Any:
         node = self.data
         for part in dotted_key.split("."):
@@ -38,9 +140,19 @@ class ParameterRegistry:
     def as_dict(self) -> Dict[str, Any]:
         return self.data
 
-    def config_hash(self) -> str:
-        """Stable hash of the parameters for artifact tagging."""
-        payload = json.dumps(self.data, sort_keys=True, separators=(",", ":"))
+    def config_hash(self, exclude: Sequence[str] = ()) -> str:
+        """Stable hash of the parameters for artifact tagging, leaving out the dotted keys in ``exclude``."""
+        data = self.data
+        if exclude:
+            data = copy.deepcopy(data)
+            for key in exclude:
+                *path, last = key.split(".")
+                node = data
+                for part in path:
+                    node = node.get(part) if isinstance(node, dict) else None
+                if isinstance(node, dict):
+                    node.pop(last, None)
+        payload = json.dumps(data, sort_keys=True, separators=(",", ":"))
         return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
 
 
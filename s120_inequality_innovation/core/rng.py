@@ -1,13 +1,20 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import Dict
+from typing import Any, Callable, Dict, List, Mapping, Sequence
 
 import numpy as np
 import yaml
 
 
+SeedLike = int | np.random.SeedSequence
+# Agent classes with their own streams; the index is part of the spawn key, so only append
+AGENT_CLASSES = ("households", "cfirms", "kfirms", "banks")
+# What a class stream is drawn for (store set-up, per-period matching); also part of the spawn key
+STREAM_PURPOSES = ("init", "match")
+
+
 @dataclass
 class RNGStreams:
     rng_model: np.random.Generator
@@ -26,7 +33,47 @@ def load_seeds(path: str | Path | None = None) -> Dict[str, int]:
     return {k: int(v) for k, v in data["streams"].items()}
 
 
-def build_streams(seeds: Dict[str, int]) -> RNGStreams:
+def run_seed_sequence(seed: int, run_id: int) -> np.random.SeedSequence:
+    """Per-run child of ``SeedSequence(seed)``'s spawn tree.
+
+    ``SeedSequence(seed).spawn(n)[i]`` carries ``spawn_key=(i,)``, so building
+    the child directly gives the same stream whatever order or process the runs
+    are scheduled in. ``run_id`` is 1-based like the ``run_XXX`` directories.
+    """
+    return np.random.SeedSequence(int(seed), spawn_key=(run_id - 1,))
+
+
+def run_seed_sequences(seeds: Mapping[str, int], run_id: int) -> Dict[str, np.random.SeedSequence]:
+    """``run_seed_sequence`` for every stream in ``seeds``."""
+    return {k: run_seed_sequence(v, run_id) for k, v in seeds.items()}
+
+
+def class_stream(seed: SeedLike, agent_class: str, purpose: str = "init") -> np.random.Generator:
+    """Philox generator for one agent class and purpose, on the child of
+    ``seed``'s seed sequence keyed by ``(AGENT_CLASSES.index(agent_class),
+    STREAM_PURPOSES.index(purpose))``.
+
+    Each purpose gets its own stream, so e.g. the store's bank assignment and
+    the engine's labour matching never reuse the same draws. Philox is
+    counter-based, so a class stream can be handed to a worker thread and
+    still produce the same draws whichever thread consumes it.
+    """
+    if agent_class not in AGENT_CLASSES:
+        raise ValueError(f"Unknown agent class {agent_class!r}; expected one of {AGENT_CLASSES}")
+    if purpose not in STREAM_PURPOSES:
+        raise ValueError(f"Unknown stream purpose {purpose!r}; expected one of {STREAM_PURPOSES}")
+    ss = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(int(seed))
+    key = tuple(ss.spawn_key) + (AGENT_CLASSES.index(agent_class), STREAM_PURPOSES.index(purpose))
+    return np.random.Generator(np.random.Philox(np.random.SeedSequence(ss.entropy, spawn_key=key)))
+
+
+def agent_stream(seeds: Mapping[str, int], run_id: int, stream: str, agent_class: str,
+                 purpose: str = "init") -> np.random.Generator:
+    """``class_stream`` of one run's stream: ``spawn_key=(run_id - 1, class index, purpose index)``."""
+    return class_stream(run_seed_sequence(seeds[stream], run_id), agent_class, purpose)
+
+
+def build_streams(seeds: Mapping[str, SeedLike]) -> RNGStreams:
     return RNGStreams(
         rng_model=np.random.default_rng(seeds["rng_model"]),
         rng_match=np.random.default_rng(seeds["rng_match"]),
@@ -36,3 +83,151 @@ def build_streams(seeds: Dict[str, int]) -> RNGStreams:
         rng_rnd=np.random.default_rng(seeds["rng_rnd"]),
     )
 
+
+def generator_state(gen: np.random.Generator) -> Dict[str, Any]:
+    """``gen.bit_generator.state`` with arrays (Philox counters and keys) as lists, for JSON checkpoints."""
+    def plain(v):
+        if isinstance(v, np.ndarray):
+            return v.tolist()
+        if isinstance(v, dict):
+            return {k: plain(x) for k, x in v.items()}
+        return v
+
+    return plain(gen.bit_generator.state)
+
+
+def streams_state(rngs: RNGStreams) -> Dict[str, Dict[str, Any]]:
+    """Bit-generator state of every stream (JSON-serializable)."""
+    return {f.name: generator_state(getattr(rngs, f.name)) for f in fields(rngs)}
+
+
+def restore_streams_state(rngs: RNGStreams, states: Mapping[str, Dict[str, Any]]):
+    for name, st in states.items():
+        getattr(rngs, name).bit_generator.state = st
+
+
+class BlockDraws:
+    """Per-period draws taken ``block`` periods at a time from ``gen``.
+
+    ``draw(gen, n)`` returns n periods of draws (a list, so indexing yields
+    Python floats) and must consume ``gen`` exactly as n one-period draws
+    would. Values then do not depend on the block size, and ``gen`` is left
+    where period-by-period drawing would leave it at each block boundary.
+    ``remaining`` caps the block at the periods left to run.
+
+    ``state()`` is the generator state at the start of the current block,
+    the block's length and the position in it; ``restore`` redraws exactly
+    that block, so checkpoints resume bit-for-bit and leave ``gen`` where
+    the uninterrupted run would.
+    """
+
+    def __init__(self, gen: np.random.Generator, draw: Callable[[np.random.Generator, int], List[Any]],
+                 block: int = 1024, remaining: int | None = None):
+        self.gen = gen
+        self.draw = draw
+        self.block = max(1, int(block))
+        self.remaining = remaining
+        self._start = generator_state(gen)
+        self._buf: List[Any] = []
+        self._pos = 0
+
+    def _refill(self, n: int | None = None):
+        if n is None:
+            n = self.block if self.remaining is None else max(1, min(self.block, self.remaining))
+        self._start = generator_state(self.gen)
+        self._buf = self.draw(self.gen, n)
+        self._pos = 0
+        if self.remaining is not None:
+            self.remaining -= n
+
+    def __call__(self) -> Any:
+        i = self._pos
+        if i == len(self._buf):
+            self._refill()
+            i = 0
+        self._pos = i + 1
+        return self._buf[i]
+
+    def state(self) -> Dict[str, Any]:
+        return {"start": self._start, "n": len(self._buf), "pos": self._pos}
+
+    def restore(self, state: Mapping[str, Any]):
+        """Continue from ``state()``; ``remaining`` counts the periods after the checkpoint."""
+        self.gen.bit_generator.state = state["start"]
+        pos = int(state["pos"])
+        if not pos:
+            self._buf, self._pos = [], 0
+            return
+        n = state.get("n")
+        if n is None:
+            n = self.block if self.remaining is None else min(self.block, self.remaining + pos)
+        left = self.remaining
+        self._refill(max(pos, int(n)))
+        self._pos = pos
+        if left is not None:
+            # The first pos draws of the block were taken before the checkpoint
+            self.remaining = left - (len(self._buf) - pos)
+
+
+def normal_rows(scale: Sequence[float]) -> Callable[[np.random.Generator, int], List[List[float]]]:
+    """``BlockDraws`` filler: one row per period of ``normal(0, scale[j])`` for each j.
+
+    Rows are filled in order, so row t equals ``len(scale)`` successive
+    ``gen.normal(0, s)`` calls.
+    """
+    sd = np.asarray(scale, dtype=float)
+
+    def draw(gen: np.random.Generator, n: int) -> List[List[float]]:
+        return (gen.standard_normal((n, sd.size)) * sd).tolist()
+
+    return draw
+
+
+# Expected periods between R&D successes below which innovation_gains draws per period
+SCALAR_GAP = 16
+
+
+def innovation_gains(rng: np.random.Generator, xi_inn: float, horizon: int, block: int | None = None) -> np.ndarray:
+    """Per-period R&D gains for one run, consuming ``rng`` exactly like a
+    success draw ``rng.random() < xi_inn`` followed, on success, by
+    ``abs(rng.normal(0, 0.01))``, repeated ``horizon`` times.
+
+    Uniforms are drawn in blocks of about the expected gap between successes
+    (``ceil(1 / xi_inn)``), so little of a block is wasted. On a success the
+    generator is stepped back to just past it before the normal draw, so the
+    stream stays aligned: a PCG64 ``advance`` where possible, else a saved
+    state. A success costs a few NumPy calls, so when successes are expected
+    more often than every ``SCALAR_GAP`` periods the plain per-period draws
+    are faster and are used instead.
+    """
+    gains = np.zeros(horizon)
+    if block is None:
+        block = horizon if xi_inn <= 0 else max(1, int(np.ceil(1.0 / xi_inn)))
+    if block < SCALAR_GAP:
+        rand, normal = rng.random, rng.normal
+        for t in range(horizon):
+            if rand() < xi_inn:
+                gains[t] = abs(normal(0.0, 0.01))
+        return gains
+    bg = rng.bit_generator
+    # advance() drops a buffered 32-bit half, which the scalar draws would have kept
+    step_back = isinstance(bg, (np.random.PCG64, np.random.PCG64DXSM)) and not bg.state["has_uint32"]
+    saved = None
+    t = 0
+    while t < horizon:
+        if not step_back:
+            saved = bg.state
+        n = min(block, horizon - t)
+        hits = np.flatnonzero(rng.random(n) < xi_inn)
+        if hits.size == 0:
+            t += n
+            continue
+        k = int(hits[0])
+        if step_back:
+            bg.advance(k + 1 - n)
+        else:
+            bg.state = saved
+            rng.random(k + 1)
+        gains[t + k] = abs(rng.normal(0.0, 0.01))
+        t += k + 1
+    return gains
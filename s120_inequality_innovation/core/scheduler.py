@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-import csv
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Iterable, List
 
-from .flowmatrix_glue import FlowMatrix, FMContext, fm_start_period, fm_log, fm_assert_ok
+from .flowmatrix_glue import FMContext, fm_new_context, fm_start_period, fm_log, fm_assert_ok, fm_end_period
 from .registry import ParameterRegistry
+from .stepping import Stream, Subscriber, drive, new_record, open_outputs
+from ..io.sinks import FM_RESIDUALS_FORMATS, FM_RESIDUALS_SCHEMA, TIMELINE_SCHEMA, SinkFactory
 
 
 STEP_LABELS: List[str] = [
@@ -32,6 +33,10 @@ STEP_LABELS: List[str] = [
     "19_cb_advances",
 ]
 
+# Per-period record of ``stream_simulation``: the largest residuals over the period's checks
+PERIOD_SCHEMA = [("t", "i8"), ("max_row_abs", "f8"), ("max_col_abs", "f8")]
+CHECK_STEPS = frozenset({3, 7, 12, 16, 19})
+
 
 @dataclass
 class SchedulerResult:
@@ -39,37 +44,54 @@ class SchedulerResult:
     fm_residuals_csv: Path | None = None
 
 
-def _ensure_dir(p: Path):
-    p.mkdir(parents=True, exist_ok=True)
-
-
-def run_simulation(
+def stream_simulation(
     params: ParameterRegistry,
     horizon: int,
-    artifacts_dir: Path,
-) -> SchedulerResult:
-    _ensure_dir(artifacts_dir)
-    fm = FlowMatrix()
-    ctx = FMContext(fm=fm)
-    timeline_path = artifacts_dir / "timeline.csv"
-    fmres_path = artifacts_dir / "fm_residuals.csv"
-    with open(fmres_path, "w", newline="", encoding="utf-8") as fr:
-        wres = csv.writer(fr)
-        wres.writerow(["t", "step", "max_row_abs", "max_col_abs"])  # placeholders
-    with open(timeline_path, "w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow(["t", "step", "label", "ts"])
+    artifacts_dir: Path | None,
+    sinks: SinkFactory | str | None = None,
+) -> Stream:
+    """The 19-step schedule one period at a time, yielding a ``PERIOD_SCHEMA`` record; see ``core.stepping``."""
+    from .profiling import profiler_from_env
+
+    base, factory = open_outputs(artifacts_dir, sinks)
+    ctx = fm_new_context()
+    prof = profiler_from_env()
+    check = prof.wrap(fm_assert_ok, "fm_check")
+    end_period = fm_end_period if ctx.verify.strict else prof.wrap(fm_end_period, "fm_check")
+    timeline = factory(base / "timeline", TIMELINE_SCHEMA)
+    fmres = factory(base / "fm_residuals", FM_RESIDUALS_SCHEMA, FM_RESIDUALS_FORMATS)
+    rec = new_record(PERIOD_SCHEMA)
+    with timeline, fmres:
         for t in range(1, horizon + 1):
             fm_start_period(ctx, t)
+            r_max = c_max = 0.0
             for i, label in enumerate(STEP_LABELS, start=1):
+                tok = prof.start()
                 # Minimal neutral flows to let SFC checks run without business logic
                 fm_log(ctx, source=f"SYS:{label}", sink="SYS:buffer", amount=0.0, label=label)
-                if i in {3, 7, 12, 16, 19}:
-                    fm_assert_ok(ctx)
+                prof.stop(i, tok)
+                if i in CHECK_STEPS:
+                    check(ctx, i)
                     # Placeholder residuals (0.0, 0.0) while only zero-flows exist
                     r, c = (ctx.last_residuals or (0.0, 0.0))
-                    with open(fmres_path, "a", newline="", encoding="utf-8") as fr:
-                        wres = csv.writer(fr)
-                        wres.writerow([t, i, f"{abs(r):.12e}", f"{abs(c):.12e}"])
-                w.writerow([t, i, label, time.time_ns()])
-    return SchedulerResult(timeline_csv=timeline_path, fm_residuals_csv=fmres_path)
+                    r, c = abs(r), abs(c)
+                    fmres.append((t, i, r, c))
+                    r_max, c_max = max(r_max, r), max(c_max, c)
+                timeline.append((t, i, label, time.time_ns()))
+            end_period(ctx)
+            rec[()] = (t, r_max, c_max)
+            if (yield rec):
+                break
+    if artifacts_dir is not None:
+        prof.save(artifacts_dir)
+    return SchedulerResult(timeline_csv=timeline.path, fm_residuals_csv=fmres.path)
+
+
+def run_simulation(
+    params: ParameterRegistry,
+    horizon: int,
+    artifacts_dir: Path | None,
+    sinks: SinkFactory | str | None = None,
+    subscribers: Iterable[Subscriber] = (),
+) -> SchedulerResult:
+    return drive(stream_simulation(params, horizon, artifacts_dir, sinks), subscribers)
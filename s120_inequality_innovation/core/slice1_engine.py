@@ -1,22 +1,26 @@
 from __future__ import annotations
 
-import csv
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Tuple
+from typing import Iterable, Tuple
 
 import numpy as np
 
-from .registry import ParameterRegistry
-from .flowmatrix_glue import FlowMatrix, FMContext, fm_start_period, fm_assert_ok
-from sfctools.core.flow_matrix import Accounts  # type: ignore
+from .registry import CompiledParams, ParameterRegistry
+from .checkpoint import Checkpoint, checkpoint_dir, due, restore_outputs, sink_offsets
+from .flowmatrix_glue import FMContext, fm_new_context, fm_start_period, fm_assert_ok, fm_end_period
+from .profiling import profiler_from_env
+from .stepping import Stream, Subscriber, drive, new_record, open_outputs
+from ..io.online_stats import WindowStats, eval_window
+from ..io.sinks import FM_RESIDUALS_FORMATS, FM_RESIDUALS_SCHEMA, SERIES_PROD_SCHEMA, SinkFactory
 
 
 def _log_tx(ctx: FMContext, agent_from: str, agent_to: str, amount: float, subject: str):
     # Flow (CA->CA) from A to B
-    ctx.fm.log_flow((Accounts.CA, Accounts.CA), float(amount), agent_from, agent_to, subject)
+    acc = ctx.accounts
+    ctx.fm.log_flow((acc.CA, acc.CA), float(amount), agent_from, agent_to, subject)
     # Stock change (KA->KA) opposite direction to keep row/col totals at zero
-    ctx.fm.log_flow((Accounts.KA, Accounts.KA), float(amount), agent_to, agent_from, subject)
+    ctx.fm.log_flow((acc.KA, acc.KA), float(amount), agent_to, agent_from, subject)
 
 
 @dataclass
@@ -34,10 +38,10 @@ class Slice1State:
     unemployment: float = 0.1
 
 
-def step1_production_planning(state: Slice1State, params: ParameterRegistry) -> Tuple[float, float]:
+def step1_production_planning(state: Slice1State, p: CompiledParams) -> Tuple[float, float]:
     lam = 0.2
     state.s_expected = state.s_expected + lam * (state.s_realized - state.s_expected)
-    nu = float(params.get("inventories.nu_target"))
+    nu = p.inventories.nu_target
     yD = max(0.0, state.s_expected * (1.0 + nu) - state.inventories)
     inv_target = state.s_expected * nu
     return yD, inv_target
@@ -50,7 +54,7 @@ def step2_labor_demand(state: Slice1State, yD: float) -> Tuple[float, float]:
     return N, u
 
 
-def step3_pricing_markup(state: Slice1State, params: ParameterRegistry, yD: float, inv_target: float):
+def step3_pricing_markup(state: Slice1State, p: CompiledParams, yD: float, inv_target: float):
     # Adjust markup toward keeping inventories near target
     gap = state.inventories - inv_target
     adj = -0.01 if gap > 0 else 0.01
@@ -66,7 +70,7 @@ def step9_production(state: Slice1State, yD: float) -> float:
     return y
 
 
-def step12_consumption_and_sales(ctx: FMContext, state: Slice1State, params: ParameterRegistry, y: float):
+def step12_consumption_and_sales(ctx: FMContext, state: Slice1State, p: CompiledParams, y: float):
     alpha = 0.6
     desired_cons = alpha * state.s_expected  # placeholder
     sales = min(state.inventories + y, desired_cons)
@@ -78,9 +82,9 @@ def step12_consumption_and_sales(ctx: FMContext, state: Slice1State, params: Par
     state.s_realized = sales
 
 
-def step14_wages(ctx: FMContext, state: Slice1State, N: float, params: ParameterRegistry):
+def step14_wages(ctx: FMContext, state: Slice1State, N: float, p: CompiledParams):
     # Reservation wage revision (very simple placeholder bounded >0)
-    tu = float(params.get("wage_rigidity.tu"))
+    tu = p.wage_rigidity.tu
     # slight downward drift when unemployment high, upward when low
     drift = -0.001 * tu if state.unemployment > 0.1 else 0.001
     state.wage = max(0.1, state.wage * (1.0 + drift))
@@ -89,43 +93,59 @@ def step14_wages(ctx: FMContext, state: Slice1State, N: float, params: Parameter
     return wage_bill
 
 
-def run_slice1(params: ParameterRegistry, horizon: int, outdir: Path) -> Tuple[Path, Path]:
-    outdir.mkdir(parents=True, exist_ok=True)
-    fm = FlowMatrix()
-    ctx = FMContext(fm)
+def stream_slice1(params: ParameterRegistry, horizon: int, outdir: Path | None,
+                  sinks: SinkFactory | str | None = None,
+                  checkpoint_every: int | None = None,
+                  resume_from: Path | None = None) -> Stream:
+    """Slice1 one period at a time, yielding the series row; see ``core.stepping``."""
+    base, factory = open_outputs(outdir, sinks, checkpoint_every, resume_from)
+    ctx = fm_new_context()
+    p = params.compiled()  # resolved once; step functions read attributes
     state = Slice1State()
-    series_path = outdir / "series.csv"
-    fmres_path = outdir / "fm_residuals.csv"
-    with open(series_path, "w", newline="", encoding="utf-8") as f, open(
-        fmres_path, "w", newline="", encoding="utf-8"
-    ) as fr:
-        w = csv.writer(f)
-        w.writerow(["t", "GDP", "CONS", "INV", "INFL", "UNEMP", "PROD_C"])  # canonical
-        wres = csv.writer(fr)
-        wres.writerow(["t", "step", "max_row_abs", "max_col_abs"])
-        for t in range(1, horizon + 1):
+    stats = WindowStats([c for c, _ in SERIES_PROD_SCHEMA[1:]], *eval_window(params))
+    t0 = 1
+    if resume_from is not None:
+        ckpt = Checkpoint.load(resume_from)
+        restore_outputs(ckpt, checkpoint_dir(resume_from), outdir)
+        state = Slice1State(**ckpt.state)
+        stats = WindowStats.from_dict(ckpt.extras["window_stats"])
+        t0 = ckpt.t + 1
+    prof = profiler_from_env()
+    step1, step2, step3 = (prof.wrap(step1_production_planning, 1), prof.wrap(step2_labor_demand, 2),
+                           prof.wrap(step3_pricing_markup, 3))
+    step9, step12, step14 = (prof.wrap(step9_production, 9), prof.wrap(step12_consumption_and_sales, 12),
+                             prof.wrap(step14_wages, 14))
+    check = prof.wrap(fm_assert_ok, "fm_check")
+    end_period = fm_end_period if ctx.verify.strict else prof.wrap(fm_end_period, "fm_check")
+    resuming = resume_from is not None
+    w = factory(base / "series", SERIES_PROD_SCHEMA, append=resuming)  # canonical
+    wres = factory(base / "fm_residuals", FM_RESIDUALS_SCHEMA, FM_RESIDUALS_FORMATS, append=resuming)
+    rec = new_record(SERIES_PROD_SCHEMA)
+    with w, wres:
+        for t in range(t0, horizon + 1):
             fm_start_period(ctx, t)
             # Step 1: planning
-            yD, inv_target = step1_production_planning(state, params)
+            yD, inv_target = step1(state, p)
             # Step 2: labor demand
-            N, u = step2_labor_demand(state, yD)
+            N, u = step2(state, yD)
             # Step 3: pricing/markup
-            step3_pricing_markup(state, params, yD, inv_target)
-            fm_assert_ok(ctx); wres.writerow([t, 3, f"{0.0:.12e}", f"{0.0:.12e}"])
+            step3(state, p, yD, inv_target)
+            check(ctx, 3); wres.append((t, 3, 0.0, 0.0))
             # Step 7: (no credit in slice1) still assert
-            fm_assert_ok(ctx); wres.writerow([t, 7, f"{0.0:.12e}", f"{0.0:.12e}"])
+            check(ctx, 7); wres.append((t, 7, 0.0, 0.0))
             # Step 9: production
-            y = step9_production(state, yD)
+            y = step9(state, yD)
             # Step 12: consumption
-            step12_consumption_and_sales(ctx, state, params, y)
-            fm_assert_ok(ctx); wres.writerow([t, 12, f"{0.0:.12e}", f"{0.0:.12e}"])
+            step12(ctx, state, p, y)
+            check(ctx, 12); wres.append((t, 12, 0.0, 0.0))
             # Step 14: wages
-            wage_bill = step14_wages(ctx, state, N, params)
-            fm_assert_ok(ctx); wres.writerow([t, 16, f"{0.0:.12e}", f"{0.0:.12e}"])
+            wage_bill = step14(ctx, state, N, p)
+            check(ctx, 16); wres.append((t, 16, 0.0, 0.0))
             # Step 19: CB advances (none) assert
-            fm_assert_ok(ctx); wres.writerow([t, 19, f"{0.0:.12e}", f"{0.0:.12e}"])
+            check(ctx, 19); wres.append((t, 19, 0.0, 0.0))
+            end_period(ctx)
             # Log simple GDP as sales; cons equals sales
-            w.writerow([
+            row = (
                 t,
                 state.s_realized * state.price,
                 state.s_realized * state.price,
@@ -133,5 +153,28 @@ def run_slice1(params: ParameterRegistry, horizon: int, outdir: Path) -> Tuple[P
                 state.inflation,
                 state.unemployment,
                 state.prod,
-            ])
-    return series_path, fmres_path
+            )
+            tok = prof.start()
+            w.append(row)
+            stats.update(t, row[1:])
+            prof.stop("output", tok)
+            if due(t, checkpoint_every):
+                tok = prof.start()
+                Checkpoint("slice1", t, asdict(state), extras={"window_stats": stats.to_dict()}, writers=sink_offsets([w, wres]),
+                           config_hash=params.config_hash()).save(outdir)
+                prof.stop("checkpoint", tok)
+            rec[()] = row
+            if (yield rec):
+                break
+    if outdir is not None:
+        stats.save(outdir)
+        prof.save(outdir)
+    return w.path, wres.path
+
+
+def run_slice1(params: ParameterRegistry, horizon: int, outdir: Path | None,
+               sinks: SinkFactory | str | None = None,
+               checkpoint_every: int | None = None,
+               resume_from: Path | None = None,
+               subscribers: Iterable[Subscriber] = ()) -> Tuple[Path, Path]:
+    return drive(stream_slice1(params, horizon, outdir, sinks, checkpoint_every, resume_from), subscribers)
@@ -1,20 +1,33 @@
 from __future__ import annotations
 
-import csv
-from dataclasses import dataclass
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Tuple
+from typing import Iterable, Tuple
 
 import numpy as np
 
-from .registry import ParameterRegistry
-from .flowmatrix_glue import FlowMatrix, FMContext, fm_start_period, fm_assert_ok
-from sfctools.core.flow_matrix import Accounts  # type: ignore
+from .agents import AgentStore, InequalityBlock, consume, match_employment, pay_deposit_interest, pay_wages
+from .registry import CompiledParams, ParameterRegistry
+from .checkpoint import Checkpoint, checkpoint_dir, due, restore_outputs, sink_offsets
+from .flowmatrix_glue import FMContext, fm_new_context, fm_start_period, fm_assert_ok, fm_end_period
+from .profiling import profiler_from_env
+from .rng import BlockDraws, SeedLike, class_stream, generator_state, innovation_gains
+from .stepping import Stream, Subscriber, drive, new_record, open_outputs
+from ..io.online_stats import WindowStats, eval_window
+from ..io.sinks import FM_RESIDUALS_FORMATS, FM_RESIDUALS_SCHEMA, SERIES_PROD_SCHEMA, SinkFactory
 
 
 def _log_tx(ctx: FMContext, agent_from: str, agent_to: str, amount: float, subject: str):
-    ctx.fm.log_flow((Accounts.CA, Accounts.CA), float(amount), agent_from, agent_to, subject)
-    ctx.fm.log_flow((Accounts.KA, Accounts.KA), float(amount), agent_to, agent_from, subject)
+    acc = ctx.accounts
+    ctx.fm.log_flow((acc.CA, acc.CA), float(amount), agent_from, agent_to, subject)
+    ctx.fm.log_flow((acc.KA, acc.KA), float(amount), agent_to, agent_from, subject)
+
+
+DIAG_INNOVATION_SCHEMA = [("t", "i8"), ("inn_success_cum", "i8"), ("inn_trials_cum", "i8"), ("prod_c", "f8")]
+INEQUALITY_SCHEMA = [("t", "i8")] + [(c, "f8") for c in ["Gini_income", "Gini_wealth", "Top10_income", "Top10_wealth"]]
+# Household store snapshot per checkpoint when running with households; checkpoint.json names its file
+AGENTS_NAME = "agents_t{t}.npz"
 
 
 @dataclass
@@ -35,26 +48,29 @@ class Slice2State:
     inn_trials: int = 0
 
 
-def step1_3_basic(state: Slice2State, params: ParameterRegistry) -> Tuple[float, float]:
+def step1_expected_sales_and_target(state: Slice2State, p: CompiledParams) -> Tuple[float, float]:
     lam = 0.2
     state.expected_sales = state.expected_sales + lam * (state.realized_sales - state.expected_sales)
-    nu = float(params.get("inventories.nu_target"))
+    nu = p.inventories.nu_target
     yD = max(0.0, state.expected_sales * (1.0 + nu) - state.inventories)
     inv_target = state.expected_sales * nu
+    return yD, inv_target
+
+
+def step3_markup_and_price(state: Slice2State, inv_target: float):
     # simple markup update toward inventory target
     gap = state.inventories - inv_target
     adj = -0.01 if gap > 0 else 0.01
     state.markup = min(1.0, max(0.0, state.markup + adj))
     ulc = state.wage / max(1e-9, state.prod_c)
     state.price = (1.0 + state.markup) * ulc
-    return yD, inv_target
 
 
-def step4_desired_capacity_and_investment(state: Slice2State, params: ParameterRegistry, yD: float):
-    r_target = float(params.get("capital_and_loans.target_profit_rate"))
-    u_target = float(params.get("capital_and_loans.target_utilization"))
-    gamma1 = float(params.get("capital_and_loans.gamma1"))
-    gamma2 = float(params.get("capital_and_loans.gamma2"))
+def step4_desired_capacity_and_investment(state: Slice2State, p: CompiledParams, yD: float):
+    r_target = p.capital_and_loans.target_profit_rate
+    u_target = p.capital_and_loans.target_utilization
+    gamma1 = p.capital_and_loans.gamma1
+    gamma2 = p.capital_and_loans.gamma2
     # proxy: utilization = yD / (capital_stock * prod_c)
     capacity = max(1e-9, state.capital_stock * state.prod_c)
     u = min(1.0, yD / capacity)
@@ -67,16 +83,18 @@ def step4_desired_capacity_and_investment(state: Slice2State, params: ParameterR
     return inv_units
 
 
-def step5_vintage_choice_and_rnd(state: Slice2State, params: ParameterRegistry, rng: np.random.Generator) -> float:
-    # Innovation success with probability p_inn; imitation not modeled explicitly here
-    xi_inn = float(params.get("innovation.xi_inn"))
+def rnd_draws(rng: np.random.Generator, p: CompiledParams, remaining: int | None = None) -> BlockDraws:
+    """Step 5 R&D outcomes, drawn ahead in blocks (see ``rng.innovation_gains``)."""
+    xi_inn = p.innovation.xi_inn
+    return BlockDraws(rng, lambda g, n: innovation_gains(g, xi_inn, n).tolist(), remaining=remaining)
+
+
+def step5_vintage_choice_and_rnd(state: Slice2State, gain: float) -> float:
+    # Innovation success with probability p_inn, then a folded normal-like small
+    # positive productivity gain (drawn by ``rnd_draws``); imitation not modeled here
     state.inn_trials += 1
-    if rng.random() < xi_inn:
+    if gain > 0:
         state.inn_success += 1
-        # Folded normal-like small positive productivity gain
-        gain = abs(rng.normal(0.0, 0.01))
-    else:
-        gain = 0.0
     return gain
 
 
@@ -98,57 +116,167 @@ def step12_sales(state: Slice2State, y: float):
     return sales
 
 
-def step14_wages_and_unemployment(state: Slice2State, yD: float, params: ParameterRegistry):
+def step14_wages_and_unemployment(state: Slice2State, yD: float, p: CompiledParams):
     N = yD / max(1e-9, state.prod_c)
     u = max(0.0, min(0.5, 1.0 - N / max(1e-9, state.labor_supply)))
     state.unemployment = u
-    tu = float(params.get("wage_rigidity.tu"))
+    tu = p.wage_rigidity.tu
     drift = -0.001 * tu if u > 0.1 else 0.001
     state.wage = max(0.1, state.wage * (1.0 + drift))
     wage_bill = state.wage * N
     return wage_bill
 
 
-def run_slice2(params: ParameterRegistry, horizon: int, outdir: Path, seed: int = 123) -> Tuple[Path, Path, Path]:
-    outdir.mkdir(parents=True, exist_ok=True)
-    fm = FlowMatrix()
-    ctx = FMContext(fm)
+def stream_slice2(params: ParameterRegistry, horizon: int, outdir: Path | None, seed: SeedLike = 123,
+                  sinks: SinkFactory | str | None = None,
+                  checkpoint_every: int | None = None,
+                  resume_from: Path | None = None,
+                  households: int | None = None) -> Stream:
+    """Slice2 one period at a time, yielding the series row; see ``core.stepping``.
+
+    With ``households`` the labour and consumption markets also run on a
+    ``core.agents`` store of that many households: employment follows the
+    aggregate unemployment rate, wages, dole and deposit interest are paid
+    per household and consumption is spent out of their deposits, all
+    logged to the FlowMatrix. Household inequality is written to
+    ``inequality`` a block of periods at a time. The aggregate series are
+    unchanged.
+    """
+    base, factory = open_outputs(outdir, sinks, checkpoint_every, resume_from)
+    ctx = fm_new_context()
+    p = params.compiled()
     state = Slice2State()
     rng = np.random.default_rng(seed)
-    series_path = outdir / "series.csv"
-    fmres_path = outdir / "fm_residuals.csv"
-    diag_path = outdir / "diag_innovation.csv"
-    with open(series_path, "w", newline="", encoding="utf-8") as f, \
-         open(fmres_path, "w", newline="", encoding="utf-8") as fr, \
-         open(diag_path, "w", newline="", encoding="utf-8") as fd:
-        w = csv.writer(f); wres = csv.writer(fr); wd = csv.writer(fd)
-        w.writerow(["t", "GDP", "CONS", "INV", "INFL", "UNEMP", "PROD_C"])
-        wres.writerow(["t", "step", "max_row_abs", "max_col_abs"])
-        wd.writerow(["t", "inn_success_cum", "inn_trials_cum", "prod_c"])
-        prod_gain_buffer = 0.0
-        for t in range(1, horizon + 1):
+    prod_gain_buffer = 0.0
+    stats = WindowStats([c for c, _ in SERIES_PROD_SCHEMA[1:]], *eval_window(params))
+    t0 = 1
+    if resume_from is not None:
+        ckpt = Checkpoint.load(resume_from)
+        restore_outputs(ckpt, checkpoint_dir(resume_from), outdir)
+        state = Slice2State(**ckpt.state)
+        rng.bit_generator.state = ckpt.rng["rng"]
+        prod_gain_buffer = ckpt.extras["prod_gain_buffer"]
+        stats = WindowStats.from_dict(ckpt.extras["window_stats"])
+        t0 = ckpt.t + 1
+    rnd = rnd_draws(rng, p, remaining=horizon - t0 + 1)
+    if resume_from is not None:
+        rnd.restore(ckpt.extras["rnd_draws"])
+    store = hh_rng = agents_file = None
+    if households:
+        hh_rng = class_stream(seed, "households", "match")
+        if resume_from is not None:
+            if "agents" not in ckpt.extras:
+                raise ValueError(f"Checkpoint at t={ckpt.t} in {resume_from} has no household store to resume")
+            agents_file = checkpoint_dir(resume_from) / ckpt.extras["agents"]
+            store = AgentStore.load(agents_file)
+            hh_rng.bit_generator.state = ckpt.rng["households"]
+        else:
+            store = AgentStore.initial(params, population={"households": households}, seed=seed)
+        ineq = InequalityBlock(len(store.households))
+        i_d = float(p.rates.i_d0)
+        omega = float(p.social.dole_omega)
+    prof = profiler_from_env()
+    # Step 2 (labour demand) has no separate logic in this slice
+    step1, step3 = prof.wrap(step1_expected_sales_and_target, 1), prof.wrap(step3_markup_and_price, 3)
+    step4, step5 = prof.wrap(step4_desired_capacity_and_investment, 4), prof.wrap(step5_vintage_choice_and_rnd, 5)
+    step10_11, step12, step14 = (prof.wrap(step10_11_deliver_capital_and_update_prod, 10),
+                                 prof.wrap(step12_sales, 12), prof.wrap(step14_wages_and_unemployment, 14))
+    match, spend, interest, wages = (prof.wrap(match_employment, 8), prof.wrap(consume, 12),
+                                     prof.wrap(pay_deposit_interest, 13), prof.wrap(pay_wages, 14))
+    check = prof.wrap(fm_assert_ok, "fm_check")
+    end_period = fm_end_period if ctx.verify.strict else prof.wrap(fm_end_period, "fm_check")
+    resuming = resume_from is not None
+    w = factory(base / "series", SERIES_PROD_SCHEMA, append=resuming)
+    wres = factory(base / "fm_residuals", FM_RESIDUALS_SCHEMA, FM_RESIDUALS_FORMATS, append=resuming)
+    wd = factory(base / "diag_innovation", DIAG_INNOVATION_SCHEMA, append=resuming)
+    wi = factory(base / "inequality", INEQUALITY_SCHEMA, append=resuming) if store is not None else None
+    rec = new_record(SERIES_PROD_SCHEMA)
+    with w, wres, wd, (wi if wi is not None else nullcontext()):
+        for t in range(t0, horizon + 1):
             fm_start_period(ctx, t)
-            yD, inv_target = step1_3_basic(state, params)
-            inv_units = step4_desired_capacity_and_investment(state, params, yD)
-            prod_gain_next = step5_vintage_choice_and_rnd(state, params, rng)
-            fm_assert_ok(ctx); wres.writerow([t, 3, f"{0.0:.12e}", f"{0.0:.12e}"])
+            yD, inv_target = step1(state, p)
+            step3(state, inv_target)
+            inv_units = step4(state, p, yD)
+            prod_gain_next = step5(state, rnd())
+            check(ctx, 3); wres.append((t, 3, 0.0, 0.0))
             # Production (Step 9)
             y = yD
             # Deliveries + productivity update (Step 10 & 11)
-            step10_11_deliver_capital_and_update_prod(state, inv_units, prod_gain_buffer)
+            step10_11(state, inv_units, prod_gain_buffer)
             prod_gain_buffer = prod_gain_next
             # Sales (Step 12)
-            sales = step12_sales(state, y)
-            fm_assert_ok(ctx); wres.writerow([t, 12, f"{0.0:.12e}", f"{0.0:.12e}"])
+            sales = step12(state, y)
+            if store is not None:
+                spend(store.households, store.cfirms, sales * state.price, store.banks, ctx)
+            check(ctx, 12); wres.append((t, 12, 0.0, 0.0))
             # Wages (Step 14)
-            wage_bill = step14_wages_and_unemployment(state, yD, params)
-            fm_assert_ok(ctx); wres.writerow([t, 16, f"{0.0:.12e}", f"{0.0:.12e}"])
-            fm_assert_ok(ctx); wres.writerow([t, 19, f"{0.0:.12e}", f"{0.0:.12e}"])
+            wage_bill = step14(state, yD, p)
+            if store is not None:
+                hh = store.households
+                match(hh, store.cfirms, state.unemployment, hh_rng)
+                # The aggregate wage bill is shared by the employed; the dole is a fraction of that wage
+                wage = wage_bill / max(1, int((hh["employer"] >= 0).sum()))
+                hh["wage"] = wage
+                wages(hh, store.cfirms, store.banks, ctx, dole=omega * wage)
+                # After wages, which reset the period's income
+                interest(hh, store.banks, i_d, ctx)
+            check(ctx, 16); wres.append((t, 16, 0.0, 0.0))
+            check(ctx, 19); wres.append((t, 19, 0.0, 0.0))
+            end_period(ctx)
             # Series
             gdp = sales * state.price
             cons = gdp
             inv_val = inv_units * state.price
-            w.writerow([t, gdp, cons, inv_val, 0.0, state.unemployment, state.prod_c])
-            wd.writerow([t, state.inn_success, state.inn_trials, state.prod_c])
-    return series_path, fmres_path, diag_path
+            row = (t, gdp, cons, inv_val, 0.0, state.unemployment, state.prod_c)
+            tok = prof.start()
+            w.append(row)
+            stats.update(t, row[1:])
+            wd.append((t, state.inn_success, state.inn_trials, state.prod_c))
+            if wi is not None and (ineq.add(t, store.households) or due(t, checkpoint_every)):
+                # Whole blocks through the batched metrics; a checkpoint needs its rows on disk
+                for r in ineq.flush():
+                    wi.append(r)
+            prof.stop("output", tok)
+            if due(t, checkpoint_every):
+                tok = prof.start()
+                extras = {"prod_gain_buffer": prod_gain_buffer, "window_stats": stats.to_dict(),
+                          "rnd_draws": rnd.state()}
+                if store is not None:
+                    # One file per checkpoint, named in checkpoint.json: a crash before that write
+                    # leaves the previous checkpoint pointing at its own store
+                    extras["agents"] = AGENTS_NAME.format(t=t)
+                    store.save(outdir / extras["agents"])
+                Checkpoint(
+                    "slice2", t, asdict(state),
+                    extras=extras,
+                    rng={"rng": rng.bit_generator.state,
+                         **({"households": generator_state(hh_rng)} if store is not None else {})},
+                    writers=sink_offsets([w, wres, wd] + ([wi] if wi is not None else [])),
+                    config_hash=params.config_hash(),
+                ).save(outdir)
+                if store is not None:
+                    # The superseded store goes once the new checkpoint is on disk; a fork source is kept
+                    old, agents_file = agents_file, outdir / extras["agents"]
+                    if old is not None and old != agents_file and old.parent.resolve() == outdir.resolve():
+                        old.unlink(missing_ok=True)
+                prof.stop("checkpoint", tok)
+            rec[()] = row
+            if (yield rec):
+                break
+        if wi is not None:
+            for r in ineq.flush():
+                wi.append(r)
+    if outdir is not None:
+        stats.save(outdir)
+        prof.save(outdir)
+    return w.path, wres.path, wd.path
+
 
+def run_slice2(params: ParameterRegistry, horizon: int, outdir: Path | None, seed: SeedLike = 123,
+               sinks: SinkFactory | str | None = None,
+               checkpoint_every: int | None = None,
+               resume_from: Path | None = None,
+               subscribers: Iterable[Subscriber] = (),
+               households: int | None = None) -> Tuple[Path, Path, Path]:
+    return drive(stream_slice2(params, horizon, outdir, seed, sinks, checkpoint_every, resume_from, households),
+                 subscribers)
@@ -1,19 +1,35 @@
 from __future__ import annotations
 
-import csv
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from pathlib import Path
+from typing import Iterable
 
 from .registry import ParameterRegistry
-from .flowmatrix_glue import FlowMatrix, FMContext, fm_start_period, fm_assert_ok
-from sfctools.core.flow_matrix import Accounts  # type: ignore
-import csv
+from .checkpoint import Checkpoint, checkpoint_dir, due, restore_outputs, sink_offsets
+from .flowmatrix_glue import FMContext, fm_new_context, fm_start_period, fm_assert_ok, fm_end_period
+from .profiling import profiler_from_env
+from .stepping import Stream, Subscriber, drive, new_record, open_outputs
+from ..io.online_stats import WindowStats, eval_window
+from ..io.sinks import FM_RESIDUALS_FORMATS, FM_RESIDUALS_SCHEMA, SERIES_PROD_SCHEMA, SinkFactory
 import math
 
 
 def _log_tx(ctx: FMContext, agent_from: str, agent_to: str, amount: float, subject: str):
-    ctx.fm.log_flow((Accounts.CA, Accounts.CA), float(amount), agent_from, agent_to, subject)
-    ctx.fm.log_flow((Accounts.KA, Accounts.KA), float(amount), agent_to, agent_from, subject)
+    acc = ctx.accounts
+    ctx.fm.log_flow((acc.CA, acc.CA), float(amount), agent_from, agent_to, subject)
+    ctx.fm.log_flow((acc.KA, acc.KA), float(amount), agent_to, agent_from, subject)
+
+
+NOTES_GOV_SCHEMA = [
+    ("t", "i8"), ("gov_deficit", "f8"), ("delta_bonds", "f8"), ("cb_ops", "f8"),
+    ("delta_deposits", "f8"), ("identity_ok", "?"),
+]
+NOTES_GOV_FORMATS = {c: "{:.6f}" for c in ["gov_deficit", "delta_bonds", "cb_ops", "delta_deposits"]}
+EVENTS_SCHEMA = [
+    ("t", "i8"), ("lcr", "f8"), ("cap_ratio", "f8"), ("cb_advance", "i8"),
+    ("div_suppressed", "i8"), ("default_event", "i8"),
+]
+EVENTS_FORMATS = {"lcr": "{:.4f}", "cap_ratio": "{:.4f}"}
 
 
 @dataclass
@@ -34,35 +50,48 @@ class Slice3State:
     dividends_suppressed: int = 0
 
 
-def run_slice3(params: ParameterRegistry, horizon: int, outdir: Path):
-    outdir.mkdir(parents=True, exist_ok=True)
-    fm = FlowMatrix()
-    ctx = FMContext(fm)
-    series_path = outdir / "series.csv"
-    fmres_path = outdir / "fm_residuals.csv"
-    notes_path = outdir / "notes_gov_identity.csv"
-    events_path = outdir / "events.csv"
+def stream_slice3(params: ParameterRegistry, horizon: int, outdir: Path | None, sinks: SinkFactory | str | None = None,
+                  checkpoint_every: int | None = None, resume_from: Path | None = None) -> Stream:
+    """Slice3 one period at a time, yielding the series row; see ``core.stepping``."""
+    base, factory = open_outputs(outdir, sinks, checkpoint_every, resume_from)
+    ctx = fm_new_context()
     st = Slice3State()
-    i_d = float(params.get("rates.i_d0"))
-    i_l = float(params.get("rates.i_l0"))
-    i_b = float(params.get("cb_bonds.i_bonds"))
-    tau_y = float(params.get("taxes.tau_income0"))
-    rho_b = float(params.get("dividends.rho_b"))
-    cap_ratio_min = float(params.get("rates.capital_ratio_target0")) if params.get("rates.capital_ratio_target0") is not None else 0.08
-    with open(series_path, "w", newline="", encoding="utf-8") as f, \
-         open(fmres_path, "w", newline="", encoding="utf-8") as fr, \
-         open(notes_path, "w", newline="", encoding="utf-8") as fn, \
-         open(events_path, "w", newline="", encoding="utf-8") as fe:
-        w = csv.writer(f); wres = csv.writer(fr); wn = csv.writer(fn); we = csv.writer(fe)
-        w.writerow(["t", "GDP", "CONS", "INV", "INFL", "UNEMP", "PROD_C"])  # placeholder aggregate view
-        wres.writerow(["t", "step", "max_row_abs", "max_col_abs"])
-        wn.writerow(["t", "gov_deficit", "delta_bonds", "cb_ops", "delta_deposits", "identity_ok"])
-        we.writerow(["t", "lcr", "cap_ratio", "cb_advance", "div_suppressed", "default_event"])
-        for t in range(1, horizon + 1):
+    p = params.compiled()
+    i_d = float(p.rates.i_d0)
+    i_l = float(p.rates.i_l0)
+    i_b = float(p.cb_bonds.i_bonds)
+    tau_y = float(p.taxes.tau_income0)
+    rho_b = float(p.dividends.rho_b)
+    cap_ratio_min = p.get("rates.capital_ratio_target0")
+    cap_ratio_min = float(cap_ratio_min) if cap_ratio_min is not None else 0.08
+    eps = float(p.get("matching.epsilon_deposit", 4.62))
+    chi = float(p.get("matching.chi_deposit", 5))
+    stats = WindowStats([c for c, _ in SERIES_PROD_SCHEMA[1:]], *eval_window(params))
+    t0 = 1
+    if resume_from is not None:
+        ckpt = Checkpoint.load(resume_from)
+        restore_outputs(ckpt, checkpoint_dir(resume_from), outdir)
+        st = Slice3State(**ckpt.state)
+        # rho_b is switched off in-loop once the bank is under-capitalized
+        rho_b = ckpt.extras["rho_b"]
+        stats = WindowStats.from_dict(ckpt.extras["window_stats"])
+        t0 = ckpt.t + 1
+    prof = profiler_from_env()
+    check = prof.wrap(fm_assert_ok, "fm_check")
+    end_period = fm_end_period if ctx.verify.strict else prof.wrap(fm_end_period, "fm_check")
+    resuming = resume_from is not None
+    w = factory(base / "series", SERIES_PROD_SCHEMA, append=resuming)  # placeholder aggregate view
+    wres = factory(base / "fm_residuals", FM_RESIDUALS_SCHEMA, FM_RESIDUALS_FORMATS, append=resuming)
+    wn = factory(base / "notes_gov_identity", NOTES_GOV_SCHEMA, NOTES_GOV_FORMATS, append=resuming)
+    we = factory(base / "events", EVENTS_SCHEMA, EVENTS_FORMATS, append=resuming)
+    rec = new_record(SERIES_PROD_SCHEMA)
+    with w, wres, wn, we:
+        for t in range(t0, horizon + 1):
             fm_start_period(ctx, t)
             # Step 7: Credit market (no new loans unless gap)
-            fm_assert_ok(ctx); wres.writerow([t, 7, f"{0.0:.12e}", f"{0.0:.12e}"])
+            check(ctx, 7); wres.append((t, 7, 0.0, 0.0))
             # Step 13: Interest & principal
+            tok = prof.start()
             interest_dep = i_d * st.deposits_hh
             interest_loan = i_l * st.loans_firm
             interest_bond = i_b * st.bonds_outstanding
@@ -75,12 +104,16 @@ def run_slice3(params: ParameterRegistry, horizon: int, outdir: Path):
             # Update bank capital with net interest margin
             bank_profit = interest_loan + interest_bond - interest_dep
             st.bank_capital += bank_profit
-            fm_assert_ok(ctx); wres.writerow([t, 13, f"{0.0:.12e}", f"{0.0:.12e}"])
+            prof.stop(13, tok)
+            check(ctx, 13); wres.append((t, 13, 0.0, 0.0))
             # Step 15: Taxes (income on wages)
+            tok = prof.start()
             taxes = tau_y * st.wages
             if taxes > 0:
                 _log_tx(ctx, "HH", "GovG", taxes, "taxes_income")
+            prof.stop(15, tok)
             # Step 16: Dividends (bank) – suppress when under-capitalized
+            tok = prof.start()
             assets = st.loans_firm + st.bonds_held_bank
             cap_ratio = st.bank_capital / max(1e-9, assets)
             div = max(0.0, rho_b * max(0.0, bank_profit))
@@ -91,10 +124,12 @@ def run_slice3(params: ParameterRegistry, horizon: int, outdir: Path):
             if div > 0:
                 _log_tx(ctx, "BankB", "HH", div, "dividends_bank")
                 st.bank_capital -= div
-            fm_assert_ok(ctx); wres.writerow([t, 16, f"{0.0:.12e}", f"{0.0:.12e}"])
+            prof.stop(16, tok)
+            check(ctx, 16); wres.append((t, 16, 0.0, 0.0))
             # Step 17: Deposit market (no net change here)
-            fm_assert_ok(ctx); wres.writerow([t, 17, f"{0.0:.12e}", f"{0.0:.12e}"])
+            check(ctx, 17); wres.append((t, 17, 0.0, 0.0))
             # Step 18: Bond issuance to fund gov deficit
+            tok = prof.start()
             gov_spend = st.gov_spending
             gov_cash_out = gov_spend + interest_bond
             gov_cash_in = taxes
@@ -110,8 +145,6 @@ def run_slice3(params: ParameterRegistry, horizon: int, outdir: Path):
                 st.bank_reserves -= delta_bonds
             # Households deposit vs bond switching (portfolio rebalancing, does not affect gov identity)
             # Softmax on yields; use eps and chi from registry
-            eps = float(params.get("matching.epsilon_deposit", 4.62))
-            chi = float(params.get("matching.chi_deposit", 5))
             # Attractiveness proportional to yields
             a_bond = math.exp(eps * i_b)
             a_dep = math.exp(eps * i_d)
@@ -129,8 +162,10 @@ def run_slice3(params: ParameterRegistry, horizon: int, outdir: Path):
                     # If bank has no bonds, assume CB sells
                     _log_tx(ctx, "HH", "CB", switch_amt, "bond_secondary_buy_cb")
                     st.bonds_held_cb = max(0.0, st.bonds_held_cb - switch_amt)
-            fm_assert_ok(ctx); wres.writerow([t, 18, f"{0.0:.12e}", f"{0.0:.12e}"])
+            prof.stop(18, tok)
+            check(ctx, 18); wres.append((t, 18, 0.0, 0.0))
             # Step 19: CB advances (none)
+            tok = prof.start()
             # Liquidity coverage proxy: reserves / deposits
             lcr = (st.bank_reserves) / max(1e-9, st.deposits_hh)
             if lcr < 1.0:
@@ -139,9 +174,10 @@ def run_slice3(params: ParameterRegistry, horizon: int, outdir: Path):
                 # Treat CB advance as liquidity support; do not count toward govt identity cb_ops
                 st.cb_advances_out += need
                 st.bank_reserves += need
-            fm_assert_ok(ctx); wres.writerow([t, 19, f"{0.0:.12e}", f"{0.0:.12e}"])
+            prof.stop(19, tok)
+            check(ctx, 19); wres.append((t, 19, 0.0, 0.0))
             identity_ok = abs(gov_deficit - (delta_bonds + cb_ops - delta_deposits)) <= 1e-10
-            wn.writerow([t, f"{gov_deficit:.6f}", f"{delta_bonds:.6f}", f"{cb_ops:.6f}", f"{delta_deposits:.6f}", identity_ok])
+            wn.append((t, gov_deficit, delta_bonds, cb_ops, delta_deposits, identity_ok))
             # Simple default trigger: if loan interest exceeds an arbitrary capacity threshold for 3 consecutive periods
             capacity = 0.3 * st.wages
             default_event = False
@@ -156,9 +192,15 @@ def run_slice3(params: ParameterRegistry, horizon: int, outdir: Path):
                 st.bank_capital -= 0.5 * writeoff  # haircut
                 st.distress_count = 0
                 default_event = True
-            we.writerow([t, f"{lcr:.4f}", f"{cap_ratio:.4f}", int(lcr < 1.0), int(cap_ratio < cap_ratio_min), int(default_event)])
+            we.append((t, lcr, cap_ratio, int(lcr < 1.0), int(cap_ratio < cap_ratio_min), int(default_event)))
+            # Flows after the last cut-point (write-offs) are covered by the period-end check
+            end_period(ctx)
             # Emit placeholder macro series
-            w.writerow([t, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0])
+            row = (t, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+            tok = prof.start()
+            w.append(row)
+            stats.update(t, row[1:])
+            prof.stop("output", tok)
             # Simple trends for next period stocks
             st.wages *= 1.001
             st.gov_spending *= 1.0
@@ -167,4 +209,22 @@ def run_slice3(params: ParameterRegistry, horizon: int, outdir: Path):
             cap_ratio = st.bank_capital / max(1e-9, assets)
             if cap_ratio < cap_ratio_min:
                 rho_b = 0.0  # suppress dividends if under-capitalized
-    return series_path, fmres_path
+            if due(t, checkpoint_every):
+                tok = prof.start()
+                Checkpoint("slice3", t, asdict(st), extras={"rho_b": rho_b, "window_stats": stats.to_dict()},
+                           writers=sink_offsets([w, wres, wn, we]),
+                           config_hash=params.config_hash()).save(outdir)
+                prof.stop("checkpoint", tok)
+            rec[()] = row
+            if (yield rec):
+                break
+    if outdir is not None:
+        stats.save(outdir)
+        prof.save(outdir)
+    return w.path, wres.path
+
+
+def run_slice3(params: ParameterRegistry, horizon: int, outdir: Path | None, sinks: SinkFactory | str | None = None,
+               checkpoint_every: int | None = None, resume_from: Path | None = None,
+               subscribers: Iterable[Subscriber] = ()):
+    return drive(stream_slice3(params, horizon, outdir, sinks, checkpoint_every, resume_from), subscribers)
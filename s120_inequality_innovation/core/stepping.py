@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+"""
+Generator-based stepping for the engines.
+
+``stream_slice1/2/3`` and ``stream_simulation`` advance one period per
+iteration and yield a period record: a 0-d NumPy structured array that is
+overwritten in place every period (read ``rec["GDP"]`` or ``rec.item()``,
+``rec.copy()`` to keep it). Sending a truthy value into the generator ends
+the run after that period; the stream then closes its sinks, saves its
+end-of-run files and returns what the matching ``run_*`` function returns.
+Abandoning the generator (``break`` out of a ``for`` loop) also closes the
+sinks but skips the end-of-run saves.
+
+``drive`` runs a stream and passes each record to subscriber callbacks; a
+subscriber returning a truthy value stops the run. With no subscribers this
+costs one generator resume per period. ``run_slice1`` etc. are ``drive``
+over their stream, so a writer, an accumulator and an early-stopping check
+all consume one pass:
+
+    stats = WindowStats(...)
+    run_slice2(params, 1000, None, subscribers=[accumulate(stats), stop_when(lambda r: r["UNEMP"] > 0.4)])
+
+With ``outdir=None`` a stream writes nothing to disk: its sinks are
+``null`` and window stats, profiles and checkpoints are not saved.
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Generator, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..io.online_stats import WindowStats
+from ..io.sinks import Schema, SinkFactory, TableSink, as_sink_factory
+
+
+PeriodRecord = np.ndarray
+Subscriber = Callable[[PeriodRecord], Any]
+Stream = Generator[PeriodRecord, Any, Any]
+
+
+def new_record(schema: Schema) -> PeriodRecord:
+    """The reusable 0-d record a stream fills and yields each period."""
+    return np.zeros((), dtype=np.dtype([(name, dt) for name, dt in schema]))
+
+
+def open_outputs(outdir: Optional[Path], sinks: SinkFactory | str | None, checkpoint_every: int | None = None,
+                 resume_from: Path | None = None) -> Tuple[Path, SinkFactory]:
+    """Base directory and sink factory for a stream; ``outdir=None`` discards every table."""
+    if outdir is not None:
+        outdir.mkdir(parents=True, exist_ok=True)
+        return outdir, as_sink_factory(sinks)
+    if checkpoint_every or resume_from is not None:
+        raise ValueError("checkpointing and resuming need an outdir")
+    return Path(), as_sink_factory("null")
+
+
+def drive(stream: Stream, subscribers: Iterable[Subscriber] = ()) -> Any:
+    """Run ``stream`` to the end, or until a subscriber returns a truthy value; returns the stream's result."""
+    subs = tuple(subscribers)
+    try:
+        rec = next(stream)
+        if not subs:
+            while True:
+                stream.send(None)
+        while True:
+            stop = False
+            for fn in subs:
+                if fn(rec):
+                    stop = True
+            rec = stream.send(stop)
+    except StopIteration as e:
+        return e.value
+
+
+def to_sink(sink: TableSink) -> Subscriber:
+    """Append every record to ``sink`` (whose schema must match the stream's)."""
+    append = sink.append
+
+    def write(rec: PeriodRecord):
+        append(rec.item())
+
+    return write
+
+
+def accumulate(stats: WindowStats) -> Subscriber:
+    """Feed ``stats`` with each record's columns after ``t``."""
+    update = stats.update
+
+    def feed(rec: PeriodRecord):
+        row = rec.item()
+        update(row[0], row[1:])
+
+    return feed
+
+
+def stop_when(predicate: Callable[[PeriodRecord], bool]) -> Subscriber:
+    """Stop the run after the first period for which ``predicate`` holds."""
+    def check(rec: PeriodRecord) -> bool:
+        return bool(predicate(rec))
+
+    return check
+
+
+class Collector:
+    """Keeps a copy of every record; ``table()`` stacks them into a structured array."""
+
+    def __init__(self):
+        self.rows: List[PeriodRecord] = []
+
+    def __call__(self, rec: PeriodRecord):
+        self.rows.append(rec.copy())
+
+    def table(self) -> np.ndarray:
+        return np.stack(self.rows) if self.rows else np.zeros(0)
@@ -0,0 +1,372 @@
+from __future__ import annotations
+
+"""
+SQLite catalog of run directories.
+
+Every run directory that ``ArtifactWriter``, the slice runners or the oracle
+CLI writes is recorded as one row: scenario, config_hash, seeds, horizon,
+engine version, status and its files. Lookups by scenario / config_hash /
+seed are indexed queries instead of walks over ``artifacts/**/meta.json``.
+
+Recording is opt-in: runs are recorded only when ``S120_CATALOG`` names a
+database file, or is ``on`` for the repository's ``artifacts/catalog.sqlite``
+(resolved from the package, not the working directory). Library calls,
+benchmarks and tests therefore write nothing unless asked to. Each process
+keeps one connection per database, so the schema and WAL setup run once
+rather than per run. Recording never fails a run: database errors are
+reported and ignored. ``rebuild`` indexes existing trees from their
+meta.json files; the query commands and ``locate`` read the default file
+when the variable is unset.
+
+    python -m s120_inequality_innovation.io.catalog find --scenario baseline --status complete
+    python -m s120_inequality_innovation.io.catalog rebuild artifacts
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+
+DEFAULT_CATALOG = Path(__file__).resolve().parents[2] / "artifacts" / "catalog.sqlite"
+CATALOG_ENV = "S120_CATALOG"
+_ON = ("1", "on", "yes", "true")
+_OFF = ("", "0", "off", "no", "false", "none")
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    path TEXT PRIMARY KEY,
+    scenario TEXT,
+    config_hash TEXT,
+    seeds_hash TEXT,
+    seeds TEXT,
+    seed INTEGER,
+    run_id INTEGER,
+    horizon INTEGER,
+    engine_version TEXT,
+    kind TEXT,
+    status TEXT,
+    files TEXT,
+    created REAL,
+    updated REAL
+);
+CREATE INDEX IF NOT EXISTS runs_scenario ON runs (scenario, status);
+CREATE INDEX IF NOT EXISTS runs_config ON runs (config_hash, seeds_hash);
+CREATE INDEX IF NOT EXISTS runs_seed ON runs (seed);
+"""
+
+
+def seeds_hash(seeds: Optional[Dict[str, Any]]) -> Optional[str]:
+    if not seeds:
+        return None
+    blob = json.dumps(dict(sorted(seeds.items())), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class RunRecord:
+    path: Path
+    scenario: Optional[str]
+    config_hash: Optional[str]
+    seeds: Dict[str, Any]
+    seed: Optional[int]
+    run_id: Optional[int]
+    horizon: Optional[int]
+    engine_version: Optional[str]
+    kind: Optional[str]
+    status: Optional[str]
+    files: Dict[str, str]
+    created: float
+    updated: float
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "RunRecord":
+        return cls(
+            path=Path(row["path"]), scenario=row["scenario"], config_hash=row["config_hash"],
+            seeds=json.loads(row["seeds"] or "{}"), seed=row["seed"], run_id=row["run_id"],
+            horizon=row["horizon"], engine_version=row["engine_version"], kind=row["kind"],
+            status=row["status"], files=json.loads(row["files"] or "{}"),
+            created=row["created"], updated=row["updated"],
+        )
+
+    def file(self, name: str) -> Path:
+        return self.path / self.files.get(name, name)
+
+
+class Catalog:
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # MC workers record concurrently; WAL plus a busy timeout serialises them
+        self._con = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+        self._con.row_factory = sqlite3.Row
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.executescript(_SCHEMA)
+        self._con.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._con.commit()
+
+    @classmethod
+    def default(cls) -> Optional["Catalog"]:
+        """The catalog runs are recorded in, or None unless ``S120_CATALOG`` opts in."""
+        path = catalog_path()
+        return None if path is None else cls(path)
+
+    def close(self):
+        self._con.close()
+
+    def __enter__(self) -> "Catalog":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- writing ----------------------------------------------------------
+
+    def record(self, run_dir: Path, meta: Dict[str, Any], status: str, files: Optional[Dict[str, str]] = None,
+               kind: Optional[str] = None, scenario: Optional[str] = None):
+        """Insert or update the row for ``run_dir`` from its meta.json contents."""
+        now = time.time()
+        seeds = meta.get("seeds") or {}
+        seed = meta.get("seed")
+        row = {
+            "path": str(Path(run_dir).resolve()),
+            "scenario": scenario or meta.get("scenario") or _scenario_from_path(Path(run_dir)),
+            "config_hash": meta.get("config_hash"),
+            "seeds_hash": seeds_hash(seeds),
+            "seeds": json.dumps(seeds, sort_keys=True),
+            "seed": int(seed) if isinstance(seed, (int, float)) or str(seed).isdigit() else None,
+            "run_id": meta.get("run_id"),
+            "horizon": meta.get("horizon"),
+            "engine_version": None if meta.get("engine_version") is None else str(meta["engine_version"]),
+            "kind": kind or meta.get("kind"),
+            "status": status,
+            "files": json.dumps(files or {}, sort_keys=True),
+            "created": now,
+            "updated": now,
+        }
+        cols = ", ".join(row)
+        marks = ", ".join(f":{c}" for c in row)
+        # created survives re-records; everything else reflects the latest write
+        updates = ", ".join(f"{c}=excluded.{c}" for c in row if c not in ("path", "created"))
+        self._con.execute(
+            f"INSERT INTO runs ({cols}) VALUES ({marks}) ON CONFLICT(path) DO UPDATE SET {updates}", row
+        )
+        self._con.commit()
+
+    def set_status(self, run_dir: Path, status: str, files: Optional[Dict[str, str]] = None):
+        path = str(Path(run_dir).resolve())
+        if files is None:
+            self._con.execute("UPDATE runs SET status=?, updated=? WHERE path=?", (status, time.time(), path))
+        else:
+            self._con.execute("UPDATE runs SET status=?, files=?, updated=? WHERE path=?",
+                              (status, json.dumps(files, sort_keys=True), time.time(), path))
+        self._con.commit()
+
+    def forget(self, run_dir: Path):
+        self._con.execute("DELETE FROM runs WHERE path=?", (str(Path(run_dir).resolve()),))
+        self._con.commit()
+
+    def index_tree(self, root: Path, status: str = "complete") -> int:
+        """Record every ``meta.json`` under ``root``; returns the number of runs indexed."""
+        n = 0
+        for meta_p in sorted(Path(root).rglob("meta.json")):
+            try:
+                meta = json.loads(meta_p.read_text(encoding="utf-8"))
+            except Exception:
+                continue
+            run_dir = meta_p.parent
+            files = dir_files(run_dir)
+            st = status
+            if meta.get("java_run_ok") is False:
+                st = "failed"
+            self.record(run_dir, meta, st, files=files)
+            n += 1
+        return n
+
+    def prune_missing(self) -> int:
+        """Drop rows whose directory no longer exists."""
+        gone = [r["path"] for r in self._con.execute("SELECT path FROM runs") if not Path(r["path"]).exists()]
+        self._con.executemany("DELETE FROM runs WHERE path=?", [(p,) for p in gone])
+        self._con.commit()
+        return len(gone)
+
+    # --- querying ---------------------------------------------------------
+
+    def find(self, scenario: Optional[str] = None, config_hash: Optional[str] = None,
+             seeds: Optional[Dict[str, Any]] = None, seed: Optional[int] = None, run_id: Optional[int] = None,
+             status: Optional[str] = None, engine_version: Optional[str] = None, kind: Optional[str] = None,
+             under: Optional[Path] = None, limit: Optional[int] = None) -> List[RunRecord]:
+        """Runs matching every given field, newest first."""
+        where: List[str] = []
+        args: List[Any] = []
+        for col, val in (("scenario", scenario), ("config_hash", config_hash), ("seeds_hash", seeds_hash(seeds)),
+                         ("seed", seed), ("run_id", run_id), ("status", status), ("kind", kind),
+                         ("engine_version", None if engine_version is None else str(engine_version))):
+            if val is not None:
+                where.append(f"{col}=?")
+                args.append(val)
+        if under is not None:
+            # A key range on the primary key instead of LIKE, so it stays an index lookup
+            prefix = str(Path(under).resolve()).rstrip(os.sep) + os.sep
+            where.append("path >= ? AND path < ?")
+            args += [prefix, prefix[:-1] + chr(ord(os.sep) + 1)]
+        sql = "SELECT * FROM runs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY updated DESC, path"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return [RunRecord.from_row(r) for r in self._con.execute(sql, args)]
+
+    def latest(self, **query) -> Optional[RunRecord]:
+        hits = self.find(limit=1, **query)
+        return hits[0] if hits else None
+
+    def get(self, run_dir: Path) -> Optional[RunRecord]:
+        r = self._con.execute("SELECT * FROM runs WHERE path=?", (str(Path(run_dir).resolve()),)).fetchone()
+        return RunRecord.from_row(r) if r else None
+
+    def counts(self) -> Dict[str, int]:
+        rows = self._con.execute("SELECT status, COUNT(*) AS n FROM runs GROUP BY status")
+        return {r["status"]: r["n"] for r in rows}
+
+
+def dir_files(run_dir: Path) -> Dict[str, str]:
+    """``{stem: file name}`` for the files directly in ``run_dir``."""
+    return {p.stem: p.name for p in sorted(Path(run_dir).iterdir()) if p.is_file()}
+
+
+def _scenario_from_path(run_dir: Path) -> str:
+    # MC replications live in <scenario>/run_XXX
+    return run_dir.parent.name if run_dir.name.startswith("run_") else run_dir.name
+
+
+def catalog_path(reading: bool = False) -> Optional[Path]:
+    """Database named by ``S120_CATALOG``; when unset, ``DEFAULT_CATALOG`` for ``reading`` only."""
+    loc = os.environ.get(CATALOG_ENV)
+    if loc is None:
+        return DEFAULT_CATALOG if reading else None
+    if loc.strip().lower() in _OFF:
+        return None
+    return DEFAULT_CATALOG if loc.strip().lower() in _ON else Path(loc)
+
+
+_SHARED: Dict[tuple, Catalog] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def _shared() -> Optional[Catalog]:
+    """This process's connection to the recording catalog, opened on first use."""
+    path = catalog_path()
+    if path is None:
+        return None
+    # Keyed by pid as well: a forked child must not reuse its parent's connection
+    key = (os.getpid(), str(path.resolve()))
+    cat = _SHARED.get(key)
+    if cat is None:
+        cat = _SHARED[key] = Catalog(path)
+    return cat
+
+
+def _record(run_dir: Path, write):
+    try:
+        with _SHARED_LOCK:
+            cat = _shared()
+            if cat is not None:
+                write(cat)
+    except sqlite3.Error as e:
+        print(f"Warning: run catalog not updated for {run_dir}: {e}", file=sys.stderr)
+
+
+def record_run(run_dir: Path, meta: Dict[str, Any], status: str, files: Optional[Dict[str, str]] = None,
+               kind: Optional[str] = None, scenario: Optional[str] = None):
+    """Record ``run_dir`` in the catalog if recording is on; a catalog failure never fails the run."""
+    _record(run_dir, lambda cat: cat.record(run_dir, meta, status, files=files, kind=kind, scenario=scenario))
+
+
+def set_run_status(run_dir: Path, status: str, files: Optional[Dict[str, str]] = None):
+    _record(run_dir, lambda cat: cat.set_status(run_dir, status, files=files))
+
+
+def index_tree(root: Path):
+    """Record the runs under ``root`` (e.g. restored from a cache) if recording is on."""
+    _record(root, lambda cat: cat.index_tree(root))
+
+
+def locate(scenario: str, default: Path, **query) -> Path:
+    """Newest complete run dir for ``scenario``, else ``default`` (for scripts with fixed layouts)."""
+    try:
+        path = catalog_path(reading=True)
+        if path is not None and path.exists():
+            with Catalog(path) as cat:
+                rec = cat.latest(scenario=scenario, status="complete", **query)
+            if rec is not None and rec.path.exists():
+                return rec.path
+    except sqlite3.Error:
+        pass
+    return default
+
+
+def _print_records(recs: Iterable[RunRecord], as_json: bool):
+    for r in recs:
+        if as_json:
+            d = {k: v for k, v in r.__dict__.items()}
+            d["path"] = str(r.path)
+            print(json.dumps(d, sort_keys=True))
+        else:
+            seed = r.seed if r.seed is not None else (f"run {r.run_id}" if r.run_id is not None else "-")
+            print(f"{r.scenario}\t{r.config_hash}\t{seed}\t{r.status}\t{r.path}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    p = argparse.ArgumentParser(description="Query and maintain the run catalog")
+    p.add_argument("--db", default=None, help=f"Catalog file (default ${CATALOG_ENV}, else {DEFAULT_CATALOG})")
+    sub = p.add_subparsers(dest="cmd", required=True)
+    f = sub.add_parser("find", help="List runs matching the given fields")
+    f.add_argument("--scenario")
+    f.add_argument("--config-hash")
+    f.add_argument("--seed", type=int)
+    f.add_argument("--run-id", type=int)
+    f.add_argument("--status")
+    f.add_argument("--engine-version")
+    f.add_argument("--kind")
+    f.add_argument("--under", help="Only runs below this directory")
+    f.add_argument("--limit", type=int)
+    f.add_argument("--json", action="store_true", help="One JSON object per line")
+    r = sub.add_parser("rebuild", help="Index existing run trees from their meta.json files")
+    r.add_argument("roots", nargs="*", default=["artifacts"])
+    sub.add_parser("prune", help="Drop rows whose directory no longer exists")
+    sub.add_parser("stats", help="Run counts by status")
+    a = p.parse_args(argv)
+    path = Path(a.db) if a.db else catalog_path(reading=True)
+    if path is None:
+        print(f"catalog disabled (${CATALOG_ENV}=off)")
+        return 1
+    with Catalog(path) as cat:
+        if a.cmd == "find":
+            recs = cat.find(scenario=a.scenario, config_hash=a.config_hash, seed=a.seed, run_id=a.run_id,
+                            status=a.status, engine_version=a.engine_version, kind=a.kind,
+                            under=Path(a.under) if a.under else None, limit=a.limit)
+            _print_records(recs, a.json)
+        elif a.cmd == "rebuild":
+            n = sum(cat.index_tree(Path(root)) for root in a.roots)
+            print(f"indexed {n} runs into {cat.db_path}")
+        elif a.cmd == "prune":
+            print(f"removed {cat.prune_missing()} stale rows")
+        else:
+            for status, n in sorted(cat.counts().items(), key=lambda kv: str(kv[0])):
+                print(f"{status}\t{n}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
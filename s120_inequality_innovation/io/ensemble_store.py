@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+"""
+Memory-mapped ensemble store: one ``(run, t, metric)`` block per scenario.
+
+``<root>/ensemble.bin`` holds the values (float64 or float32, run-major,
+NaN until written) and ``<root>/progress.bin`` the last period written per
+run; ``<root>/ensemble.json`` carries metrics, shape, seeds, config_hash
+and model_hash (the config hash without the shape keys ``meta.horizon`` and
+``meta.mc_runs``). The period axis is indexed by ``t`` itself (row 0 is unused),
+so ``store[:, 501:1001, "GDP"]`` is the evaluation window of every run.
+Reads are views on the mapping: nothing is parsed and only touched pages
+become resident.
+
+Each run writes only its own slab and progress slot, so replications in
+separate processes can append concurrently while readers follow along.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+DATA_NAME = "ensemble.bin"
+PROGRESS_NAME = "progress.bin"
+SIDECAR_NAME = "ensemble.json"
+# Parameters that only size the store; model_hash leaves them out so a store can be enlarged
+SHAPE_KEYS = ("meta.horizon", "meta.mc_runs")
+
+
+class EnsembleStore:
+    def __init__(self, root: Path, meta: Dict, mode: str = "r"):
+        self.root = root
+        self.meta = meta
+        self.metrics: List[str] = list(meta["metrics"])
+        self._col = {m: i for i, m in enumerate(self.metrics)}
+        shape = (int(meta["n_runs"]), int(meta["horizon"]) + 1, len(self.metrics))
+        self.data = np.memmap(root / DATA_NAME, dtype=meta["dtype"], mode=mode, shape=shape)
+        self.progress = np.memmap(root / PROGRESS_NAME, dtype="i8", mode=mode, shape=(shape[0],))
+
+    # --- construction -----------------------------------------------------
+
+    @classmethod
+    def create(cls, root: Path, metrics: Sequence[str], n_runs: int, horizon: int, dtype: str = "f8",
+               seeds: Optional[Dict] = None, config_hash: Optional[str] = None,
+               model_hash: Optional[str] = None) -> "EnsembleStore":
+        root.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "metrics": list(metrics), "n_runs": int(n_runs), "horizon": int(horizon),
+            "dtype": np.dtype(dtype).str, "seeds": seeds or {}, "config_hash": config_hash,
+            "model_hash": model_hash,
+        }
+        data = np.memmap(root / DATA_NAME, dtype=meta["dtype"], mode="w+", shape=(n_runs, horizon + 1, len(metrics)))
+        data[:] = np.nan
+        data.flush()
+        del data
+        np.memmap(root / PROGRESS_NAME, dtype="i8", mode="w+", shape=(n_runs,)).flush()
+        cls._write_meta(root, meta)
+        return cls(root, meta, mode="r+")
+
+    @classmethod
+    def open(cls, root: Path, mode: str = "r") -> "EnsembleStore":
+        meta = json.loads((root / SIDECAR_NAME).read_text(encoding="utf-8"))
+        return cls(root, meta, mode=mode)
+
+    @classmethod
+    def ensure(cls, root: Path, metrics: Sequence[str], n_runs: int, horizon: int, dtype: str = "f8",
+               seeds: Optional[Dict] = None, config_hash: Optional[str] = None,
+               model_hash: Optional[str] = None) -> "EnsembleStore":
+        """Open ``root`` for appending, creating or enlarging it to ``(n_runs, horizon)``.
+
+        Existing values and progress are kept (resumed runs continue in place)
+        when the store holds the same runs: same seeds and ``model_hash``, or,
+        for a store of the same shape, the same ``config_hash``. A store with
+        other runs, metrics or dtype is replaced.
+        """
+        args = (root, metrics, n_runs, horizon, dtype, seeds, config_hash, model_hash)
+        if not (root / SIDECAR_NAME).exists():
+            return cls.create(*args)
+        old = cls.open(root)
+        same_shape = old.data.shape[:2] == (n_runs, horizon + 1)
+        if model_hash is not None and old.meta.get("model_hash") is not None:
+            same_runs = old.meta["model_hash"] == model_hash
+        else:
+            same_runs = not same_shape or config_hash is None or old.meta.get("config_hash") == config_hash
+        same_runs = same_runs and (seeds is None or old.meta.get("seeds") == seeds)
+        if old.metrics != list(metrics) or old.data.dtype != np.dtype(dtype) or not same_runs:
+            del old
+            return cls.create(*args)
+        if same_shape:
+            meta = dict(old.meta, config_hash=config_hash, model_hash=model_hash)
+            del old
+            cls._write_meta(root, meta)
+            return cls.open(root, mode="r+")
+        keep = np.array(old.data[:n_runs, : horizon + 1])
+        prog = np.minimum(np.array(old.progress[:n_runs]), horizon)
+        del old
+        new = cls.create(*args)
+        new.data[: keep.shape[0], : keep.shape[1]] = keep
+        new.progress[: prog.size] = prog
+        new.flush()
+        return new
+
+    @staticmethod
+    def _write_meta(root: Path, meta: Dict):
+        (root / SIDECAR_NAME).write_text(json.dumps(meta, indent=2, sort_keys=True), encoding="utf-8")
+
+    # --- writing ----------------------------------------------------------
+
+    def append(self, run: int, t: int, values: Sequence[float]):
+        """Write period ``t`` of ``run`` (0-based run index)."""
+        self.data[run, t] = values
+        self.progress[run] = t
+
+    def flush(self):
+        self.data.flush()
+        self.progress.flush()
+
+    # --- reading ----------------------------------------------------------
+
+    def _metric_index(self, key):
+        if isinstance(key, str):
+            return self._col[key]
+        if isinstance(key, (list, tuple)) and key and isinstance(key[0], str):
+            return [self._col[k] for k in key]
+        return key
+
+    def __getitem__(self, key) -> np.ndarray:
+        if isinstance(key, tuple) and len(key) == 3:
+            key = key[:2] + (self._metric_index(key[2]),)
+        return self.data[key]
+
+    def column(self, metric: str) -> np.ndarray:
+        """``(run, t)`` view of one metric."""
+        return self.data[:, :, self._col[metric]]
+
+    def last(self) -> np.ndarray:
+        """``(run, metric)`` values at each run's last written period."""
+        runs = np.arange(self.data.shape[0])
+        return np.asarray(self.data[runs, np.asarray(self.progress)])
+
+    def run_columns(self, run: int) -> Dict[str, np.ndarray]:
+        """Written periods of one run as ``{"t": ..., metric: ...}``, like ``sinks.load_columns``."""
+        n = int(self.progress[run])
+        block = np.asarray(self.data[run, 1 : n + 1])
+        out = {"t": np.arange(1, n + 1)}
+        out.update({m: block[:, i] for i, m in enumerate(self.metrics)})
+        return out
@@ -6,6 +6,8 @@ from typing import Dict, List, Tuple
 
 import pandas as pd
 
+from .online_stats import STATS_NAME, WindowStats
+
 
 @dataclass
 class ParityResult:
@@ -19,12 +21,21 @@ def _window_mean(df: pd.DataFrame, cols: List[str], t0: int, t1: int) -> pd.Seri
     return w[present].mean()
 
 
+def _python_window_mean(python_csv: Path, cols: List[str], t0: int, t1: int) -> pd.Series:
+    # Prefer the run's streaming accumulators when they cover the same window
+    stats_path = python_csv.parent / STATS_NAME
+    if stats_path.exists():
+        ws = WindowStats.load(python_csv.parent)
+        if (ws.t0, ws.t1) == (t0, t1) and ws.n:
+            return pd.Series(ws.means())
+    return _window_mean(pd.read_csv(python_csv), cols, t0, t1)
+
+
 def compare_baseline(python_csv: Path, java_csv: Path, t0: int = 501, t1: int = 1000) -> ParityResult:
-    p = pd.read_csv(python_csv)
     j = pd.read_csv(java_csv)
     j = canonicalize_java_headers(j)
     cols = ["GDP", "CONS", "INV", "INFL", "UNEMP", "PROD_C"]
-    pm = _window_mean(p, cols, t0, t1)
+    pm = _python_window_mean(python_csv, cols, t0, t1)
     jm = _window_mean(j, cols, t0, t1)
     rel: Dict[str, float] = {}
     for c in cols:
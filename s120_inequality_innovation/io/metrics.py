@@ -1,52 +1,130 @@
 from __future__ import annotations
 
-from typing import Iterable, Tuple
+"""
+Inequality metrics over the last axis of an array.
+
+Every function accepts a single distribution ``(N,)`` or a batch such as
+``(T, N)`` or ``(runs, T, N)`` and returns one value per leading index, from
+one sort and one cumulative sum along the agent axis. Optional ``weights``
+(broadcastable to the input) give population-weighted measures. Rows with
+negative entries are shifted by their minimum, as before.
+"""
+
+from typing import Dict, Iterable, Optional, Sequence, Tuple
 import numpy as np
 import pandas as pd
 
 
-def gini(array: Iterable[float]) -> float:
-    x = np.array(list(array), dtype=float)
-    if x.size == 0:
-        return float("nan")
-    if np.any(x < 0):
-        x = x - x.min()
-    x = np.sort(x)
-    n = x.size
-    if n == 0 or x.sum() == 0:
-        return 0.0
-    cumx = np.cumsum(x)
-    g = (n + 1 - 2 * (cumx.sum() / cumx[-1])) / n
-    return float(g)
-
-
-def lorenz_curve(array: Iterable[float]) -> Tuple[np.ndarray, np.ndarray]:
-    x = np.array(list(array), dtype=float)
-    if x.size == 0:
-        return np.array([0.0]), np.array([0.0])
-    if np.any(x < 0):
-        x = x - x.min()
-    x = np.sort(x)
-    cumx = np.cumsum(x)
-    cumx = np.insert(cumx, 0, 0.0)
-    cumx = cumx / cumx[-1] if cumx[-1] != 0 else cumx
-    p = np.linspace(0.0, 1.0, cumx.size)
-    return p, cumx
-
-
-def top_share(array: Iterable[float], top_fraction: float = 0.1) -> float:
-    x = np.array(list(array), dtype=float)
-    if x.size == 0:
-        return float("nan")
-    if np.any(x < 0):
-        x = x - x.min()
-    x = np.sort(x)
-    n_top = max(1, int(np.ceil(top_fraction * x.size)))
-    return float(np.sum(x[-n_top:]) / (np.sum(x) + 1e-12))
-
-
-def compute_inequality_df(income: Iterable[float], wealth: Iterable[float]) -> pd.DataFrame:
-    gi = gini(income)
-    gw = gini(wealth)
-    return pd.DataFrame({"Gini_income": [gi], "Gini_wealth": [gw]})
+def _as_array(x) -> np.ndarray:
+    if not isinstance(x, np.ndarray) and not hasattr(x, "__array__") and not isinstance(x, (list, tuple)):
+        x = list(x)
+    return np.asarray(x, dtype=float)
+
+
+def _sorted(x, weights=None) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    x = _as_array(x)
+    if x.shape[-1:] != (0,):
+        lo = x.min(axis=-1, keepdims=True)
+        x = np.where(lo < 0, x - lo, x)
+    if weights is None:
+        return np.sort(x, axis=-1), None
+    w = np.broadcast_to(_as_array(weights), x.shape)
+    order = np.argsort(x, axis=-1)
+    return np.take_along_axis(x, order, axis=-1), np.take_along_axis(w, order, axis=-1)
+
+
+def _lorenz(xs: np.ndarray, ws: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Population and income shares with a leading 0, shape ``(..., N + 1)``."""
+    n = xs.shape[-1]
+    pad = [(0, 0)] * (xs.ndim - 1) + [(1, 0)]
+    if ws is None:
+        cum = np.pad(np.cumsum(xs, axis=-1), pad)
+        p = np.linspace(0.0, 1.0, n + 1)
+    else:
+        cum = np.pad(np.cumsum(xs * ws, axis=-1), pad)
+        cw = np.pad(np.cumsum(ws, axis=-1), pad)
+        p = cw / cw[..., -1:]
+    total = cum[..., -1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        L = np.where(total != 0, cum / total, cum)
+    return p, L
+
+
+def _scalar(v: np.ndarray):
+    return float(v) if np.ndim(v) == 0 else v
+
+
+def _gini(xs: np.ndarray, ws: Optional[np.ndarray]) -> np.ndarray:
+    n = xs.shape[-1]
+    if n == 0:
+        return np.full(xs.shape[:-1], np.nan)
+    p, L = _lorenz(xs, ws)
+    # G = 1 − Σ Δp_i (L_i + L_{i−1}); zero-income rows give L ≡ 0 and are reported as 0
+    dp = np.diff(p, axis=-1)
+    g = 1.0 - (dp * (L[..., 1:] + L[..., :-1])).sum(axis=-1)
+    return np.where(L[..., -1] == 0, 0.0, g)
+
+
+def _top_share(xs: np.ndarray, ws: Optional[np.ndarray], top_fraction: float) -> np.ndarray:
+    n = xs.shape[-1]
+    if n == 0:
+        return np.full(xs.shape[:-1], np.nan)
+    if ws is None:
+        n_top = max(1, int(np.ceil(top_fraction * n)))
+        return xs[..., -n_top:].sum(axis=-1) / (xs.sum(axis=-1) + 1e-12)
+    # Weighted: 1 − L(1 − f), interpolating the Lorenz curve inside the boundary unit
+    p, L = _lorenz(xs, ws)
+    q = 1.0 - top_fraction
+    hi = np.clip((p < q).sum(axis=-1, keepdims=True), 1, n)
+    p0, p1 = np.take_along_axis(p, hi - 1, -1), np.take_along_axis(p, hi, -1)
+    l0, l1 = np.take_along_axis(L, hi - 1, -1), np.take_along_axis(L, hi, -1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frac = np.where(p1 > p0, (q - p0) / (p1 - p0), 0.0)
+    return (1.0 - (l0 + frac * (l1 - l0)))[..., 0]
+
+
+def gini(array: Iterable[float], weights=None):
+    """Gini coefficient per row; a float for 1-D input."""
+    xs, ws = _sorted(array, weights)
+    return _scalar(_gini(xs, ws))
+
+
+def lorenz_curve(array: Iterable[float], weights=None) -> Tuple[np.ndarray, np.ndarray]:
+    """(population share, cumulative income share) with a leading 0 along the last axis.
+
+    Unweighted population shares are shared by every row and returned 1-D.
+    """
+    xs, ws = _sorted(array, weights)
+    if xs.shape[-1] == 0:
+        return np.array([0.0]), np.zeros(xs.shape[:-1] + (1,))
+    return _lorenz(xs, ws)
+
+
+def top_share(array: Iterable[float], top_fraction: float = 0.1, weights=None):
+    """Share of the total held by the top ``top_fraction`` per row; a float for 1-D input."""
+    xs, ws = _sorted(array, weights)
+    return _scalar(_top_share(xs, ws, top_fraction))
+
+
+def inequality_summary(array, weights=None, top_fractions: Sequence[float] = (0.1,)) -> Dict[str, np.ndarray]:
+    """Gini and top shares (``top10`` for 0.1, ...) from a single sort."""
+    xs, ws = _sorted(array, weights)
+    out = {"gini": _gini(xs, ws)}
+    for f in top_fractions:
+        out[f"top{round(f * 100):g}"] = _top_share(xs, ws, f)
+    return out
+
+
+def compute_inequality_df(income, wealth, weights=None, top_shares: bool = False) -> pd.DataFrame:
+    """Per-period inequality table from ``(N,)`` or ``(T, N)`` household income and wealth.
 
+    Columns are ``Gini_income`` and ``Gini_wealth``; ``top_shares`` adds
+    ``Top10_income`` and ``Top10_wealth`` from the same sorts.
+    """
+    fractions = (0.1,) if top_shares else ()
+    inc = inequality_summary(income, weights, fractions)
+    wth = inequality_summary(wealth, weights, fractions)
+    cols = {"Gini_income": inc["gini"], "Gini_wealth": wth["gini"]}
+    if top_shares:
+        cols.update({"Top10_income": inc["top10"], "Top10_wealth": wth["top10"]})
+    return pd.DataFrame({k: np.atleast_1d(v) for k, v in cols.items()})
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+"""
+Streaming statistics over the evaluation window.
+
+Engines feed one row of canonical metrics per period; ``WindowStats`` keeps
+Welford mean/variance, min/max and the lag-1 autocovariance for every metric
+over ``[t0, t1]`` without storing the series. ``pool`` combines per-run
+accumulators into cross-replication means, variances and confidence bands.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+STATS_NAME = "window_stats.json"
+
+
+def eval_window(params) -> Tuple[int, int]:
+    """Inclusive (t0, t1) from ``meta.eval_window_start/end``.
+
+    ``eval_window_start`` is the last burn-in period, so 500/1000 gives the
+    paper's t=501–1000 window used by the sweeps and parity checks.
+    """
+    start = int(params.get("meta.eval_window_start", 500))
+    end = int(params.get("meta.eval_window_end", 1000))
+    return start + 1, end
+
+
+class WindowStats:
+    def __init__(self, metrics: Sequence[str], t0: int, t1: int):
+        self.metrics: List[str] = list(metrics)
+        self.t0 = int(t0)
+        self.t1 = int(t1)
+        m = len(self.metrics)
+        self.n = 0
+        self.mean = np.zeros(m)
+        self.m2 = np.zeros(m)
+        self.min = np.full(m, np.inf)
+        self.max = np.full(m, -np.inf)
+        # Lag-1 co-moments on values shifted by the first observation (keeps sums small)
+        self.shift = np.zeros(m)
+        self.prev = np.zeros(m)
+        self.s_xy = np.zeros(m)
+        self.s_head = np.zeros(m)
+        self.s_tail = np.zeros(m)
+
+    def update(self, t: int, values: Sequence[float]):
+        if t < self.t0 or t > self.t1:
+            return
+        x = np.asarray(values, dtype=float)
+        self.n += 1
+        if self.n == 1:
+            self.shift = x.copy()
+        else:
+            y, yp = x - self.shift, self.prev - self.shift
+            self.s_xy += y * yp
+            self.s_head += y
+            self.s_tail += yp
+        d = x - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (x - self.mean)
+        np.minimum(self.min, x, out=self.min)
+        np.maximum(self.max, x, out=self.max)
+        self.prev = x
+
+    @property
+    def var(self) -> np.ndarray:
+        return self.m2 / (self.n - 1) if self.n > 1 else np.full(len(self.metrics), np.nan)
+
+    @property
+    def autocov1(self) -> np.ndarray:
+        """Lag-1 autocovariance, (1/n) Σ (x_t − μ)(x_{t−1} − μ)."""
+        if self.n < 2:
+            return np.full(len(self.metrics), np.nan)
+        mu = self.mean - self.shift
+        return (self.s_xy - mu * (self.s_head + self.s_tail) + (self.n - 1) * mu * mu) / self.n
+
+    @property
+    def autocorr1(self) -> np.ndarray:
+        pop_var = self.m2 / self.n if self.n else np.full(len(self.metrics), np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.autocov1 / pop_var
+
+    def means(self) -> Dict[str, float]:
+        if self.n == 0:
+            return {}
+        return {m: float(v) for m, v in zip(self.metrics, self.mean)}
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        var, ac, acr = self.var, self.autocov1, self.autocorr1
+        return {
+            m: {
+                "n": self.n,
+                "mean": float(self.mean[i]) if self.n else float("nan"),
+                "var": float(var[i]),
+                "min": float(self.min[i]),
+                "max": float(self.max[i]),
+                "autocov1": float(ac[i]),
+                "autocorr1": float(acr[i]),
+            }
+            for i, m in enumerate(self.metrics)
+        }
+
+    # --- persistence ------------------------------------------------------
+
+    _ARRAYS = ("mean", "m2", "min", "max", "shift", "prev", "s_xy", "s_head", "s_tail")
+
+    def to_dict(self) -> Dict:
+        d = {"metrics": self.metrics, "t0": self.t0, "t1": self.t1, "n": self.n}
+        d.update({k: getattr(self, k).tolist() for k in self._ARRAYS})
+        return d
+
+    @classmethod
+    def from_dict(cls, d: Dict) -> "WindowStats":
+        ws = cls(d["metrics"], d["t0"], d["t1"])
+        ws.n = int(d["n"])
+        for k in cls._ARRAYS:
+            setattr(ws, k, np.asarray(d[k], dtype=float))
+        return ws
+
+    def save(self, run_dir: Path) -> Path:
+        path = run_dir / STATS_NAME
+        payload = self.to_dict()
+        payload["summary"] = self.summary()
+        path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+        return path
+
+    @classmethod
+    def load(cls, run_dir: Path) -> "WindowStats":
+        return cls.from_dict(json.loads((run_dir / STATS_NAME).read_text(encoding="utf-8")))
+
+
+def pool(stats: Sequence[WindowStats], z: float = 1.96) -> Dict[str, Dict[str, float]]:
+    """Cross-replication summary per metric.
+
+    ``mean``/``var`` pool every windowed observation (Chan et al. merge of the
+    Welford moments); ``ci_low``/``ci_high`` are ``z`` standard errors of the
+    mean of run means, the usual MC band.
+    """
+    stats = [s for s in stats if s.n > 0]
+    if not stats:
+        return {}
+    metrics = stats[0].metrics
+    n = np.array([s.n for s in stats], dtype=float)
+    means = np.stack([s.mean for s in stats])
+    m2 = np.stack([s.m2 for s in stats])
+    total = n.sum()
+    grand = (n[:, None] * means).sum(axis=0) / total
+    m2_pooled = m2.sum(axis=0) + (n[:, None] * (means - grand) ** 2).sum(axis=0)
+    r = len(stats)
+    run_mean = means.mean(axis=0)
+    between = means.var(axis=0, ddof=1) if r > 1 else np.full(len(metrics), np.nan)
+    half = z * np.sqrt(between / r)
+    return {
+        m: {
+            "n_runs": r,
+            "mean": float(grand[i]),
+            "var": float(m2_pooled[i] / (total - 1)) if total > 1 else float("nan"),
+            "between_var": float(between[i]),
+            "ci_low": float(run_mean[i] - half[i]),
+            "ci_high": float(run_mean[i] + half[i]),
+        }
+        for i, m in enumerate(metrics)
+    }
@@ -2,19 +2,24 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import matplotlib.pyplot as plt
-import pandas as pd
-
 
 def plot_smoke(baseline_dir: Path = Path("artifacts") / "smoke"):
     # Read latest baseline summary if present, else generate from baseline artifacts
-    series_files = list((Path("artifacts") / "baseline").glob("run_*/series.csv"))
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
+    from .ensemble_store import SIDECAR_NAME, EnsembleStore
+    root = Path("artifacts") / "baseline"
+    series_files = sorted(root.glob("run_*/series.csv"))
     outdir = baseline_dir / "plots"
     outdir.mkdir(parents=True, exist_ok=True)
-    if not series_files:
-        return []
     # Use the first run for simple plots
-    df = pd.read_csv(series_files[0])
+    if (root / SIDECAR_NAME).exists():
+        df = pd.DataFrame(EnsembleStore.open(root).run_columns(0))
+    elif series_files:
+        df = pd.read_csv(series_files[0])
+    else:
+        return []
     figs = []
     for col, fname in [
         ("GDP", "gdp.png"),
@@ -35,6 +40,9 @@ def plot_smoke(baseline_dir: Path = Path("artifacts") / "smoke"):
 
 
 def plot_lorenz(inequality_csv: Path, outdir: Path = Path("artifacts") / "figures"):
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
     from .metrics import lorenz_curve
     outdir.mkdir(parents=True, exist_ok=True)
     df = pd.read_csv(inequality_csv)
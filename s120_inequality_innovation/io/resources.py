@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+"""
+Per-run resource accounting.
+
+A ``ResourceMeter`` is started when a run directory is opened and finished
+when the run closes; the result goes into the run's ``meta.json`` under
+``"resources"``:
+
+    wall_s, cpu_user_s, cpu_sys_s   elapsed and CPU time of the run
+    peak_rss_mb                     peak RSS of the process that ran it
+    bytes_written                   growth of the run directory
+    periods, periods_per_s          simulated periods and throughput
+
+Oracle runs add ``jvm_heap_peak_mb``, ``jvm_gc_s`` and ``jvm_gc_count``.
+Peak RSS is the high-water mark of the whole process (``getrusage`` cannot
+be reset), so for pool workers running several replications it bounds the
+run rather than isolating it. ``rollup`` aggregates runs for sweep summaries.
+"""
+
+import json
+import os
+import resource
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+
+RESOURCES_KEY = "resources"
+# Columns added to sweep summaries, in order
+ROLLUP_COLUMNS = ["runs", "wall_s", "cpu_user_s", "cpu_sys_s", "peak_rss_mb", "bytes_written", "periods",
+                  "periods_per_s"]
+
+
+def tree_bytes(path: Path) -> int:
+    """Total size of the files under ``path`` (0 if it does not exist)."""
+    if not path.exists():
+        return 0
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    ru = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return ru / (2 ** 20 if sys.platform == "darwin" else 2 ** 10)
+
+
+@dataclass
+class ResourceMeter:
+    run_dir: Path
+    wall0: float
+    user0: float
+    sys0: float
+    bytes0: int
+
+    @classmethod
+    def start(cls, run_dir: Path) -> "ResourceMeter":
+        t = os.times()
+        return cls(run_dir, time.perf_counter(), t.user, t.system, tree_bytes(run_dir))
+
+    def finish(self, periods: Optional[int] = None) -> Dict[str, float]:
+        t = os.times()
+        wall = time.perf_counter() - self.wall0
+        out: Dict[str, float] = {
+            "wall_s": round(wall, 6),
+            "cpu_user_s": round(t.user - self.user0, 6),
+            "cpu_sys_s": round(t.system - self.sys0, 6),
+            "peak_rss_mb": round(peak_rss_mb(), 3),
+            "bytes_written": max(0, tree_bytes(self.run_dir) - self.bytes0),
+        }
+        if periods is not None:
+            out["periods"] = int(periods)
+            out["periods_per_s"] = round(periods / wall, 3) if wall > 0 else 0.0
+        return out
+
+
+def share(usage: Dict[str, float], n: int, run_dir: Path) -> Dict[str, float]:
+    """One run's part of ``usage`` measured over ``n`` runs simulated together (vectorized ensembles).
+
+    Times and periods are split evenly, peak RSS is the shared process's and
+    bytes are measured on ``run_dir`` itself.
+    """
+    out = dict(usage)
+    for k in ("wall_s", "cpu_user_s", "cpu_sys_s"):
+        out[k] = round(usage[k] / n, 6)
+    if "periods" in usage:
+        out["periods"] = int(usage["periods"] // n)
+    out["bytes_written"] = tree_bytes(run_dir)
+    out["shared_by"] = n
+    return out
+
+
+def record_resources(run_dir: Path, usage: Dict[str, float], meta: Optional[Dict] = None) -> Dict:
+    """Merge ``usage`` (and ``meta``, if given) into ``run_dir/meta.json``; returns the updated meta."""
+    meta_p = run_dir / "meta.json"
+    out = json.loads(meta_p.read_text(encoding="utf-8")) if meta_p.exists() else {}
+    out.update(meta or {})
+    out[RESOURCES_KEY] = usage
+    meta_p.write_text(json.dumps(out, sort_keys=True, indent=2), encoding="utf-8")
+    return out
+
+
+def load_resources(run_dir: Path) -> Dict[str, float]:
+    meta_p = run_dir / "meta.json"
+    if not meta_p.exists():
+        return {}
+    return json.loads(meta_p.read_text(encoding="utf-8")).get(RESOURCES_KEY, {})
+
+
+def rollup(run_dirs: Iterable[Path]) -> Dict[str, float]:
+    """Totals over runs (times, bytes, periods), the max peak RSS/heap, and overall periods per second."""
+    usages = [u for u in (load_resources(r) for r in run_dirs) if u]
+    out: Dict[str, float] = {"runs": len(usages)}
+    for k in ("wall_s", "cpu_user_s", "cpu_sys_s", "bytes_written", "periods", "jvm_gc_s", "jvm_gc_count"):
+        if any(k in u for u in usages):
+            out[k] = sum(u.get(k, 0) for u in usages)
+    for k in ("peak_rss_mb", "jvm_heap_peak_mb"):
+        if any(k in u for u in usages):
+            out[k] = max(u.get(k, 0.0) for u in usages)
+    if out.get("wall_s"):
+        out["periods_per_s"] = round(out.get("periods", 0) / out["wall_s"], 3)
+    return out
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+"""
+Buffered table sinks for per-period artifacts.
+
+Rows are staged in a preallocated structured array (one field per column) and
+written in bulk when a block fills or the sink is closed, instead of opening
+the target file once per row. Backends:
+
+  - ``csv``: header at open, blocks appended with ``csv.writer``.
+  - ``npz``: binary columnar; blocks kept in memory, one array per column
+    written at close.
+  - ``memory``: blocks kept in memory, exposed via ``columns_dict()``.
+  - ``null``: rows are counted and discarded.
+"""
+
+import csv
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+Schema = Sequence[Tuple[str, str]]
+
+SERIES_SCHEMA: Schema = [("t", "i8")] + [(c, "f8") for c in ["GDP", "CONS", "INV", "INFL", "UNEMP"]]
+SERIES_PROD_SCHEMA: Schema = list(SERIES_SCHEMA) + [("PROD_C", "f8")]
+TIMELINE_SCHEMA: Schema = [("t", "i8"), ("step", "i8"), ("label", "O"), ("ts", "i8")]
+FM_RESIDUALS_SCHEMA: Schema = [("t", "i8"), ("step", "i8"), ("max_row_abs", "f8"), ("max_col_abs", "f8")]
+FM_RESIDUALS_FORMATS = {"max_row_abs": "{:.12e}", "max_col_abs": "{:.12e}"}
+
+SINK_KINDS = ("csv", "npz", "memory", "null")
+
+
+class TableSink:
+    suffix = ".csv"
+
+    def __init__(self, path: Path, schema: Schema, block_rows: int = 1024,
+                 formats: Optional[Dict[str, str]] = None):
+        self.path = path
+        self.dtype = np.dtype([(name, dt) for name, dt in schema])
+        self.columns: List[str] = [name for name, _ in schema]
+        self._buf = np.zeros(max(1, int(block_rows)), dtype=self.dtype)
+        self._n = 0
+        self.rows_written = 0
+        self.closed = False
+        fmts = formats or {}
+        self._formats = [fmts.get(c) for c in self.columns] if fmts else None
+
+    def append(self, row: Sequence):
+        if self._n == self._buf.size:
+            self.flush()
+        self._buf[self._n] = tuple(row)
+        self._n += 1
+
+    def flush(self):
+        if self._n:
+            self._write(self._buf[: self._n])
+            self.rows_written += self._n
+            self._n = 0
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        self._finish()
+        self._buf = self._buf[:0]
+        self.closed = True
+
+    def offset(self) -> Optional[int]:
+        """Bytes on disk after the last flush, for checkpointing; None if nothing is written."""
+        raise ValueError(f"{type(self).__name__} cannot be checkpointed; use csv or null sinks")
+
+    def _write(self, block: np.ndarray):
+        raise NotImplementedError
+
+    def _finish(self):
+        pass
+
+    def __enter__(self) -> "TableSink":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvSink(TableSink):
+    suffix = ".csv"
+
+    def __init__(self, path: Path, schema: Schema, block_rows: int = 1024,
+                 formats: Optional[Dict[str, str]] = None, append: bool = False):
+        super().__init__(path, schema, block_rows, formats)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not append:
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerow(self.columns)
+
+    def offset(self) -> Optional[int]:
+        return self.path.stat().st_size
+
+    def _write(self, block: np.ndarray):
+        rows = block.tolist()
+        if self._formats:
+            fmts = self._formats
+            rows = [[fm.format(v) if fm else v for v, fm in zip(r, fmts)] for r in rows]
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(rows)
+
+
+class MemorySink(TableSink):
+    suffix = ""
+
+    def __init__(self, path: Path, schema: Schema, block_rows: int = 1024,
+                 formats: Optional[Dict[str, str]] = None):
+        super().__init__(path, schema, block_rows, formats)
+        self._chunks: List[np.ndarray] = []
+
+    def _write(self, block: np.ndarray):
+        self._chunks.append(block.copy())
+
+    def table(self) -> np.ndarray:
+        pending = [self._buf[: self._n]] if self._n else []
+        chunks = self._chunks + pending
+        return np.concatenate(chunks) if chunks else np.zeros(0, dtype=self.dtype)
+
+    def columns_dict(self) -> Dict[str, np.ndarray]:
+        tab = self.table()
+        return {c: tab[c] for c in self.columns}
+
+
+class NpzSink(MemorySink):
+    suffix = ".npz"
+
+    def _finish(self):
+        tab = self.table()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        cols = {}
+        for c in self.columns:
+            col = tab[c]
+            # Object columns (labels) are stored as fixed-width unicode so no pickling is needed
+            cols[c] = col.astype(str) if col.dtype == object else col
+        np.savez(self.path, **cols)
+
+
+class NullSink(TableSink):
+    suffix = ""
+
+    def offset(self) -> Optional[int]:
+        return None
+
+    def _write(self, block: np.ndarray):
+        pass
+
+
+_SINK_CLASSES = {"csv": CsvSink, "npz": NpzSink, "memory": MemorySink, "null": NullSink}
+
+
+class SinkFactory:
+    """Opens sinks of one backend; memory sinks are kept by path so callers can read them back."""
+
+    def __init__(self, kind: str = "csv", block_rows: int = 1024):
+        if kind not in _SINK_CLASSES:
+            raise ValueError(f"Unknown sink kind {kind!r}; expected one of {SINK_KINDS}")
+        self.kind = kind
+        self.block_rows = block_rows
+        self.opened: Dict[Path, TableSink] = {}
+
+    def __call__(self, stem: Path, schema: Schema, formats: Optional[Dict[str, str]] = None,
+                 append: bool = False) -> TableSink:
+        """Open a sink at ``stem`` (suffix added per backend).
+
+        ``append`` continues an existing csv file without rewriting its header
+        (used when resuming from a checkpoint).
+        """
+        cls = _SINK_CLASSES[self.kind]
+        path = stem.with_suffix(cls.suffix) if cls.suffix else stem
+        if append and self.kind == "csv":
+            sink = cls(path, schema, block_rows=self.block_rows, formats=formats, append=True)
+        else:
+            sink = cls(path, schema, block_rows=self.block_rows, formats=formats)
+        if self.kind == "memory":
+            self.opened[path] = sink
+        return sink
+
+
+def as_sink_factory(sinks: SinkFactory | str | None) -> SinkFactory:
+    if isinstance(sinks, SinkFactory):
+        return sinks
+    return SinkFactory(sinks or "csv")
+
+
+def load_columns(stem: Path) -> Dict[str, np.ndarray]:
+    """Read a table written by a csv or npz sink (``stem`` without suffix)."""
+    npz = stem.with_suffix(".npz")
+    if npz.exists():
+        with np.load(npz) as data:
+            return {k: data[k] for k in data.files}
+    import pandas as pd
+
+    df = pd.read_csv(stem.with_suffix(".csv"), float_precision="round_trip")
+    return {c: df[c].to_numpy() for c in df.columns}
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-import csv
 import hashlib
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import TYPE_CHECKING, Dict, Iterable, List
+
+from .catalog import record_run, set_run_status
+from .resources import ResourceMeter, record_resources
+if TYPE_CHECKING:
+    from .ensemble_store import EnsembleStore
+from .sinks import SERIES_SCHEMA, TIMELINE_SCHEMA, SinkFactory, TableSink, as_sink_factory, load_columns
 
 
 def ensure_dir(p: Path):
@@ -18,51 +23,79 @@ class ArtifactWriter:
     series_path: Path
     meta_path: Path
     timeline_path: Path
+    series_sink: TableSink | None = None
+    timeline_sink: TableSink | None = None
+    meta: Dict | None = None
+    meter: ResourceMeter | None = None
+    periods: int = 0
 
     @classmethod
-    def create(cls, base_dir: Path, meta: Dict) -> "ArtifactWriter":
+    def create(cls, base_dir: Path, meta: Dict, sinks: SinkFactory | str | None = None,
+               append: bool = False) -> "ArtifactWriter":
         ensure_dir(base_dir)
-        series = base_dir / "series.csv"
-        timeline = base_dir / "timeline.csv"
+        meter = ResourceMeter.start(base_dir)
         meta_p = base_dir / "meta.json"
         with open(meta_p, "w", encoding="utf-8") as f:
             json.dump(meta, f, sort_keys=True, indent=2)
-        with open(series, "w", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            w.writerow(["t", "GDP", "CONS", "INV", "INFL", "UNEMP"])
-        with open(timeline, "w", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            w.writerow(["t", "step", "label", "ts"])
-        return cls(base_dir, series, meta_p, timeline)
+        factory = as_sink_factory(sinks)
+        series = factory(base_dir / "series", SERIES_SCHEMA, append=append)
+        timeline = factory(base_dir / "timeline", TIMELINE_SCHEMA, append=append)
+        record_run(base_dir, meta, "running", kind="mc")
+        return cls(base_dir, series.path, meta_p, timeline.path, series, timeline, meta, meter)
 
     def append_series(self, t: int, gdp: float, cons: float, inv: float, infl: float, unemp: float):
-        with open(self.series_path, "a", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            w.writerow([t, gdp, cons, inv, infl, unemp])
+        self.series_sink.append((t, gdp, cons, inv, infl, unemp))
+        self.periods += 1
 
     def append_timeline_row(self, row: Iterable):
-        with open(self.timeline_path, "a", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            w.writerow(list(row))
+        self.timeline_sink.append(tuple(row))
+
+    def flush(self):
+        self.series_sink.flush()
+        self.timeline_sink.flush()
+
+    def close(self):
+        self.series_sink.close()
+        self.timeline_sink.close()
+        if self.meter is not None:
+            # Periods simulated by this writer; a resumed run only counts the ones after its checkpoint
+            self.meta = record_resources(self.base_dir, self.meter.finish(self.periods))
+        set_run_status(self.base_dir, "complete", files={
+            "series": self.series_path.name, "timeline": self.timeline_path.name, "meta": self.meta_path.name,
+        })
 
+    def __enter__(self) -> "ArtifactWriter":
+        return self
 
-def summarize_runs(run_dirs: List[Path], out_csv: Path):
+    def __exit__(self, *exc):
+        self.close()
+
+
+def summarize_runs(run_dirs: List[Path], out_csv: Path, store: "EnsembleStore | None" = None):
+    """End-of-run values per run, from ``store`` when given, else each run's series file."""
     import pandas as pd
 
     records = []
+    last = store.last() if store is not None else None
     for rd in run_dirs:
-        s = pd.read_csv(rd / "series.csv")
-        if not s.empty:
-            last = s.iloc[-1]
-            records.append({
-                "run": rd.name,
-                "GDP_end": last["GDP"],
-                "CONS_end": last["CONS"],
-                "INV_end": last["INV"],
-                "INFL_end": last["INFL"],
-                "UNEMP_end": last["UNEMP"],
-            })
+        if last is not None:
+            row = last[int(rd.name.split("_")[-1]) - 1]
+            s = {m: row[i] for i, m in enumerate(store.metrics)}
+        elif not ((rd / "series.csv").exists() or (rd / "series.npz").exists()):
+            continue  # memory/null sinks leave nothing on disk
+        else:
+            df = pd.DataFrame(load_columns(rd / "series"))
+            if df.empty:
+                continue
+            s = df.iloc[-1]
+        records.append({
+            "run": rd.name,
+            "GDP_end": s["GDP"],
+            "CONS_end": s["CONS"],
+            "INV_end": s["INV"],
+            "INFL_end": s["INFL"],
+            "UNEMP_end": s["UNEMP"],
+        })
     df = pd.DataFrame.from_records(records)
     out_csv.parent.mkdir(parents=True, exist_ok=True)
     df.to_csv(out_csv, index=False)
-
@@ -10,11 +10,19 @@ def main():
     p = argparse.ArgumentParser(description="MC runners for s120_inequality_innovation")
     p.add_argument("cmd", choices=["baseline"], help="What to run")
     p.add_argument("--out", default="artifacts/baseline", help="Artifacts root")
+    p.add_argument("-j", "--jobs", type=int, default=1,
+                   help="Worker processes for MC runs (0 = all cores)")
+    p.add_argument("--checkpoint-every", type=int, default=None,
+                   help="Write run_XXX/checkpoint.json every k periods")
+    p.add_argument("--resume-from", default=None,
+                   help="Artifacts root with run_XXX/checkpoint.json to resume from")
     a = p.parse_args()
     if a.cmd == "baseline":
-        run_baseline_smoke(Path(a.out))
+        run_baseline_smoke(
+            Path(a.out), jobs=a.jobs, checkpoint_every=a.checkpoint_every,
+            resume_from=Path(a.resume_from) if a.resume_from else None,
+        )
 
 
 if __name__ == "__main__":
     raise SystemExit(main())
-
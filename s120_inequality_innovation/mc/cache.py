@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+"""
+Content-addressed cache for MC scenario results.
+
+A scenario is keyed on the parameter ``config_hash()``, the stream seeds, the
+horizon, ``ENGINE_VERSION``, the options passed through to
+``run_baseline_smoke`` (sinks, checkpointing, resume source, ensemble store;
+not ``jobs``, which cannot change results), the FlowMatrix verification
+policy and any extra variant material (e.g. a warm-start fork period). Entries are copies of the scenario's artifacts tree stored
+under ``<root>/<key>/``; a hit copies them back instead of re-simulating.
+The store is size-capped and evicts least-recently-used entries.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+
+from s120_inequality_innovation.core.flowmatrix_glue import VERIFY_ENV, VerifyPolicy
+from s120_inequality_innovation.core.registry import ParameterRegistry
+from s120_inequality_innovation.core.rng import load_seeds
+from s120_inequality_innovation.io.catalog import index_tree
+from .runner import ENGINE_VERSION, run_baseline_smoke
+
+
+DEFAULT_CACHE_DIR = Path("artifacts") / "cache"
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+# run_baseline_smoke options that cannot change the stored artifacts
+NEUTRAL_RUN_KWARGS = ("jobs",)
+
+
+def _tree_size(p: Path) -> int:
+    return sum(f.stat().st_size for f in p.rglob("*") if f.is_file())
+
+
+class ResultCache:
+    def __init__(self, root: Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root or os.environ.get("S120_CACHE_DIR", DEFAULT_CACHE_DIR))
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self._index_path = self.root / "index.json"
+        self._index = self._load_index()
+
+    def _load_index(self) -> Dict[str, Any]:
+        if self._index_path.exists():
+            try:
+                return json.loads(self._index_path.read_text(encoding="utf-8"))
+            except Exception:
+                pass
+        return {"entries": {}, "hits": 0, "misses": 0}
+
+    def _save_index(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self._index_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(self._index, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self._index_path)
+
+    @staticmethod
+    def run_options(run_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """``run_kwargs`` as key material: defaults and neutral options dropped,
+        paths resolved, sink factories by type, plus the ``$S120_FM_VERIFY`` policy."""
+        defaults = {k: p.default for k, p in inspect.signature(run_baseline_smoke).parameters.items()}
+        out: Dict[str, Any] = {}
+        for k, v in sorted(run_kwargs.items()):
+            if k in NEUTRAL_RUN_KWARGS or (k in defaults and v == defaults[k]):
+                continue
+            if isinstance(v, Path):
+                v = str(v.resolve())
+            elif not isinstance(v, (str, int, float, bool)) and v is not None:
+                v = f"{type(v).__module__}.{type(v).__qualname__}"
+            out[k] = v
+        out["fm_verify"] = asdict(VerifyPolicy.parse(os.environ.get(VERIFY_ENV)))
+        return out
+
+    @staticmethod
+    def key(params: ParameterRegistry, seeds: Dict[str, int], variant: Optional[Dict[str, Any]] = None,
+            run_options: Optional[Dict[str, Any]] = None) -> str:
+        payload = {
+            "config_hash": params.config_hash(),
+            "seeds": dict(sorted(seeds.items())),
+            "horizon": int(params.get("meta.horizon")),
+            "engine_version": ENGINE_VERSION,
+            "variant": variant or {},
+            "run": run_options or {},
+        }
+        blob = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:20]
+
+    def run(
+        self,
+        artifacts_root: Path,
+        overrides: dict | None = None,
+        force: bool = False,
+        variant: Optional[Dict[str, Any]] = None,
+        **run_kwargs,
+    ) -> List[Path]:
+        """``run_baseline_smoke`` through the cache; ``force`` recomputes and refreshes the entry."""
+        params = ParameterRegistry.from_files(overrides=overrides)
+        k = self.key(params, load_seeds(), variant, self.run_options(run_kwargs))
+        entry = self.root / k
+        if not force and k in self._index["entries"] and entry.exists():
+            shutil.copytree(entry, artifacts_root, dirs_exist_ok=True)
+            self._touch(k, hit=True)
+            index_tree(artifacts_root)
+            mc = int(params.get("meta.mc_runs"))
+            return [artifacts_root / f"run_{i:03d}" for i in range(1, mc + 1)]
+        runs = run_baseline_smoke(artifacts_root, overrides=overrides, **run_kwargs)
+        self._store(k, artifacts_root)
+        return runs
+
+    def _touch(self, k: str, hit: bool):
+        self._index["entries"][k]["last_used"] = time.time()
+        if hit:
+            self.hits += 1
+            self._index["hits"] = self._index.get("hits", 0) + 1
+        self._save_index()
+
+    def _store(self, k: str, src: Path):
+        self.misses += 1
+        self._index["misses"] = self._index.get("misses", 0) + 1
+        entry = self.root / k
+        tmp = self.root / f"{k}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        shutil.copytree(src, tmp)
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp, entry)
+        self._index["entries"][k] = {"size": _tree_size(entry), "last_used": time.time(), "source": str(src)}
+        self._evict(keep=k)
+        self._save_index()
+
+    def _evict(self, keep: Optional[str] = None):
+        entries = self._index["entries"]
+        total = sum(e["size"] for e in entries.values())
+        for k in sorted(entries, key=lambda x: entries[x]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if k == keep:
+                continue
+            total -= entries[k]["size"]
+            shutil.rmtree(self.root / k, ignore_errors=True)
+            del entries[k]
+
+    def clear(self):
+        for k in list(self._index["entries"]):
+            shutil.rmtree(self.root / k, ignore_errors=True)
+        self._index = {"entries": {}, "hits": 0, "misses": 0}
+        self._save_index()
+
+    def stats(self) -> Dict[str, int]:
+        entries = self._index["entries"]
+        return {
+            "session_hits": self.hits,
+            "session_misses": self.misses,
+            "total_hits": int(self._index.get("hits", 0)),
+            "total_misses": int(self._index.get("misses", 0)),
+            "entries": len(entries),
+            "bytes": sum(e["size"] for e in entries.values()),
+        }
+
+    def report(self) -> str:
+        s = self.stats()
+        return (
+            f"cache {self.root}: {s['session_hits']} hits / {s['session_misses']} misses this session "
+            f"({s['total_hits']}/{s['total_misses']} lifetime), {s['entries']} entries, "
+            f"{s['bytes'] / 1e6:.1f} MB of {self.max_bytes / 1e6:.0f} MB"
+        )
+
+
+def main():
+    import argparse
+
+    p = argparse.ArgumentParser(description="MC result cache maintenance")
+    p.add_argument("cmd", choices=["stats", "clear"])
+    p.add_argument("--root", default=None, help="Cache directory (default $S120_CACHE_DIR or artifacts/cache)")
+    a = p.parse_args()
+    cache = ResultCache(Path(a.root) if a.root else None)
+    if a.cmd == "clear":
+        cache.clear()
+    print(cache.report())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
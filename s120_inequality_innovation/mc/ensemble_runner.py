@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List
+
+from s120_inequality_innovation.core.registry import ParameterRegistry
+from s120_inequality_innovation.core.ensemble_engine import run_slice2_ensemble
+from s120_inequality_innovation.core.rng import run_seed_sequence
+from s120_inequality_innovation.io.catalog import dir_files, record_run
+from s120_inequality_innovation.io.resources import ResourceMeter, record_resources, share
+
+
+def run_baseline_ensemble(
+    out_root: Path = Path("artifacts") / "python" / "baseline_ensemble",
+    horizon: int = 300,
+    n_runs: int | None = None,
+    base_seed: int = 123,
+) -> List[Path]:
+    """Slice2 ensemble with ``meta.mc_runs`` replications, each on its own child of ``base_seed``'s spawn tree."""
+    params = ParameterRegistry.from_files()
+    if n_runs is None:
+        n_runs = int(params.get("meta.mc_runs"))
+    seeds = [run_seed_sequence(base_seed, run_id) for run_id in range(1, n_runs + 1)]
+    meter = ResourceMeter.start(out_root)
+    runs = run_slice2_ensemble(params, horizon=horizon, outdir=out_root, seeds=seeds)
+    # All replications advance together, so each run is charged an equal share
+    usage = meter.finish(horizon * n_runs)
+    for run_id, series in enumerate(runs, start=1):
+        rundir = series.parent
+        meta = record_resources(rundir, share(usage, n_runs, rundir), {
+            "config_hash": params.config_hash(), "horizon": horizon, "seed": base_seed,
+            "spawn_key": [run_id - 1], "run_id": run_id,
+        })
+        record_run(rundir, meta, "complete", files=dir_files(rundir), kind="slice2_ensemble", scenario=out_root.name)
+    return runs
+
+
+if __name__ == "__main__":
+    run_baseline_ensemble()
@@ -1,58 +1,179 @@
 from __future__ import annotations
 
+import os
 import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
 import numpy as np
 
+from s120_inequality_innovation.core.checkpoint import Checkpoint, due, restore_outputs, sink_offsets
+from s120_inequality_innovation.core.profiling import profiler_from_env, write_report as write_profile_report
 from s120_inequality_innovation.core.registry import ParameterRegistry
-from s120_inequality_innovation.core.rng import load_seeds, build_streams
+from s120_inequality_innovation.core.rng import (
+    BlockDraws, load_seeds, build_streams, normal_rows, run_seed_sequences, streams_state, restore_streams_state,
+)
+from s120_inequality_innovation.io.ensemble_store import SHAPE_KEYS, SIDECAR_NAME, EnsembleStore
+from s120_inequality_innovation.io.online_stats import WindowStats, eval_window
+from s120_inequality_innovation.io.sinks import SERIES_SCHEMA, SinkFactory
 from s120_inequality_innovation.io.writer import ArtifactWriter, summarize_runs
 from s120_inequality_innovation.core.scheduler import STEP_LABELS
 
 
-def run_baseline_smoke(artifacts_root: Path = Path("artifacts") / "baseline", overrides: dict | None = None) -> List[Path]:
+# Bump whenever a code change alters simulated output; part of the result-cache key
+ENGINE_VERSION = "2"
+# Standard deviations of the per-period (gdp, cons, inv, infl, unemp) shocks
+SHOCK_SD = (0.2, 0.1, 0.08, 0.001, 0.002)
+
+
+def _resolve_jobs(jobs: int | None, mc: int) -> int:
+    if jobs is None or jobs <= 0:
+        jobs = os.cpu_count() or 1
+    return max(1, min(int(jobs), mc))
+
+
+def _run_one(
+    run_id: int,
+    params: ParameterRegistry,
+    seeds: Dict[str, int],
+    artifacts_root: Path,
+    sinks: SinkFactory | str | None = None,
+    checkpoint_every: int | None = None,
+    resume_from: Path | None = None,
+    store: bool = False,
+) -> Path:
+    horizon = int(params.get("meta.horizon"))
+    # Independent per-run streams from each stream's SeedSequence spawn tree
+    rngs = build_streams(run_seed_sequences(seeds, run_id))
+    run_dir = artifacts_root / f"run_{run_id:03d}"
+    meta = {
+        "run_id": run_id,
+        "seeds": dict(seeds),
+        "spawn_key": [run_id - 1],
+        "config_hash": params.config_hash(),
+        "horizon": horizon,
+        "engine_version": ENGINE_VERSION,
+    }
+    # Generate placeholder series using RNGs
+    level = {"gdp": 100.0, "cons": 60.0, "inv": 20.0, "infl": 0.02, "unemp": 0.07}
+    stats = WindowStats([c for c, _ in SERIES_SCHEMA[1:]], *eval_window(params))
+    t0 = 1
+    if resume_from is not None:
+        src = resume_from / run_dir.name
+        ckpt = Checkpoint.load(src)
+        restore_outputs(ckpt, src, run_dir)
+        restore_streams_state(rngs, ckpt.rng)
+        level = dict(ckpt.state)
+        stats = WindowStats.from_dict(ckpt.extras["window_stats"])
+        if store and src.parent.resolve() != artifacts_root.resolve() and (src.parent / SIDECAR_NAME).exists():
+            # Forked run: carry the source run's periods over, as restore_outputs does for the CSVs
+            prev = EnsembleStore.open(src.parent)
+            if run_id <= prev.data.shape[0]:
+                es = EnsembleStore.open(artifacts_root, mode="r+")
+                es.data[run_id - 1, : ckpt.t + 1] = prev[run_id - 1, : ckpt.t + 1]
+                es.progress[run_id - 1] = ckpt.t
+                del es
+            del prev
+        t0 = ckpt.t + 1
+        meta["resumed_from"] = {"path": str(src), "t": ckpt.t}
+        if src.resolve() != run_dir.resolve():
+            # Branched off another run's snapshot (warm-start sweeps)
+            meta["fork_t"] = ckpt.t
+    # Shock rows come pre-drawn in blocks; the values equal per-period normal() calls
+    shocks = BlockDraws(rngs.rng_model, normal_rows(SHOCK_SD), remaining=horizon - t0 + 1)
+    if resume_from is not None:
+        shocks.restore(ckpt.extras["shocks"])
+    aw = ArtifactWriter.create(run_dir, meta, sinks=sinks, append=resume_from is not None)
+    es = EnsembleStore.open(artifacts_root, mode="r+") if store else None
+    prof = profiler_from_env()
+    gdp, cons, inv, infl, unemp = (level[k] for k in ("gdp", "cons", "inv", "infl", "unemp"))
+    for t in range(t0, horizon + 1):
+        # simple AR(1)-like evolutions to create plausible series
+        shock_g, shock_c, shock_i, shock_pi, shock_u = shocks()
+        gdp = max(1.0, gdp * (1 + shock_g * 0.001))
+        cons = max(0.1, cons * (1 + shock_c * 0.001))
+        inv = max(0.1, inv * (1 + shock_i * 0.001))
+        infl = max(-0.05, infl * 0.99 + shock_pi)
+        unemp = min(0.5, max(0.01, unemp * 0.995 + shock_u))
+        tok = prof.start()
+        aw.append_series(t, gdp, cons, inv, infl, unemp)
+        stats.update(t, (gdp, cons, inv, infl, unemp))
+        if es is not None:
+            es.append(run_id - 1, t, (gdp, cons, inv, infl, unemp))
+        # Also append a minimal timeline row (step 19 only to keep file small)
+        aw.append_timeline_row([t, 19, STEP_LABELS[-1], time.time_ns()])
+        prof.stop("output", tok)
+        if due(t, checkpoint_every):
+            tok = prof.start()
+            Checkpoint(
+                "baseline_smoke", t,
+                {"gdp": gdp, "cons": cons, "inv": inv, "infl": infl, "unemp": unemp},
+                extras={"window_stats": stats.to_dict(), "shocks": shocks.state()},
+                rng=streams_state(rngs),
+                writers=sink_offsets([aw.series_sink, aw.timeline_sink]),
+                config_hash=params.config_hash(),
+            ).save(run_dir)
+            prof.stop("checkpoint", tok)
+    aw.close()
+    if es is not None:
+        es.flush()
+    stats.save(run_dir)
+    prof.save(run_dir)
+    return run_dir
+
+
+def run_baseline_smoke(
+    artifacts_root: Path = Path("artifacts") / "baseline",
+    overrides: dict | None = None,
+    jobs: int | None = 1,
+    sinks: SinkFactory | str | None = None,
+    checkpoint_every: int | None = None,
+    resume_from: Path | None = None,
+    store: bool = True,
+) -> List[Path]:
+    """Run ``meta.mc_runs`` replications and summarize them.
+
+    ``jobs`` > 1 dispatches runs to a process pool (``None``/``0`` uses every
+    core). Seeds depend only on ``run_id`` and results are gathered in run
+    order, so series and ``summary_mc.csv`` are identical for any ``jobs``.
+    ``sinks`` selects the artifact backend (see ``io.sinks``); memory sinks
+    are only readable back from the caller's factory when ``jobs`` is 1.
+
+    ``checkpoint_every`` writes ``run_XXX/checkpoint.json`` every k periods;
+    ``resume_from`` is an artifacts root holding such checkpoints, from which
+    each run continues bit-for-bit (it may equal ``artifacts_root``).
+
+    Every run also leaves ``window_stats.json``: streaming moments of each
+    series over the evaluation window (see ``io.online_stats``). With
+    ``store`` all runs are also written to the memory-mapped
+    ``io.ensemble_store`` block in ``artifacts_root``, which the summary reads.
+    """
     params = ParameterRegistry.from_files(overrides=overrides)
     seeds = load_seeds()
-    runs = []
     mc = int(params.get("meta.mc_runs"))
-    horizon = int(params.get("meta.horizon"))
-    for run_id in range(1, mc + 1):
-        # Vary seeds deterministically per run_id
-        seeds_run = {k: v + run_id for k, v in seeds.items()}
-        rngs = build_streams(seeds_run)
-        run_dir = artifacts_root / f"run_{run_id:03d}"
-        meta = {
-            "run_id": run_id,
-            "seeds": seeds_run,
-            "config_hash": params.config_hash(),
-            "horizon": horizon,
-        }
-        aw = ArtifactWriter.create(run_dir, meta)
-        # Generate placeholder series using RNGs
-        gdp = 100.0
-        cons = 60.0
-        inv = 20.0
-        infl = 0.02
-        unemp = 0.07
-        for t in range(1, horizon + 1):
-            # simple AR(1)-like evolutions to create plausible series
-            shock_g = rngs.rng_model.normal(0, 0.2)
-            shock_c = rngs.rng_model.normal(0, 0.1)
-            shock_i = rngs.rng_model.normal(0, 0.08)
-            shock_pi = rngs.rng_model.normal(0, 0.001)
-            shock_u = rngs.rng_model.normal(0, 0.002)
-            gdp = max(1.0, gdp * (1 + shock_g * 0.001))
-            cons = max(0.1, cons * (1 + shock_c * 0.001))
-            inv = max(0.1, inv * (1 + shock_i * 0.001))
-            infl = max(-0.05, infl * 0.99 + shock_pi)
-            unemp = min(0.5, max(0.01, unemp * 0.995 + shock_u))
-            aw.append_series(t, gdp, cons, inv, infl, unemp)
-            # Also append a minimal timeline row (step 19 only to keep file small)
-            aw.append_timeline_row([t, 19, STEP_LABELS[-1], time.time_ns()])
-        runs.append(run_dir)
-    summarize_runs(runs, artifacts_root / "summary_mc.csv")
+    run_ids = list(range(1, mc + 1))
+    jobs = _resolve_jobs(jobs, mc)
+    if store:
+        metrics = [c for c, _ in SERIES_SCHEMA[1:]]
+        EnsembleStore.ensure(artifacts_root, metrics, mc, int(params.get("meta.horizon")),
+                             seeds=seeds, config_hash=params.config_hash(),
+                             model_hash=params.config_hash(exclude=SHAPE_KEYS)).flush()
+    one = partial(
+        _run_one, params=params, seeds=seeds, artifacts_root=artifacts_root, sinks=sinks,
+        checkpoint_every=checkpoint_every, resume_from=resume_from, store=store,
+    )
+    if jobs == 1:
+        runs = [one(run_id) for run_id in run_ids]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as ex:
+            # map() yields in submission order regardless of completion order
+            runs = list(ex.map(one, run_ids))
+    summarize_runs(runs, artifacts_root / "summary_mc.csv",
+                   store=EnsembleStore.open(artifacts_root) if store else None)
+    if profiler_from_env().enabled:
+        write_profile_report(artifacts_root, runs)
     return runs
 
 
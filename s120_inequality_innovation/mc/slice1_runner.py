@@ -4,12 +4,19 @@ from pathlib import Path
 
 from s120_inequality_innovation.core.registry import ParameterRegistry
 from s120_inequality_innovation.core.slice1_engine import run_slice1
+from s120_inequality_innovation.io.catalog import dir_files, record_run
+from s120_inequality_innovation.io.resources import ResourceMeter, record_resources
 
 
 def run_baseline_slice1(out_root: Path = Path("artifacts") / "python" / "baseline_slice1", horizon: int = 100):
     params = ParameterRegistry.from_files()
     rundir = out_root / "run_001"
+    meter = ResourceMeter.start(rundir)
     series, fmres = run_slice1(params, horizon=horizon, outdir=rundir)
+    meta = record_resources(rundir, meter.finish(horizon),
+                            {"config_hash": params.config_hash(), "horizon": horizon})
+    record_run(rundir, meta, "complete",
+               files=dir_files(rundir), kind="slice1", scenario=out_root.name)
     return rundir
 
 
@@ -4,12 +4,19 @@ from pathlib import Path
 
 from s120_inequality_innovation.core.registry import ParameterRegistry
 from s120_inequality_innovation.core.slice2_engine import run_slice2
+from s120_inequality_innovation.io.catalog import dir_files, record_run
+from s120_inequality_innovation.io.resources import ResourceMeter, record_resources
 
 
 def run_baseline_slice2(out_root: Path = Path("artifacts") / "python" / "baseline_slice2", horizon: int = 300):
     params = ParameterRegistry.from_files()
     rundir = out_root / "run_001"
+    meter = ResourceMeter.start(rundir)
     run_slice2(params, horizon=horizon, outdir=rundir, seed=123)
+    meta = record_resources(rundir, meter.finish(horizon),
+                            {"config_hash": params.config_hash(), "horizon": horizon, "seed": 123})
+    record_run(rundir, meta, "complete",
+               files=dir_files(rundir), kind="slice2", scenario=out_root.name)
     return rundir
 
 
@@ -4,16 +4,24 @@ from pathlib import Path
 
 from s120_inequality_innovation.core.registry import ParameterRegistry
 from s120_inequality_innovation.core.slice3_engine import run_slice3
-import pandas as pd
+from s120_inequality_innovation.io.catalog import dir_files, record_run
+from s120_inequality_innovation.io.resources import ResourceMeter, record_resources
 
 
 def run_baseline_slice3(out_root: Path = Path("artifacts") / "python" / "baseline_slice3", horizon: int = 100):
     params = ParameterRegistry.from_files()
     rundir = out_root / "run_001"
+    meter = ResourceMeter.start(rundir)
     series, fmres = run_slice3(params, horizon=horizon, outdir=rundir)
+    meta = record_resources(rundir, meter.finish(horizon),
+                            {"config_hash": params.config_hash(), "horizon": horizon})
+    record_run(rundir, meta, "complete",
+               files=dir_files(rundir), kind="slice3", scenario=out_root.name)
     # Produce a small notes report summarizing binding constraints and defaults if events.csv exists
     evp = rundir / "events.csv"
     if evp.exists():
+        import pandas as pd
+
         df = pd.read_csv(evp)
         notes = [
             f"CB advances periods: {int(df['cb_advance'].sum())}",
@@ -2,88 +2,154 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Dict, List
-
-import pandas as pd
-import yaml
+from typing import Dict, List, Sequence
 
+from .cache import ResultCache
 from .runner import run_baseline_smoke
-from s120_inequality_innovation.core.registry import ParameterRegistry
+from s120_inequality_innovation.core.profiling import profiler_from_env, write_report as write_profile_report
+from s120_inequality_innovation.core.registry import ParameterRegistry, load_yaml_cached
+from s120_inequality_innovation.io.online_stats import WindowStats, eval_window, pool
+from s120_inequality_innovation.io.resources import ROLLUP_COLUMNS, rollup
 
 
-WINDOW = (501, 1000)
 METRICS = ["GDP", "CONS", "INV", "INFL", "UNEMP", "PROD_C"]
 
 
-def _window_mean(csv_path: Path, t0: int, t1: int) -> Dict[str, float]:
-    df = pd.read_csv(csv_path)
-    dfw = df[(df["t"] >= t0) & (df["t"] <= t1)]
-    out = {}
-    for m in METRICS:
-        if m in dfw.columns:
-            out[m] = float(dfw[m].mean())
-    return out
+def _window_mean(runs: List[Path]) -> Dict[str, Dict[str, float]]:
+    """MC means over the evaluation window from each run's streaming ``window_stats.json``."""
+    return pool([WindowStats.load(r) for r in runs])
 
 
-def _summary_row(scenario: str, means: Dict[str, float], baseline: Dict[str, float]) -> List[Dict[str, object]]:
+def _summary_row(scenario: str, means: Dict[str, Dict[str, float]],
+                 baseline: Dict[str, Dict[str, float]], runs: List[Path] | None = None) -> List[Dict[str, object]]:
+    """One row per metric; with ``runs``, the scenario's summed resource usage (``io.resources``) is repeated on each."""
+    cost = {f"res_{k}": v for k, v in rollup(runs).items() if k in ROLLUP_COLUMNS} if runs else {}
     rows = []
     for m in METRICS:
         if m in means and m in baseline:
             rows.append({
                 "scenario": scenario,
                 "metric": m,
-                "mean_window": means[m],
-                "delta_vs_baseline": means[m] - baseline[m],
+                "mean_window": means[m]["mean"],
+                "delta_vs_baseline": means[m]["mean"] - baseline[m]["mean"],
+                "ci_low": means[m]["ci_low"],
+                "ci_high": means[m]["ci_high"],
+                "n_runs": means[m]["n_runs"],
+                **cost,
             })
     return rows
 
 
 def _load_yaml(path: Path) -> Dict:
-    with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    return load_yaml_cached(path)
+
+
+def _write_summary(rows: List[Dict[str, object]], out: Path) -> Path:
+    import pandas as pd
+
+    pd.DataFrame(rows).to_csv(out, index=False)
+    return out
 
 
-def run_tax_sweep(out_root: Path = Path("artifacts") / "experiments" / "tax_sweep") -> Path:
+def _run_scenario(scen_dir: Path, overrides: dict | None, fork_root: Path | None, fork_t: int | None,
+                  cache: ResultCache | None, force: bool, checkpoint_every: int | None = None) -> List[Path]:
+    if cache is None:
+        return run_baseline_smoke(scen_dir, overrides=overrides, resume_from=fork_root,
+                                  checkpoint_every=checkpoint_every)
+    # Forked scenarios differ from cold ones (policy starts at fork_t), so the fork is part of the key
+    variant = {"fork_t": int(fork_t)} if fork_t is not None else None
+    return cache.run(scen_dir, overrides=overrides, force=force, variant=variant,
+                     resume_from=fork_root, checkpoint_every=checkpoint_every)
+
+
+def _burn_in(out_root: Path, fork_t: int | None, cache: ResultCache | None = None, force: bool = False,
+             scenarios: Sequence[dict | None] = (None,)) -> Path | None:
+    """Simulate the baseline once to ``fork_t`` and snapshot every replication.
+
+    Scenarios then resume from these snapshots with their overrides applied,
+    so the shared burn-in is not recomputed per grid point. The fork must
+    precede the evaluation window of every scenario (``eval_window`` of its
+    overridden parameters), otherwise a window would mix baseline and
+    scenario periods.
+    """
+    if fork_t is None:
+        return None
+    fork_t = int(fork_t)
+    first = min(eval_window(ParameterRegistry.from_files(overrides=o))[0] for o in scenarios)
+    if not (1 <= fork_t < first):
+        raise ValueError(f"fork_t={fork_t} must lie in [1, {first - 1}] (before the evaluation window)")
+    burn_dir = out_root / f"burnin_t{fork_t}"
+    _run_scenario(burn_dir, {"meta": {"horizon": fork_t}}, None, None, cache, force, checkpoint_every=fork_t)
+    return burn_dir
+
+
+def run_tax_sweep(
+    out_root: Path = Path("artifacts") / "experiments" / "tax_sweep",
+    fork_t: int | None = None,
+    cache: ResultCache | None = None,
+    force: bool = False,
+) -> Path:
+    """θ sweep; ``fork_t`` enables warm start from a shared burn-in snapshot.
+
+    With a ``cache``, scenarios whose key matches a stored result are copied
+    from it (θ=0.0 reuses the baseline); ``force`` recomputes them.
+    """
     out_root.mkdir(parents=True, exist_ok=True)
     scenarios = _load_yaml(Path("s120_inequality_innovation/config/scenarios/tax_progressive_theta_sweep.yaml"))
     grid = scenarios["grid"]["taxes.theta_progressive"]
+    fork_root = _burn_in(out_root, fork_t, cache, force,
+                         [None] + [{"taxes": {"theta_progressive": float(theta)}} for theta in grid])
     # Baseline
     base_dir = Path("artifacts") / "experiments" / "tax_sweep" / "baseline"
-    runs = run_baseline_smoke(base_dir, overrides=None)
-    base_means = _window_mean(base_dir / "run_001" / "series.csv", *WINDOW)
+    runs = _run_scenario(base_dir, None, fork_root, fork_t, cache, force)
+    base_means = _window_mean(runs)
     rows: List[Dict[str, object]] = []
     for theta in grid:
         overrides = {"taxes": {"theta_progressive": float(theta)}}
         scen_dir = out_root / f"theta_{theta}"
-        run_baseline_smoke(scen_dir, overrides=overrides)
-        means = _window_mean(scen_dir / "run_001" / "series.csv", *WINDOW)
-        rows.extend(_summary_row(f"theta_{theta}", means, base_means))
-    df = pd.DataFrame(rows)
-    out = out_root / "summary.csv"
-    df.to_csv(out, index=False)
-    return out
-
-
-def run_wage_sweep(out_root: Path = Path("artifacts") / "experiments" / "wage_sweep") -> Path:
+        scen_runs = _run_scenario(scen_dir, overrides, fork_root, fork_t, cache, force)
+        rows.extend(_summary_row(f"theta_{theta}", _window_mean(scen_runs), base_means, scen_runs))
+    if profiler_from_env().enabled:
+        write_profile_report(out_root)
+    return _write_summary(rows, out_root / "summary.csv")
+
+
+def run_wage_sweep(
+    out_root: Path = Path("artifacts") / "experiments" / "wage_sweep",
+    fork_t: int | None = None,
+    cache: ResultCache | None = None,
+    force: bool = False,
+) -> Path:
+    """tu sweep; ``fork_t``, ``cache`` and ``force`` as in ``run_tax_sweep``."""
     out_root.mkdir(parents=True, exist_ok=True)
     scenarios = _load_yaml(Path("s120_inequality_innovation/config/scenarios/wage_rigidity_tu_sweep.yaml"))
     grid = scenarios["grid"]["wage_rigidity.tu"]
+    fork_root = _burn_in(out_root, fork_t, cache, force, [None] + [{"wage_rigidity": {"tu": int(tu)}} for tu in grid])
     base_dir = out_root / "baseline"
-    run_baseline_smoke(base_dir, overrides=None)
-    base_means = _window_mean(base_dir / "run_001" / "series.csv", *WINDOW)
+    runs = _run_scenario(base_dir, None, fork_root, fork_t, cache, force)
+    base_means = _window_mean(runs)
     rows: List[Dict[str, object]] = []
     for tu in grid:
         overrides = {"wage_rigidity": {"tu": int(tu)}}
         scen_dir = out_root / f"tu_{tu}"
-        run_baseline_smoke(scen_dir, overrides=overrides)
-        means = _window_mean(scen_dir / "run_001" / "series.csv", *WINDOW)
-        rows.extend(_summary_row(f"tu_{tu}", means, base_means))
-    out = out_root / "summary.csv"
-    pd.DataFrame(rows).to_csv(out, index=False)
-    return out
+        scen_runs = _run_scenario(scen_dir, overrides, fork_root, fork_t, cache, force)
+        rows.extend(_summary_row(f"tu_{tu}", _window_mean(scen_runs), base_means, scen_runs))
+    if profiler_from_env().enabled:
+        write_profile_report(out_root)
+    return _write_summary(rows, out_root / "summary.csv")
 
 
 if __name__ == "__main__":
-    run_tax_sweep()
-    run_wage_sweep()
-
+    import argparse
+
+    p = argparse.ArgumentParser(description="θ and tu policy sweeps")
+    p.add_argument("--fork-t", type=int, default=None,
+                   help="Warm start: fork every scenario from a shared burn-in snapshot at this period")
+    p.add_argument("--force", action="store_true", help="Recompute every scenario, bypassing cached results")
+    p.add_argument("--no-cache", action="store_true", help="Do not read or write the result cache")
+    a = p.parse_args()
+    cache = None if a.no_cache else ResultCache()
+    run_tax_sweep(fork_t=a.fork_t, cache=cache, force=a.force)
+    run_wage_sweep(fork_t=a.fork_t, cache=cache, force=a.force)
+    if cache is not None:
+        print(cache.report())
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+"""
+AppCDS archives for the oracle JVM.
+
+The first JVM started with ``cds`` dumps the classes it loaded (Spring,
+JMAB, the model) to ``<root>/<cp-id>-<content>.jsa`` at exit
+(``-XX:ArchiveClassesAtExit``); later JVMs map that archive
+(``-XX:SharedArchiveFile``) instead of loading and verifying the classes
+again. ``<content>`` hashes every classpath jar's path, size and mtime plus
+the JVM, so a rebuilt jar selects a fresh archive and stale ones for the
+same classpath are deleted. CDS only archives jar entries, so classpaths
+with non-empty class directories run without it.
+"""
+
+import hashlib
+import os
+import time
+from glob import glob
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+
+DEFAULT_CDS_DIR = Path("artifacts") / "cache" / "appcds"
+# A dump lock older than this is assumed to belong to a JVM that died mid-run
+LOCK_STALE_S = 3600
+
+
+def split_classpath(classpath: str) -> List[str]:
+    return [e for e in classpath.split(";" if ";" in classpath else ":") if e]
+
+
+def expand_classpath(classpath: str) -> List[Path]:
+    """Classpath entries with ``dir/*`` wildcards expanded to their jars."""
+    out: List[Path] = []
+    for entry in split_classpath(classpath):
+        entry = os.path.expanduser(entry)
+        if entry.endswith("*"):
+            out.extend(Path(p) for p in sorted(glob(entry[:-1] + "*.jar")))
+        else:
+            out.append(Path(entry))
+    return out
+
+
+def archive_args(classpath: str, jvm_path: Optional[str] = None,
+                 root: Optional[Path] = None) -> Tuple[List[str], str, Optional[Path]]:
+    """JVM options for CDS: ``(args, mode, archive)`` with mode ``use``, ``create`` or ``off:<reason>``."""
+    entries = expand_classpath(classpath)
+    h = hashlib.sha256(f"{jvm_path}|{os.environ.get('JAVA_HOME', '')}".encode())
+    for p in entries:
+        if p.is_dir():
+            if any(p.iterdir()):
+                return [], f"off:class directory on classpath ({p})", None
+            continue
+        st = p.stat() if p.exists() else None
+        h.update(f"{p.resolve()}|{st.st_size if st else -1}|{st.st_mtime_ns if st else -1}\n".encode())
+    cp_id = hashlib.sha256(classpath.encode()).hexdigest()[:12]
+    root = Path(root or os.environ.get("S120_CDS_DIR", DEFAULT_CDS_DIR))
+    archive = root / f"{cp_id}-{h.hexdigest()[:16]}.jsa"
+    if archive.exists() and archive.stat().st_size > 0:
+        archive.with_suffix(".lock").unlink(missing_ok=True)
+        return [f"-XX:SharedArchiveFile={archive}", "-Xshare:auto"], "use", archive
+    root.mkdir(parents=True, exist_ok=True)
+    # Only one JVM dumps the archive; concurrent pool workers run without CDS meanwhile
+    lock = archive.with_suffix(".lock")
+    if lock.exists() and time.time() - lock.stat().st_mtime > LOCK_STALE_S:
+        lock.unlink(missing_ok=True)
+    try:
+        os.close(os.open(lock, os.O_CREAT | os.O_EXCL))
+    except FileExistsError:
+        return [], "off:archive being created by another JVM", None
+    for stale in root.glob(f"{cp_id}-*.jsa"):
+        stale.unlink(missing_ok=True)
+    for stale in root.glob(f"{cp_id}-*.lock"):
+        if stale != lock:
+            stale.unlink(missing_ok=True)
+    return [f"-XX:ArchiveClassesAtExit={archive}"], "create", archive
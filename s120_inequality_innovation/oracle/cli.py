@@ -2,17 +2,25 @@ from __future__ import annotations
 
 import json
 import os
+import shutil
+import tempfile
 from dataclasses import dataclass
+from fnmatch import fnmatchcase
 from pathlib import Path
-from typing import Dict, Optional, List, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, Optional, List, Tuple
 
-from .jpype_harness import run_java_oracle
+from .jpype_harness import JVM_INFO, JVM_USAGE, capture_hook_available, run_java_oracle
+from .xml_profile import write_lean_xml
 from ..core.registry import ParameterRegistry
-from ..io.golden_compare import canonicalize_java_headers
+from ..io.catalog import dir_files, record_run
+from ..io.resources import ResourceMeter, record_resources
 
-import pandas as pd
+import numpy as np
 import xml.etree.ElementTree as ET
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 @dataclass
 class OracleRunSpec:
@@ -50,8 +58,28 @@ def _resolve_xml(scenario: str) -> Optional[Path]:
 
 
 def run_oracle_scenario(spec: OracleRunSpec, outdir: Path, classpath: Optional[str] = None, xml: Optional[Path] = None,
-                        jvm: Optional[str] = None, seed: Optional[int] = None) -> Path:
+                        jvm: Optional[str] = None, seed: Optional[int] = None, capture: bool = False,
+                        keep_raw: bool = False, lean: bool = False, cds: bool = False,
+                        jvm_error: Optional[str] = None) -> Path:
+    """Run one scenario and write ``<outdir>/series.csv`` and ``meta.json``.
+
+    ``capture`` reads the report series straight from the JVM into NumPy
+    (``jpype_harness.capture_reports``) instead of re-parsing raw CSVs: the
+    CSV writers under ``fileNamePrefix`` are swapped for the capture hook
+    (``xml_profile.capture_writers``), so no report files are written. With
+    ``keep_raw``, or when the hook is not built, the CSVs are written as
+    usual (to a scratch dir in RAM unless ``keep_raw``) and the collector
+    falls back to them. ``lean`` runs the pruned XML
+    profile (``xml_profile``) with the spec's overrides applied, on the
+    non-desktop SimulationManager. ``cds`` starts the JVM with an AppCDS
+    archive (``oracle.cds``); JVM startup time is recorded in meta.json.
+    The run's cost, including JVM heap peak and GC time, goes under
+    ``resources`` (see ``io.resources``). ``jvm_error`` is a JVM start-up
+    failure already seen by the caller: the run is recorded as failed with
+    it instead of starting the JVM again.
+    """
     outdir.mkdir(parents=True, exist_ok=True)
+    meter = ResourceMeter.start(outdir)
     params = ParameterRegistry.from_files(overrides=spec.overrides)
     meta = {
         "scenario": spec.name,
@@ -64,44 +92,92 @@ def run_oracle_scenario(spec: OracleRunSpec, outdir: Path, classpath: Optional[s
         classpath = _resolve_classpath()
     if xml is None:
         xml = _resolve_xml(spec.name)
-    # create scenario-specific XML with patched fileNamePrefix pointing under outdir/data
-    scenario_xml = _ensure_scenario_xml(xml, spec.name, outdir) if xml else None
-    meta.update({"classpath": classpath, "xml": str(scenario_xml) if scenario_xml else None})
-    with open(meta_path, "w", encoding="utf-8") as f:
-        json.dump(meta, f, indent=2, sort_keys=True)
-    java_run_ok = False
-    java_error: Optional[str] = None
-    if classpath and scenario_xml:
-        try:
-            run_java_oracle(scenario_xml, classpath, jvm_path=jvm, seed=seed)
-            java_run_ok = True
-        except Exception as e:  # pragma: no cover
-            # Do not hard-fail here; allow collection to proceed so callers can inspect meta/logs
-            java_run_ok = False
-            java_error = str(e)[:500]
-            print(f"Warning: Java oracle run failed: {e}")
-    # Stamp run status immediately so collectors and CI can see diagnostic state
+    swap = capture and not keep_raw and capture_hook_available(classpath)
+    if capture and not keep_raw and not swap:
+        print("Warning: capture hook not built (make oracle-capture-hook); the run still writes raw CSVs.")
+    scratch: Optional[Path] = None
+    if capture and not keep_raw:
+        shm = Path("/dev/shm")
+        scratch = Path(tempfile.mkdtemp(prefix="s120_raw_", dir=shm if shm.is_dir() else None))
+    # The scratch dir lives in shared memory: remove it however the run or collection ends
     try:
-        m = json.loads(meta_path.read_text(encoding="utf-8")) if meta_path.exists() else {}
-    except Exception:
-        m = {}
-    m.update({
-        "java_run_ok": bool(java_run_ok),
-        "java_error": java_error,
-    })
-    meta_path.write_text(json.dumps(m, indent=2, sort_keys=True), encoding="utf-8")
-    else:
-        print("Warning: Missing classpath or xml; wrote meta.json only.")
-    # Attempt to collect canonical series and finalize meta
-    _collect_and_write_canonical(spec, outdir, params, scenario_xml)
+        # create scenario-specific XML with patched fileNamePrefix pointing under outdir/data
+        scenario_xml: Optional[Path] = None
+        if xml:
+            scenario_xml, profile = _ensure_scenario_xml(xml, spec.name, outdir, data_dir=scratch, lean=lean,
+                                                         overrides=spec.overrides, capture=swap)
+            meta.update(profile)
+        meta.update({"classpath": classpath, "xml": str(scenario_xml) if scenario_xml else None,
+                     "capture": "memory" if capture else "csv"})
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2, sort_keys=True)
+        record_run(outdir, meta, "running", kind="oracle")
+        java_run_ok = False
+        java_error: Optional[str] = None
+        captured: Optional[Dict[str, np.ndarray]] = None
+        jvm_usage: Dict[str, float] = {}
+        if jvm_error is not None:
+            java_error = jvm_error
+            print(f"Warning: Java oracle not run, the JVM failed to start: {jvm_error}")
+        elif classpath and scenario_xml:
+            try:
+                captured = run_java_oracle(scenario_xml, classpath, jvm_path=jvm, seed=seed, capture=capture,
+                                           headless=lean, cds=cds)
+                java_run_ok = True
+                jvm_usage = dict(JVM_USAGE)
+            except Exception as e:  # pragma: no cover
+                # Do not hard-fail here; allow collection to proceed so callers can inspect meta/logs
+                java_run_ok = False
+                java_error = str(e)[:500]
+                print(f"Warning: Java oracle run failed: {e}")
+        else:
+            print("Warning: Missing classpath or xml; wrote meta.json only.")
+        # Stamp run status immediately so collectors and CI can see diagnostic state
+        try:
+            m = json.loads(meta_path.read_text(encoding="utf-8")) if meta_path.exists() else {}
+        except Exception:
+            m = {}
+        m.update({
+            "java_run_ok": bool(java_run_ok),
+            "java_error": java_error,
+        })
+        m.update(JVM_INFO)
+        meta_path.write_text(json.dumps(m, indent=2, sort_keys=True), encoding="utf-8")
+        # Attempt to collect canonical series and finalize meta
+        _collect_and_write_canonical(spec, outdir, params, scenario_xml, seed=seed, captured=captured)
+    finally:
+        if scratch is not None:
+            shutil.rmtree(scratch, ignore_errors=True)
+    usage = meter.finish(int(params.get("meta.horizon", 1000)) if java_run_ok else 0)
+    usage.update(jvm_usage)
+    final = record_resources(outdir, usage)
+    record_run(outdir, final, "complete" if final.get("java_run_ok") else "failed",
+               files=dir_files(outdir), kind="oracle")
     return outdir / "series.csv"
 
 
-def _ensure_scenario_xml(xml_path: Path, scenario: str, outdir: Path) -> Path:
-    """Copy the provided XML and patch fileNamePrefix -> <outdir>/data for the scenario."""
+def _ensure_scenario_xml(xml_path: Path, scenario: str, outdir: Path, data_dir: Optional[Path] = None,
+                         lean: bool = False, overrides: Optional[Dict] = None,
+                         capture: bool = False) -> Tuple[Path, Dict]:
+    """Copy the provided XML and patch fileNamePrefix -> <outdir>/data (or ``data_dir``) for the scenario.
+
+    ``lean`` writes the pruned profile of ``xml_profile`` instead, with
+    ``overrides`` applied; ``capture`` swaps its CSV writers for the
+    capture hook. The ``xml_profile`` summary is returned for meta.json.
+    """
     headless_dir = Path("artifacts/golden_java/headless")
     headless_dir.mkdir(parents=True, exist_ok=True)
-    scenario_xml = headless_dir / f"main_headless_{scenario}.xml"
+    # One copy per output dir (ensemble runs, repro pairs) so concurrent workers never share one
+    tag = scenario if outdir.name == scenario else f"{scenario}_{outdir.name}"
+    scenario_xml = headless_dir / f"main_{'lean' if lean else 'capture' if capture else 'headless'}_{tag}.xml"
+    if lean or capture:
+        try:
+            info = write_lean_xml(xml_path, scenario_xml, data_dir or outdir / "data", overrides if lean else None,
+                                  prune=lean, capture=capture)
+            return scenario_xml, dict(info, profile="lean" if lean else "full")
+        except Exception as e:  # pragma: no cover
+            print(f"Warning: could not build lean XML profile: {e}; using the plain headless copy.")
+            scenario_xml = headless_dir / f"main_headless_{tag}.xml"
     try:
         tree = ET.parse(xml_path)
         root = tree.getroot()
@@ -111,12 +187,12 @@ def _ensure_scenario_xml(xml_path: Path, scenario: str, outdir: Path) -> Path:
             if local(bean.tag) == 'bean' and bean.attrib.get('id') == 'fileNamePrefix':
                 for child in list(bean):
                     if local(child.tag) == 'constructor-arg':
-                        child.attrib['value'] = str(outdir / 'data')
+                        child.attrib['value'] = str(data_dir or outdir / 'data')
         scenario_xml.write_text(ET.tostring(root, encoding='unicode'), encoding='utf-8')
     except Exception as e:  # pragma: no cover
         print(f"Warning: could not patch scenario XML: {e}; using original.")
         scenario_xml = xml_path
-    return scenario_xml
+    return scenario_xml, {"profile": "full"}
 
 
 def _parse_file_name_prefix(xml_path: Optional[Path]) -> Optional[str]:
@@ -164,109 +240,70 @@ CANONICAL_HEADERS = [
 ]
 
 
-def _read_first_series(csv_path: Path) -> Optional[pd.DataFrame]:
-    try:
-        df = pd.read_csv(csv_path)
-        tcol = None
-        for c in df.columns:
-            lc = c.lower()
-            if lc in {"t", "time", "period"}:
-                tcol = c
-                break
-        if tcol is None:
-            # Try no-header, two-column format: t,val
-            try:
-                df = pd.read_csv(csv_path, header=None, names=["t", "val"])
-                tcol = "t"
-            except Exception:
-                return None
-        vals = [c for c in df.columns if c != tcol]
-        if not vals:
-            return None
-        return pd.DataFrame({"t": df[tcol].astype(int), "val": df[vals[0]]})
-    except Exception:
-        return None
+# Raw report patterns per canonical series, in priority order (first parsable file wins)
+_RAW_PATTERNS = {
+    "GDP": ["*nominalGDP*.csv", "*gdp*.csv", "*GDP*.csv"],
+    "INV": ["*nominalInvestment*.csv", "*investment*.csv", "*INV*.csv", "*NominalInvestment*.csv"],
+    "UNEMP": ["*unemployment*.csv", "*Unemployment*.csv", "*u*.csv"],
+}
+_CONS_PATTERNS = [f"*{who}*NominalConsumption*.csv" for who in ["workers", "managers", "topManagers", "researchers"]]
+_DEBT_PATTERNS = ["*cFirmsAggregateDebt*.csv", "*kFirmsAggregateDebt*.csv"]
+
+
+def _assemble_canonical(match: Callable[[str], List], load: Callable[..., Optional[pd.Series]],
+                        label: Callable[[object], str]) -> Tuple[pd.DataFrame, List[str]]:
+    """Canonical frame from named raw reports.
+
+    ``match`` maps a report glob pattern to candidate sources, ``load`` returns
+    a source's series (``kind="rowmean"`` averages wide per-agent reports) and
+    ``label`` names a source in ``raw_sources``.
+    """
+    import pandas as pd
 
+    from ..io.golden_compare import canonicalize_java_headers
 
-def _collect_from_raw_dir(raw_dir: Path) -> Tuple[pd.DataFrame, List[str]]:
     used: List[str] = []
     series: Dict[str, pd.Series] = {}
-    # GDP
-    for name in ["nominalGDP", "gdp", "GDP"]:
-        for p in raw_dir.glob(f"*{name}*.csv"):
-            df = _read_first_series(p)
-            if df is not None:
-                series["GDP"] = df.set_index("t")["val"]
-                used.append(p.name)
+    for k, pats in _RAW_PATTERNS.items():
+        for f in (f for pat in pats for f in match(pat)):
+            s = load(f)
+            if s is not None:
+                series[k] = s
+                used.append(label(f))
                 break
-        if "GDP" in series:
-            break
-    # Investment
-    for name in ["nominalInvestment", "investment", "INV", "NominalInvestment"]:
-        for p in raw_dir.glob(f"*{name}*.csv"):
-            df = _read_first_series(p)
-            if df is not None:
-                series["INV"] = df.set_index("t")["val"]
-                used.append(p.name)
-                break
-        if "INV" in series:
-            break
-    # Unemployment
-    for name in ["unemployment", "Unemployment", "u"]:
-        for p in raw_dir.glob(f"*{name}*.csv"):
-            df = _read_first_series(p)
-            if df is not None:
-                series["UNEMP"] = df.set_index("t")["val"]
-                used.append(p.name)
-                break
-        if "UNEMP" in series:
-            break
     # Consumption: sum households nominal consumption
     cons_parts: List[pd.Series] = []
-    for who in ["workers", "managers", "topManagers", "researchers"]:
-        for p in raw_dir.glob(f"*{who}*NominalConsumption*.csv"):
-            df = _read_first_series(p)
-            if df is not None:
-                cons_parts.append(df.set_index("t")["val"])  # type: ignore
-                used.append(p.name)
+    for f in (f for pat in _CONS_PATTERNS for f in match(pat)):
+        s = load(f)
+        if s is not None:
+            cons_parts.append(s)
+            used.append(label(f))
     if cons_parts:
         s = cons_parts[0].copy()
         for part in cons_parts[1:]:
             s = s.add(part, fill_value=0.0)
         series["CONS"] = s
     # Inflation: from cAvPrice
-    for p in raw_dir.glob("*cAvPrice*.csv"):
-        df = _read_first_series(p)
-        if df is not None:
-            s = df.set_index("t")["val"].astype(float)
-            infl = (s - s.shift(1)) / s.shift(1)
-            series["INFL"] = infl
-            used.append(p.name)
+    for f in match("*cAvPrice*.csv"):
+        s = load(f)
+        if s is not None:
+            series["INFL"] = (s - s.shift(1)) / s.shift(1)
+            used.append(label(f))
+            break
+    # Productivity C: average across firms
+    for f in match("*cProductivity*.csv"):
+        s = load(f, kind="rowmean")
+        if s is not None:
+            series["PROD_C"] = s
+            used.append(label(f))
             break
-    # Productivity C
-    for p in raw_dir.glob("*cProductivity*.csv"):
-        try:
-            df = pd.read_csv(p)
-            tcol = next(c for c in df.columns if c.lower() in {"t", "time", "period"})
-            val_cols = [c for c in df.columns if c != tcol]
-            if val_cols:
-                avg = df[val_cols].mean(axis=1)
-                series["PROD_C"] = pd.Series(avg.values, index=df[tcol].astype(int).values)
-                used.append(p.name)
-                break
-        except Exception:
-            continue
     # Debt/GDP
     debt_s: Optional[pd.Series] = None
-    for suffix in ["cFirmsAggregateDebt", "kFirmsAggregateDebt"]:
-        for p in raw_dir.glob(f"*{suffix}*.csv"):
-            df = _read_first_series(p)
-            if df is not None:
-                if debt_s is None:
-                    debt_s = df.set_index("t")["val"].astype(float)
-                else:
-                    debt_s = debt_s.add(df.set_index("t")["val"].astype(float), fill_value=0.0)  # type: ignore
-                used.append(p.name)
+    for f in (f for pat in _DEBT_PATTERNS for f in match(pat)):
+        s = load(f)
+        if s is not None:
+            debt_s = s if debt_s is None else debt_s.add(s, fill_value=0.0)
+            used.append(label(f))
     # Build DataFrame
     if series:
         all_idx = None
@@ -278,21 +315,66 @@ def _collect_from_raw_dir(raw_dir: Path) -> Tuple[pd.DataFrame, List[str]]:
         if debt_s is not None and "GDP" in df.columns:
             dd = debt_s.reindex(df.index)
             g = df["GDP"].astype(float)
-            with pd.option_context('mode.use_inf_as_na', True):
-                df["Debt_GDP"] = (dd / g)
+            df["Debt_GDP"] = (dd / g).replace([np.inf, -np.inf], np.nan)
         df.insert(0, "t", df.index.astype(int))
         return canonicalize_java_headers(df), used
     else:
         return pd.DataFrame(columns=CANONICAL_HEADERS), used
 
 
-def _collect_and_write_canonical(spec: OracleRunSpec, outdir: Path, params: ParameterRegistry, xml: Optional[Path]):
+def _collect_from_raw_dir(raw_dir: Path, use_cache: bool = True) -> Tuple[pd.DataFrame, List[str]]:
+    """Canonical series from a JMAB raw data dir (one listing, parallel cached parses)."""
+    from .raw_collect import RawIndex, SeriesLoader
+
+    index = RawIndex(raw_dir)
+    with SeriesLoader(raw_dir, use_cache=use_cache) as loader:
+        # Start the likely winners right away; fallbacks are only parsed if these fail
+        firsts = [c[0] for c in ([f for pat in pats for f in index.match(pat)] for pats in _RAW_PATTERNS.values()) if c]
+        loader.prefetch(firsts + [f for pat in _CONS_PATTERNS + _DEBT_PATTERNS for f in index.match(pat)]
+                        + index.match("*cAvPrice*.csv")[:1])
+        loader.prefetch(index.match("*cProductivity*.csv")[:1], kind="rowmean")
+        return _assemble_canonical(index.match, loader.series, lambda f: f.name)
+
+
+def _collect_from_arrays(reports: Dict[str, np.ndarray]) -> Tuple[pd.DataFrame, List[str]]:
+    """Canonical series from in-memory report arrays (see ``jpype_harness.capture_reports``).
+
+    Report names are matched like the raw file stems; values are indexed by
+    period starting at t=1, one row per period for 2-D per-agent reports.
+    """
+    import pandas as pd
+
+    names = sorted(reports)
+
+    def match(pattern: str) -> List[str]:
+        return [n for n in names if fnmatchcase(f"{n}.csv", pattern)]
+
+    def load(name: str, kind: str = "first") -> Optional[pd.Series]:
+        a = np.asarray(reports[name], dtype=float)
+        if a.ndim == 2:
+            a = a.mean(axis=1) if kind == "rowmean" else a[:, 0]
+        if a.ndim != 1 or a.size == 0:
+            return None
+        return pd.Series(a, index=np.arange(1, a.size + 1))
+
+    return _assemble_canonical(match, load, lambda n: f"memory:{n}")
+
+
+def _collect_and_write_canonical(spec: OracleRunSpec, outdir: Path, params: ParameterRegistry, xml: Optional[Path],
+                                 seed: Optional[int] = None, captured: Optional[Dict[str, np.ndarray]] = None):
+    import pandas as pd
+
+    from ..io.golden_compare import canonicalize_java_headers
+
     raw_dir = _find_raw_data_dir(outdir, xml)
     horizon = int(params.get("meta.horizon", 1000))
-    seed = os.environ.get("S120_ORACLE_SEED") or os.environ.get("JABM_SEED")
+    if seed is None:
+        seed = os.environ.get("S120_ORACLE_SEED") or os.environ.get("JABM_SEED")
     used_files: List[str] = []
+    if captured:
+        df, used_files = _collect_from_arrays(captured)
     # try primary raw_dir; if empty, try outdir itself (prefix often used in filenames)
-    if raw_dir.exists() and any(raw_dir.glob("*.csv")):
+    elif raw_dir.exists() and any(raw_dir.glob("*.csv")):
         df, used_files = _collect_from_raw_dir(raw_dir)
     elif outdir.exists() and any(outdir.glob("data*.csv")):
         df, used_files = _collect_from_raw_dir(outdir)
@@ -362,22 +444,44 @@ def _build_cli():
     import argparse
     p = argparse.ArgumentParser(description="S120 Java oracle runner")
     sub = p.add_subparsers(dest="cmd", required=True)
-    # common opts
+    # common opts; also accepted after the subcommand (as the Makefile passes them)
     p.add_argument("--classpath", help="Classpath to JMAB+model", required=False)
     p.add_argument("--xml", help="Spring XML config", required=False)
     p.add_argument("--jvm", help="Path to libjvm.so", required=False)
     p.add_argument("--outroot", help="Artifacts root", default="artifacts/golden_java")
     p.add_argument("--seed", type=int, required=False, help="Deterministic seed for JABM")
-
-    sb = sub.add_parser("baseline", help="Run baseline")
-    st = sub.add_parser("tax", help="Run tax theta scenario")
+    p.add_argument("--capture", action="store_true",
+                   help="Read report series from the JVM into memory instead of re-parsing raw CSVs")
+    p.add_argument("--keep-raw", action="store_true", help="With --capture, still keep raw CSVs under <outdir>/data")
+    p.add_argument("--lean", action="store_true",
+                   help="Lean headless profile: prune unused report beans, apply overrides via param_map.yaml")
+    p.add_argument("--cds", action="store_true",
+                   help="Create/reuse an AppCDS archive for the classpath to cut JVM startup ($S120_CDS_DIR)")
+    common = argparse.ArgumentParser(add_help=False)
+    for flag in ["--classpath", "--xml", "--jvm", "--outroot"]:
+        common.add_argument(flag, default=argparse.SUPPRESS)
+    for flag in ["--capture", "--keep-raw", "--lean", "--cds"]:
+        common.add_argument(flag, action="store_true", default=argparse.SUPPRESS)
+    seeded = argparse.ArgumentParser(add_help=False, parents=[common])
+    seeded.add_argument("--seed", type=int, default=argparse.SUPPRESS)
+
+    sb = sub.add_parser("baseline", help="Run baseline", parents=[seeded])
+    st = sub.add_parser("tax", help="Run tax theta scenario", parents=[seeded])
     st.add_argument("--theta", type=float, required=True)
-    sw = sub.add_parser("wage", help="Run wage tu scenario")
+    sw = sub.add_parser("wage", help="Run wage tu scenario", parents=[seeded])
     sw.add_argument("--tu", type=int, required=True)
-    sc = sub.add_parser("collect", help="Collect canonical series from an existing run dir")
+    sc = sub.add_parser("collect", help="Collect canonical series from an existing run dir", parents=[common])
     sc.add_argument("--scenario", required=True, help="Scenario folder under outroot (e.g., baseline)")
-    sr = sub.add_parser("repro", help="Run two short baselines with same seed and compare first 10 GDPs")
+    sr = sub.add_parser("repro", help="Run two short baselines with same seed and compare first 10 GDPs",
+                        parents=[common])
     sr.add_argument("--seed", type=int, required=True)
+    sf = sub.add_parser("frontiers", help="Run the θ/tu frontiers in parallel JVM workers", parents=[seeded])
+    se = sub.add_parser("ensemble", help="Seed ensemble of baseline and frontiers in parallel JVM workers",
+                        parents=[seeded])
+    se.add_argument("--seeds", type=int, default=25, help="Number of seeds (seed, seed+1, ...)")
+    for sp in (sr, sf, se):
+        sp.add_argument("-j", "--workers", type=int, default=None,
+                        help="Worker processes, each with its own JVM (default: one per core)")
     return p
 
 
@@ -399,8 +503,12 @@ def main():
         out_a = outroot / "repro_a"
         out_b = outroot / "repro_b"
         spec = OracleRunSpec("baseline", overrides={})
-        run_oracle_scenario(spec, out_a, classpath=a.classpath, xml=Path(a.xml) if a.xml else None, jvm=a.jvm, seed=a.seed)
-        run_oracle_scenario(spec, out_b, classpath=a.classpath, xml=Path(a.xml) if a.xml else None, jvm=a.jvm, seed=a.seed)
+        from .pool import OracleExecutor, OracleJob
+
+        # Two independent JVMs, so the check also covers cross-process determinism
+        xml = Path(a.xml) if a.xml else None
+        with OracleExecutor(a.workers or 2, classpath=a.classpath, jvm=a.jvm, cds=a.cds) as ex:
+            ex.map([OracleJob(spec, out_a, seed=a.seed, xml=xml), OracleJob(spec, out_b, seed=a.seed, xml=xml)])
         # compare first 10 GDPs
         import pandas as pd  # local import to keep module scope clean
         ok = False
@@ -416,12 +524,25 @@ def main():
         logp.parent.mkdir(parents=True, exist_ok=True)
         logp.write_text(f"Reproducibility check with seed={a.seed}: {'PASSED' if ok else 'FAILED'}\n", encoding='utf-8')
         return 0
+    elif a.cmd in ("frontiers", "ensemble"):
+        from .pool import OracleExecutor, ensemble_jobs, frontier_specs
+
+        base = a.seed if a.seed is not None else 1
+        seeds = [base + i for i in range(a.seeds)] if a.cmd == "ensemble" else [a.seed]
+        specs = frontier_specs()
+        if a.cmd == "ensemble":
+            specs = [OracleRunSpec("baseline", overrides={})] + specs
+        jobs = ensemble_jobs(specs, outroot, seeds, xml=Path(a.xml) if a.xml else None, capture=a.capture, lean=a.lean)
+        with OracleExecutor(a.workers, classpath=a.classpath, jvm=a.jvm, cds=a.cds) as ex:
+            ex.map(jobs)
+        return 0
     else:
         outdir = outroot / a.scenario
         params = ParameterRegistry.from_files(overrides=None)
         _collect_and_write_canonical(OracleRunSpec(a.scenario, overrides={}), outdir, params, Path(a.xml) if a.xml else None)
         return 0
-    run_oracle_scenario(spec, outdir, classpath=a.classpath, xml=Path(a.xml) if a.xml else None, jvm=a.jvm, seed=a.seed)
+    run_oracle_scenario(spec, outdir, classpath=a.classpath, xml=Path(a.xml) if a.xml else None, jvm=a.jvm, seed=a.seed,
+                        capture=a.capture, keep_raw=a.keep_raw, lean=a.lean, cds=a.cds)
     return 0
 
 
@@ -0,0 +1,161 @@
+package s120.capture;
+
+import java.util.ArrayList;
+import java.util.Iterator;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+
+import net.sourceforge.jabm.report.DataWriter;
+
+/**
+ * In-memory stand-in for the JABM CSV writers of the oracle's report beans.
+ *
+ * The lean XML profile (oracle/xml_profile.py) swaps every writer bean that
+ * would write under fileNamePrefix for one of these, named after the CSV it
+ * replaces. Values are kept per report and handed to Python by drain(), so a
+ * captured run writes no report files at all.
+ *
+ * Like CSVWriter, scalar values fill a row of numColumns cells; an array or
+ * iterator is one row on its own. Single-column reports drain as double[],
+ * wider ones as double[][] with one row per period.
+ */
+public class ReportCapture implements DataWriter {
+
+    private static final Map<String, ReportCapture> REPORTS = new LinkedHashMap<String, ReportCapture>();
+
+    private final String name;
+    private int numColumns = 1;
+    private final List<double[]> rows = new ArrayList<double[]>();
+    private final List<Double> row = new ArrayList<Double>();
+
+    public ReportCapture(String name) {
+        this.name = name;
+        synchronized (REPORTS) {
+            REPORTS.put(name, this);
+        }
+    }
+
+    public ReportCapture(String name, int numColumns) {
+        this(name);
+        this.numColumns = numColumns;
+    }
+
+    public void setNumColumns(int numColumns) {
+        this.numColumns = numColumns;
+    }
+
+    /** Every report captured since the last call, keyed by name; clears the store. */
+    public static Map<String, Object> drain() {
+        Map<String, Object> out = new LinkedHashMap<String, Object>();
+        synchronized (REPORTS) {
+            for (ReportCapture r : REPORTS.values()) {
+                out.put(r.name, r.values());
+            }
+            REPORTS.clear();
+        }
+        return out;
+    }
+
+    private synchronized Object values() {
+        endRow();
+        int width = 0;
+        for (double[] r : rows) {
+            width = Math.max(width, r.length);
+        }
+        if (width <= 1) {
+            double[] series = new double[rows.size()];
+            for (int i = 0; i < series.length; i++) {
+                series[i] = rows.get(i).length == 0 ? Double.NaN : rows.get(i)[0];
+            }
+            return series;
+        }
+        double[][] table = new double[rows.size()][width];
+        for (int i = 0; i < table.length; i++) {
+            double[] r = rows.get(i);
+            for (int j = 0; j < width; j++) {
+                table[i][j] = j < r.length ? r[j] : Double.NaN;
+            }
+        }
+        return table;
+    }
+
+    private void endRow() {
+        if (!row.isEmpty()) {
+            double[] r = new double[row.size()];
+            for (int i = 0; i < r.length; i++) {
+                r[i] = row.get(i);
+            }
+            rows.add(r);
+            row.clear();
+        }
+    }
+
+    private static double toDouble(Object datum) {
+        if (datum instanceof Number) {
+            return ((Number) datum).doubleValue();
+        }
+        if (datum instanceof Boolean) {
+            return ((Boolean) datum) ? 1.0 : 0.0;
+        }
+        try {
+            return Double.parseDouble(String.valueOf(datum));
+        } catch (NumberFormatException e) {
+            return Double.NaN;
+        }
+    }
+
+    private synchronized void cell(double value) {
+        row.add(value);
+        if (row.size() >= numColumns) {
+            endRow();
+        }
+    }
+
+    public synchronized void newData(Iterator<Object> i) {
+        endRow();
+        while (i.hasNext()) {
+            row.add(toDouble(i.next()));
+        }
+        endRow();
+    }
+
+    public synchronized void newData(Object[] data) {
+        endRow();
+        for (Object datum : data) {
+            row.add(toDouble(datum));
+        }
+        endRow();
+    }
+
+    public void newData(Object datum) {
+        cell(toDouble(datum));
+    }
+
+    public void newData(int datum) {
+        cell(datum);
+    }
+
+    public void newData(long datum) {
+        cell(datum);
+    }
+
+    public void newData(double datum) {
+        cell(datum);
+    }
+
+    public void newData(float datum) {
+        cell(datum);
+    }
+
+    public void newData(boolean datum) {
+        cell(datum ? 1.0 : 0.0);
+    }
+
+    public synchronized void flush() {
+    }
+
+    public synchronized void close() {
+        endRow();
+    }
+}
@@ -13,30 +13,156 @@ This module provides a skeleton; implementation details (classpath detection,
 CSV export hooks) are filled in next milestone once the oracle repo is present.
 """
 
+import os
+import time
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
 
-try:
-    import jpype
-    import jpype.imports  # noqa: F401
-except Exception:  # pragma: no cover
-    jpype = None  # type: ignore
+import numpy as np
 
+from .cds import archive_args, split_classpath
 
-def run_java_oracle(config_xml: Path, classpath: str, jvm_path: Optional[str] = None, seed: Optional[int] = None):
-    if jpype is None:
+def _jpype():
+    """The ``jpype`` module, imported on first use so CLI startup does not pay for it."""
+    try:
+        import jpype
+        import jpype.imports  # noqa: F401
+    except Exception:  # pragma: no cover
         raise RuntimeError("JPype not available. Please install jpype1.")
-    if not jpype.isJVMStarted():
-        # Support colon/semicolon separated classpath AND lists
-        if isinstance(classpath, str):
-            if ";" in classpath:
-                cp_list: List[str] = classpath.split(";")
-            else:
-                cp_list = classpath.split(":")
-        else:
-            cp_list = [str(classpath)]
-        # JPype guidance recommends convertStrings=False to avoid implicit conversions
-        jpype.startJVM(jvm_path, classpath=cp_list, convertStrings=False)
+    return jpype
+
+
+# How this process's JVM was started, for meta.json
+JVM_INFO: Dict[str, object] = {}
+
+# Built from java/s120/capture/ReportCapture.java by ``make oracle-capture-hook``
+CAPTURE_JAR = Path(__file__).resolve().parent / "java" / "s120-capture.jar"
+
+
+def start_jvm(classpath: str, jvm_path: Optional[str] = None, cds: bool = False) -> Dict[str, object]:
+    """Start the in-process JVM once; later calls are no-ops (JPype cannot restart it).
+
+    ``cds`` creates or reuses an AppCDS archive for the classpath (see
+    ``oracle.cds``). Returns ``JVM_INFO``: startup seconds, CDS mode and
+    whether this call found the JVM already running.
+    """
+    jpype = _jpype()
+    if jpype.isJVMStarted():
+        JVM_INFO["jvm_reused"] = True
+        return JVM_INFO
+    # Support colon/semicolon separated classpath AND lists
+    if isinstance(classpath, str):
+        cp_list: List[str] = split_classpath(classpath)
+    else:
+        cp_list = [str(classpath)]
+    if CAPTURE_JAR.exists() and str(CAPTURE_JAR) not in cp_list:
+        # The JVM cannot be restarted later with the hook, so it goes on the classpath whenever it is built
+        cp_list.append(str(CAPTURE_JAR))
+    args: List[str] = []
+    mode, archive = "off", None
+    if cds and isinstance(classpath, str):
+        args, mode, archive = archive_args(classpath, jvm_path)
+    t0 = time.perf_counter()
+    # JPype guidance recommends convertStrings=False to avoid implicit conversions
+    jpype.startJVM(*args, jvmpath=jvm_path, classpath=cp_list, convertStrings=False)
+    JVM_INFO.update({
+        "jvm_startup_s": round(time.perf_counter() - t0, 4),
+        "cds": mode,
+        "cds_archive": str(archive) if archive else None,
+        "jvm_reused": False,
+    })
+    return JVM_INFO
+
+
+# Heap peak and GC time of the latest run_java_oracle call, for meta.json resources
+JVM_USAGE: Dict[str, float] = {}
+
+
+def _jvm_gc_totals(jpype) -> Tuple[int, int]:
+    """(collection milliseconds, collection count) summed over the JVM's garbage collectors."""
+    mf = jpype.JClass("java.lang.management.ManagementFactory")
+    ms = count = 0
+    for gc in mf.getGarbageCollectorMXBeans():
+        # -1 means the collector does not report the value
+        ms += max(0, int(gc.getCollectionTime()))
+        count += max(0, int(gc.getCollectionCount()))
+    return ms, count
+
+
+def _heap_pools(jpype) -> List:
+    mf = jpype.JClass("java.lang.management.ManagementFactory")
+    heap = jpype.JClass("java.lang.management.MemoryType").HEAP
+    return [p for p in mf.getMemoryPoolMXBeans() if p.getType() == heap]
+
+
+def _jvm_usage_start(jpype) -> Optional[Tuple[int, int]]:
+    """Reset heap pool peaks and snapshot GC totals; None if the JVM cannot report them."""
+    JVM_USAGE.clear()
+    try:
+        for pool in _heap_pools(jpype):
+            pool.resetPeakUsage()
+        return _jvm_gc_totals(jpype)
+    except Exception:
+        return None
+
+
+def _jvm_usage_stop(jpype, start: Optional[Tuple[int, int]]):
+    if start is None:
+        return
+    try:
+        ms, count = _jvm_gc_totals(jpype)
+        # Sum of per-pool peaks: an upper bound on the heap in use at any one time
+        peak = sum(int(p.getPeakUsage().getUsed()) for p in _heap_pools(jpype))
+    except Exception:
+        return
+    JVM_USAGE.update({
+        "jvm_heap_peak_mb": round(peak / 2 ** 20, 3),
+        "jvm_gc_s": (ms - start[0]) / 1e3,
+        "jvm_gc_count": count - start[1],
+    })
+
+
+# Java class exposing ``static Map<String, double[]> drain()`` (or ``double[][]`` per-agent
+# reports): the report series of the run that just finished, cleared on read.
+CAPTURE_CLASS_ENV = "S120_ORACLE_CAPTURE_CLASS"
+DEFAULT_CAPTURE_CLASS = "s120.capture.ReportCapture"
+
+
+def capture_hook_available(classpath: Optional[str] = None) -> bool:
+    """Whether runs can load the capture hook: the built jar, a classpath entry or a custom class."""
+    if CAPTURE_JAR.exists() or os.environ.get(CAPTURE_CLASS_ENV):
+        return True
+    return any(Path(e).name == CAPTURE_JAR.name for e in split_classpath(classpath or ""))
+
+
+def capture_reports(class_name: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """Report series from the in-JVM collector hook as NumPy arrays.
+
+    Primitive Java arrays implement the buffer protocol under JPype, so
+    ``np.asarray`` views them without a copy; the views keep the Java arrays
+    alive for as long as they are referenced.
+    """
+    hook = _jpype().JClass(class_name or os.environ.get(CAPTURE_CLASS_ENV, DEFAULT_CAPTURE_CLASS))
+    out: Dict[str, np.ndarray] = {}
+    for entry in hook.drain().entrySet():
+        out[str(entry.getKey())] = np.asarray(entry.getValue())
+    return out
+
+
+def run_java_oracle(config_xml: Path, classpath: str, jvm_path: Optional[str] = None, seed: Optional[int] = None,
+                    capture: bool = False, headless: bool = False,
+                    cds: bool = False) -> Optional[Dict[str, np.ndarray]]:
+    """Run one simulation in this process's JVM.
+
+    ``headless`` skips the desktop managers and runs the batch
+    ``SimulationManager`` with ``java.awt.headless`` set.
+
+    With ``capture`` the report series are returned from memory (see
+    ``capture_reports``); None means the hook is not on the classpath and the
+    caller should fall back to the CSVs under ``fileNamePrefix``.
+    """
+    start_jvm(classpath, jvm_path, cds=cds)
+    jpype = _jpype()
     # Set the system property for jabm config
     java_lang_System = jpype.JClass("java.lang.System")
     java_lang_System.setProperty("jabm.config", str(config_xml))
@@ -50,12 +176,16 @@ def run_java_oracle(config_xml: Path, classpath: str, jvm_path: Optional[str] =
             pass
     # Try DesktopSimulationManager first; if missing GUI deps, fall back to SimulationManager
     SimClass = None
-    for name in [
+    managers = [
         "jmab.desktop.DesktopSimulationManager",
         "jmab.simulation.DesktopSimulationManager",
         "net.sourceforge.jabm.DesktopSimulationManager",
         "net.sourceforge.jabm.SimulationManager",
-    ]:
+    ]
+    if headless:
+        java_lang_System.setProperty("java.awt.headless", "true")
+        managers = managers[-1:]
+    for name in managers:
         try:
             SimClass = jpype.JClass(name)
             break
@@ -63,7 +193,16 @@ def run_java_oracle(config_xml: Path, classpath: str, jvm_path: Optional[str] =
             continue
     if SimClass is None:
         raise RuntimeError("Could not load a SimulationManager class from classpath")
+    usage0 = _jvm_usage_start(jpype)
     SimClass.main([])
+    _jvm_usage_stop(jpype, usage0)
+    if not capture:
+        return None
+    try:
+        return capture_reports()
+    except Exception as e:
+        print(f"Warning: in-memory capture unavailable ({e}); falling back to raw CSVs")
+        return None
 
 
 def _build_cli():
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+"""
+Persistent worker pool for Java oracle scenarios.
+
+JPype starts one JVM per Python process and cannot restart it, so parallel
+oracle runs need separate processes. ``OracleExecutor`` keeps ``workers``
+long-lived subprocesses (spawned, never forked, so no JVM state is copied),
+warms a JVM in each at start-up and hands ``OracleJob``s to whichever worker
+is idle. Each job goes through ``run_oracle_scenario`` and writes the usual
+``artifacts/golden_java/<scenario>`` layout; seed ensembles use
+``<scenario>/run_XXX``.
+"""
+
+import multiprocessing as mp
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence
+
+from .cli import OracleRunSpec, _resolve_classpath, run_oracle_scenario
+from .jpype_harness import start_jvm
+
+
+@dataclass
+class OracleJob:
+    spec: OracleRunSpec
+    outdir: Path
+    seed: Optional[int] = None
+    xml: Optional[Path] = None
+    capture: bool = False
+    lean: bool = False
+
+
+_WORKER = {"classpath": None, "jvm": None, "cds": False, "jvm_error": None}
+
+
+def _init_worker(classpath: Optional[str], jvm: Optional[str], cds: bool = False):
+    _WORKER.update(classpath=classpath, jvm=jvm, cds=cds)
+    if not classpath:
+        return
+    try:
+        start_jvm(classpath, jvm, cds=cds)
+    except Exception as e:  # pragma: no cover
+        # Surface the failure per job through run_oracle_scenario's meta.json instead of killing the pool
+        _WORKER["jvm_error"] = str(e)[:500]
+
+
+def _run_job(job: OracleJob) -> Path:
+    # A JVM that failed to start in this worker is reported as is; JPype would only fail the same way again
+    return run_oracle_scenario(job.spec, job.outdir, classpath=_WORKER["classpath"], xml=job.xml,
+                               jvm=_WORKER["jvm"], seed=job.seed, capture=job.capture,
+                               lean=job.lean, cds=_WORKER["cds"], jvm_error=_WORKER["jvm_error"])
+
+
+class OracleExecutor:
+    """``workers`` warm-JVM subprocesses; ``None``/``0`` uses every core.
+
+    ``cds`` starts each JVM with the classpath's AppCDS archive (the first
+    worker creates it if missing).
+    """
+
+    def __init__(self, workers: Optional[int] = None, classpath: Optional[str] = None, jvm: Optional[str] = None,
+                 cds: bool = False):
+        if not workers or workers <= 0:
+            workers = os.cpu_count() or 1
+        self.workers = int(workers)
+        self.classpath = classpath or _resolve_classpath()
+        self._ex = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.classpath, jvm, cds),
+        )
+
+    def submit(self, job: OracleJob) -> Future:
+        return self._ex.submit(_run_job, job)
+
+    def map(self, jobs: Iterable[OracleJob]) -> List[Path]:
+        """Run ``jobs`` on idle workers; results come back in submission order."""
+        futures = [self.submit(j) for j in jobs]
+        return [f.result() for f in futures]
+
+    def close(self):
+        self._ex.shutdown(wait=True)
+
+    def __enter__(self) -> "OracleExecutor":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def frontier_specs() -> List[OracleRunSpec]:
+    """The θ and tu frontier scenarios of ``make oracle-frontiers``."""
+    return [
+        OracleRunSpec("tax_theta0.0", overrides={"taxes": {"theta_progressive": 0.0}}),
+        OracleRunSpec("tax_theta1.5", overrides={"taxes": {"theta_progressive": 1.5}}),
+        OracleRunSpec("wage_tu1", overrides={"wage_rigidity": {"tu": 1}}),
+        OracleRunSpec("wage_tu4", overrides={"wage_rigidity": {"tu": 4}}),
+    ]
+
+
+def ensemble_jobs(specs: Sequence[OracleRunSpec], outroot: Path, seeds: Sequence[int],
+                  xml: Optional[Path] = None, capture: bool = False, lean: bool = False) -> List[OracleJob]:
+    """One job per (scenario, seed); a single seed keeps the flat ``<outroot>/<scenario>`` layout."""
+    jobs: List[OracleJob] = []
+    for spec in specs:
+        for i, seed in enumerate(seeds, start=1):
+            outdir = outroot / spec.name if len(seeds) == 1 else outroot / spec.name / f"run_{i:03d}"
+            jobs.append(OracleJob(spec, outdir, seed=seed, xml=xml, capture=capture, lean=lean))
+    return jobs
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+"""
+Indexed, cached parsing of raw JMAB report CSVs.
+
+``RawIndex`` lists a raw data directory once and answers the collector's glob
+patterns from memory. ``SeriesLoader`` parses the files it is asked for on a
+thread pool, reading only the time column and the first value column (or a
+row mean for wide per-firm reports) with fixed dtypes. Parsed series are
+cached as ``.npz`` under ``<raw_dir>/.s120_parsed/`` keyed on the source's
+size and mtime, so collecting the same run again skips CSV parsing entirely.
+"""
+
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+PARSED_CACHE_DIR = ".s120_parsed"
+TIME_COLUMNS = {"t", "time", "period"}
+
+Parsed = Optional[Tuple[np.ndarray, np.ndarray]]
+
+
+class RawIndex:
+    def __init__(self, raw_dir: Path):
+        self.raw_dir = raw_dir
+        with os.scandir(raw_dir) as it:
+            self.names: List[str] = sorted(e.name for e in it if e.is_file() and e.name.endswith(".csv"))
+
+    def match(self, pattern: str) -> List[Path]:
+        """Files matching a glob ``pattern`` (same rules as ``Path.glob``)."""
+        return [self.raw_dir / n for n in self.names if fnmatchcase(n, pattern)]
+
+
+def _header(path: Path) -> List[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [c.strip().strip('"') for c in f.readline().rstrip("\r\n").split(",")]
+
+
+def _parse_first(path: Path) -> Parsed:
+    """(t, first value column); headerless files are read as ``t,val``."""
+    cols = _header(path)
+    tcol = next((c for c in cols if c.lower() in TIME_COLUMNS), None)
+    if tcol is None:
+        df = pd.read_csv(path, header=None, usecols=[0, 1], names=["t", "val"], dtype=np.float64)
+        t, v = df["t"], df["val"]
+    else:
+        vals = [c for c in cols if c != tcol]
+        if not vals:
+            return None
+        df = pd.read_csv(path, usecols=[tcol, vals[0]], dtype={vals[0]: np.float64})
+        t, v = df[tcol], df[vals[0]]
+    return t.to_numpy().astype(np.int64), v.to_numpy(dtype=np.float64)
+
+
+def _parse_rowmean(path: Path) -> Parsed:
+    """(t, mean over every other column) for wide per-agent reports."""
+    cols = _header(path)
+    tcol = next((c for c in cols if c.lower() in TIME_COLUMNS), None)
+    if tcol is None or len(cols) < 2:
+        return None
+    df = pd.read_csv(path, dtype=np.float64)
+    t = df.pop(tcol).to_numpy().astype(np.int64)
+    return t, df.mean(axis=1).to_numpy()
+
+
+_PARSERS = {"first": _parse_first, "rowmean": _parse_rowmean}
+
+
+class SeriesLoader:
+    def __init__(self, raw_dir: Path, workers: Optional[int] = None, use_cache: bool = True):
+        self.cache_dir = raw_dir / PARSED_CACHE_DIR if use_cache else None
+        self._ex = ThreadPoolExecutor(max_workers=workers or min(8, os.cpu_count() or 1))
+        self._futures: Dict[Tuple[Path, str], Future] = {}
+
+    def prefetch(self, paths: List[Path], kind: str = "first"):
+        for p in paths:
+            self.get(p, kind)
+
+    def get(self, path: Path, kind: str = "first") -> Future:
+        key = (path, kind)
+        if key not in self._futures:
+            self._futures[key] = self._ex.submit(self._load, path, kind)
+        return self._futures[key]
+
+    def series(self, path: Path, kind: str = "first") -> Optional[pd.Series]:
+        res = self.get(path, kind).result()
+        return None if res is None else pd.Series(res[1], index=res[0])
+
+    def _load(self, path: Path, kind: str) -> Parsed:
+        st = path.stat()
+        stamp = np.array([st.st_size, st.st_mtime_ns], dtype=np.int64)
+        cached = self.cache_dir / f"{path.name}.{kind}.npz" if self.cache_dir else None
+        if cached is not None and cached.exists():
+            try:
+                with np.load(cached) as z:
+                    if np.array_equal(z["stamp"], stamp):
+                        return (z["t"], z["val"]) if z["ok"] else None
+            except Exception:
+                pass
+        try:
+            res = _PARSERS[kind](path)
+        except Exception:
+            res = None
+        if cached is not None:
+            try:
+                self.cache_dir.mkdir(exist_ok=True)
+                t, val = res if res is not None else (np.zeros(0, np.int64), np.zeros(0))
+                tmp = cached.with_suffix(".tmp.npz")
+                np.savez(tmp, stamp=stamp, ok=res is not None, t=t, val=val)
+                os.replace(tmp, cached)
+            except OSError:
+                # Read-only golden dirs still collect, just without the cache
+                pass
+        return res
+
+    def close(self):
+        self._ex.shutdown(wait=True)
+
+    def __enter__(self) -> "SeriesLoader":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
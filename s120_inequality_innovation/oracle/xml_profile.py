@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+"""
+Lean headless profile for the oracle's Spring XML.
+
+``write_lean_xml`` copies the scenario XML (and the report XMLs it imports)
+with:
+
+  - ``fileNamePrefix`` pointed at the run's raw data dir,
+  - top-level report beans the canonical collector never reads removed,
+    together with every ``ref``/``idref`` to them,
+  - ``OracleRunSpec.overrides`` written into the XML through
+    ``config/param_map.yaml`` (flattened XML key -> dotted YAML key),
+  - with ``capture``, every CSV writer that writes under ``fileNamePrefix``
+    swapped for the in-memory ``s120.capture.ReportCapture`` hook
+    (``java/s120/capture/ReportCapture.java``), so the run writes no report
+    files and ``jpype_harness.capture_reports`` drains the values instead.
+
+Mapped XML keys use the ``extract_params`` flattening
+(``beans/bean/property@value``); a segment may carry predicates such as
+``bean[id=taxPolicy]`` or ``property[name=theta]`` to address a single
+element.
+"""
+
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .extract_params import load_mapping
+
+
+DEFAULT_PARAM_MAP = Path(__file__).resolve().parents[1] / "config" / "param_map.yaml"
+CAPTURE_CLASS = "s120.capture.ReportCapture"
+
+# Report names read by cli._collect_from_raw_dir (see its patterns); the last-resort
+# "*u*" unemployment fallback is deliberately not kept alive here.
+LEAN_REPORT_KEYS = (
+    "nominalGDP", "gdp", "GDP",
+    "nominalInvestment", "NominalInvestment", "investment", "INV",
+    "unemployment", "Unemployment",
+    "NominalConsumption",
+    "cAvPrice",
+    "cProductivity",
+    "AggregateDebt",
+)
+_REPORT_CLASS = re.compile(r"report|csv|writer", re.IGNORECASE)
+_WRITER_CLASS = re.compile(r"writer", re.IGNORECASE)
+_SEGMENT = re.compile(r"^([^\[]+)((?:\[[^=\]]+=[^\]]*\])*)$")
+
+
+def _local(tag: str) -> str:
+    return tag.split("}", 1)[-1]
+
+
+def _is_report_bean(bean: ET.Element) -> bool:
+    return _local(bean.tag) == "bean" and bool(_REPORT_CLASS.search(bean.attrib.get("class", "")))
+
+
+def _keeps(bean: ET.Element) -> bool:
+    # A report is needed if its id or any nested value names a collected series
+    texts = [bean.attrib.get("id", "")]
+    texts += [v for el in bean.iter() for v in el.attrib.values()]
+    texts += [el.text or "" for el in bean.iter()]
+    return any(k in s for s in texts for k in LEAN_REPORT_KEYS)
+
+
+def prune_reports(root: ET.Element) -> List[str]:
+    """Drop unneeded top-level report beans; returns their ids."""
+    pruned: List[str] = []
+    for bean in list(root):
+        if _is_report_bean(bean) and not _keeps(bean):
+            root.remove(bean)
+            pruned.append(bean.attrib.get("id", bean.attrib.get("class", "")))
+    return pruned
+
+
+def drop_refs(root: ET.Element, ids: List[str]):
+    gone = set(ids)
+    for parent in root.iter():
+        for child in list(parent):
+            if _local(child.tag) in ("ref", "idref") and (
+                child.attrib.get("bean") in gone or child.attrib.get("local") in gone
+            ):
+                parent.remove(child)
+
+
+def set_file_name_prefix(root: ET.Element, data_dir: Path):
+    for bean in root.iter():
+        if _local(bean.tag) == "bean" and bean.attrib.get("id") == "fileNamePrefix":
+            for child in list(bean):
+                if _local(child.tag) == "constructor-arg":
+                    child.attrib["value"] = str(data_dir)
+
+
+def _uses_prefix(bean: ET.Element) -> bool:
+    return any("fileNamePrefix" in (el.attrib.get("ref"), el.attrib.get("bean"), el.attrib.get("local"))
+               for el in bean.iter())
+
+
+def _writer_name(bean: ET.Element, owner: Optional[str]) -> str:
+    # The stem of the CSV it would have written, so captured names match the raw file stems
+    for el in bean.iter():
+        for v in list(el.attrib.values()) + [el.text or ""]:
+            if v.strip().lower().endswith(".csv"):
+                return Path(v.strip()).stem
+    return bean.attrib.get("id") or owner or "report"
+
+
+def _num_columns(bean: ET.Element) -> Optional[str]:
+    for el in bean.iter():
+        if _local(el.tag) == "property" and el.attrib.get("name") == "numColumns":
+            return el.attrib.get("value")
+        if _local(el.tag) == "constructor-arg" and el.attrib.get("value", "").isdigit():
+            return el.attrib["value"]
+    return None
+
+
+def capture_writers(root: ET.Element, class_name: str = CAPTURE_CLASS) -> List[str]:
+    """Replace the writers that write under ``fileNamePrefix`` with capture beans; returns their names."""
+    names: List[str] = []
+
+    def visit(el: ET.Element, owner: Optional[str]):
+        for child in list(el):
+            if (_local(child.tag) == "bean" and _WRITER_CLASS.search(child.attrib.get("class", ""))
+                    and _uses_prefix(child)):
+                name = _writer_name(child, owner)
+                cols = _num_columns(child)
+                ns = child.tag[: -len("bean")]
+                for sub in list(child):
+                    child.remove(sub)
+                child.attrib["class"] = class_name
+                ET.SubElement(child, ns + "constructor-arg", {"value": name})
+                if cols is not None:
+                    ET.SubElement(child, ns + "property", {"name": "numColumns", "value": cols})
+                names.append(name)
+            else:
+                visit(child, child.attrib.get("id") or owner)
+
+    visit(root, None)
+    return names
+
+
+def _flatten_overrides(d: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for k, v in d.items():
+        key = f"{prefix}.{k}" if prefix else str(k)
+        if isinstance(v, dict):
+            out.update(_flatten_overrides(v, key))
+        else:
+            out[key] = v
+    return out
+
+
+def _xml_targets(root: ET.Element, xml_key: str) -> Tuple[List[ET.Element], Optional[str]]:
+    path, _, attr = xml_key.partition("@")
+    segments = path.split("/")
+    nodes: List[ET.Element] = []
+    m = _SEGMENT.match(segments[0])
+    if m and _local(root.tag) == m.group(1):
+        nodes = [root]
+    for seg in segments[1:]:
+        m = _SEGMENT.match(seg)
+        if not m:
+            return [], None
+        tag = m.group(1)
+        preds = re.findall(r"\[([^=\]]+)=([^\]]*)\]", m.group(2))
+        nodes = [
+            c for n in nodes for c in n
+            if _local(c.tag) == tag and all(c.attrib.get(a) == v for a, v in preds)
+        ]
+    return nodes, (attr or None)
+
+
+def apply_overrides(root: ET.Element, overrides: Dict[str, Any], mapping: Dict[str, str]) -> Tuple[Dict[str, Any], List[str]]:
+    """Write overrides into every XML element mapped to their dotted key.
+
+    Returns ``(applied {dotted key: value}, unmapped dotted keys)``; a key is
+    unmapped when the map has no entry for it or its XML path matches nothing.
+    """
+    by_yaml: Dict[str, List[str]] = {}
+    for xk, yk in mapping.items():
+        by_yaml.setdefault(yk, []).append(xk)
+    applied: Dict[str, Any] = {}
+    unmapped: List[str] = []
+    for key, value in sorted(_flatten_overrides(overrides).items()):
+        hit = False
+        for xk in by_yaml.get(key, []):
+            nodes, attr = _xml_targets(root, xk)
+            for n in nodes:
+                if attr:
+                    n.attrib[attr] = str(value)
+                else:
+                    n.text = str(value)
+                hit = True
+        if hit:
+            applied[key] = value
+        else:
+            unmapped.append(key)
+    return applied, unmapped
+
+
+def write_lean_xml(xml_path: Path, out_xml: Path, data_dir: Path, overrides: Optional[Dict[str, Any]] = None,
+                   param_map: Optional[Path] = None, prune: bool = True, capture: bool = False) -> Dict[str, Any]:
+    """Write the lean copy of ``xml_path`` (and its imports) next to ``out_xml``.
+
+    ``prune=False`` keeps every report bean; ``capture`` swaps the CSV
+    writers for the capture hook (see ``capture_writers``). Returns a
+    summary for meta.json: pruned report ids, captured report names,
+    applied and unmapped overrides.
+    """
+    mapping = load_mapping(param_map or DEFAULT_PARAM_MAP)
+    root = ET.parse(xml_path).getroot()
+
+    def rewrite(r: ET.Element) -> Tuple[List[str], List[str]]:
+        set_file_name_prefix(r, data_dir)
+        pruned = prune_reports(r) if prune else []
+        return pruned, capture_writers(r) if capture else []
+
+    pruned, captured = rewrite(root)
+    # Imported report XMLs are rewritten into sibling copies the main file then imports
+    imported: List[Tuple[ET.Element, Path]] = []
+    for el in root:
+        if _local(el.tag) == "import" and el.attrib.get("resource"):
+            src = (xml_path.parent / el.attrib["resource"]).resolve()
+            if not src.exists():
+                continue
+            sub = ET.parse(src)
+            p2, c2 = rewrite(sub.getroot())
+            pruned += p2
+            captured += c2
+            dst = out_xml.with_name(f"{out_xml.stem}__{src.name}")
+            el.attrib["resource"] = dst.name
+            imported.append((sub.getroot(), dst))
+    applied, unmapped = apply_overrides(root, overrides or {}, mapping)
+    for sub_root, dst in imported:
+        a2, _ = apply_overrides(sub_root, overrides or {}, mapping)
+        applied.update(a2)
+    unmapped = [k for k in unmapped if k not in applied]
+    out_xml.parent.mkdir(parents=True, exist_ok=True)
+    for sub_root, dst in imported:
+        drop_refs(sub_root, pruned)
+        dst.write_text(ET.tostring(sub_root, encoding="unicode"), encoding="utf-8")
+    drop_refs(root, pruned)
+    out_xml.write_text(ET.tostring(root, encoding="unicode"), encoding="utf-8")
+    return {"pruned_reports": pruned, "captured_reports": captured, "overrides_applied": applied,
+            "overrides_unmapped": unmapped}
@@ -8,9 +8,18 @@ import sys
 import pandas as pd
 
 
-BASE_META = Path("artifacts/golden_java/baseline/meta.json")
-BASE_SER = Path("artifacts/golden_java/baseline/series.csv")
-FRONTIER_SER = Path("artifacts/golden_java/tax_theta1.5/series.csv")
+try:
+    from s120_inequality_innovation.io.catalog import locate
+except ImportError:  # run from a checkout without the package installed
+    def locate(scenario: str, default: Path, **query) -> Path:
+        return default
+
+
+# Newest complete oracle run per scenario from the run catalog, else the fixed golden layout
+BASE_DIR = locate("baseline", Path("artifacts/golden_java/baseline"), kind="oracle")
+BASE_META = BASE_DIR / "meta.json"
+BASE_SER = BASE_DIR / "series.csv"
+FRONTIER_SER = locate("tax_theta1.5", Path("artifacts/golden_java/tax_theta1.5"), kind="oracle") / "series.csv"
 
 
 def guard_no_fallback(meta_path: Path) -> None:
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+"""
+Import-time budget for the package entry points.
+
+Each entry module is imported in a fresh interpreter under ``-X importtime``;
+the check fails if an import takes longer than the budget or pulls in a
+dependency that only specific commands need (pandas, matplotlib, sfctools,
+jpype). Those must be imported inside the functions that use them.
+
+    python scripts/import_budget.py                # table of the costliest modules per entry point
+    python scripts/import_budget.py --budget 0.3 --top 5
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+ENTRY_POINTS = [
+    "s120_inequality_innovation.mc.__main__",
+    "s120_inequality_innovation.mc.runner",
+    "s120_inequality_innovation.mc.slice1_runner",
+    "s120_inequality_innovation.mc.slice2_runner",
+    "s120_inequality_innovation.mc.slice3_runner",
+    "s120_inequality_innovation.mc.ensemble_runner",
+    "s120_inequality_innovation.oracle.cli",
+]
+HEAVY = ("pandas", "matplotlib", "sfctools", "jpype")
+DEFAULT_BUDGET_S = 0.5
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def measure(module: str) -> Tuple[float, Dict[str, float], List[str]]:
+    """(total seconds, {top-level-imported module: cumulative seconds}, heavy modules loaded)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"error: importing {module} failed:\n{proc.stderr[-2000:]}")
+    cumulative: Dict[str, float] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cum, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(cum) / 1e6
+    heavy = sorted({n.split(".")[0] for n in cumulative if n.split(".")[0] in HEAVY})
+    return cumulative.get(module, 0.0), cumulative, heavy
+
+
+def main(argv: List[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Check import time of the package entry points")
+    p.add_argument("modules", nargs="*", default=ENTRY_POINTS)
+    p.add_argument("--budget", type=float, default=DEFAULT_BUDGET_S, help="Seconds allowed per entry point")
+    p.add_argument("--top", type=int, default=8, help="Costliest package/third-party modules to list")
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    a = p.parse_args(argv)
+    failed = False
+    results = {}
+    for mod in a.modules:
+        total, cumulative, heavy = measure(mod)
+        over = total > a.budget
+        failed |= over or bool(heavy)
+        # Only top-level packages and our own modules; stdlib internals are noise here
+        costly = sorted(
+            ((n, s) for n, s in cumulative.items()
+             if n != mod and ("." not in n or n.startswith("s120_inequality_innovation."))),
+            key=lambda kv: -kv[1],
+        )[: a.top]
+        results[mod] = {"seconds": total, "over_budget": over, "heavy": heavy, "top": dict(costly)}
+        if not a.json:
+            flag = "FAIL" if over or heavy else "ok"
+            print(f"{flag:4s} {total:7.3f}s  {mod}" + (f"  (loads {', '.join(heavy)})" if heavy else ""))
+            for n, s in costly:
+                print(f"         {s:7.3f}s  {n}")
+    if a.json:
+        print(json.dumps({"budget_s": a.budget, "results": results}, indent=2, sort_keys=True))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from s120_inequality_innovation.core.agents import (
+    HOUSEHOLD_SCHEMA, AgentStore, AgentTable, InequalityBlock, consume, fire, hire, inequality, pay_deposit_interest, pay_wages,
+)
+from s120_inequality_innovation.core.flowmatrix_glue import fm_assert_ok, fm_new_context, fm_start_period
+from s120_inequality_innovation.core.registry import ParameterRegistry
+
+
+def test_add_remove_keeps_rows_dense_and_ids_stable():
+    t = AgentTable(HOUSEHOLD_SCHEMA, capacity=2)
+    ids = t.add(5, wealth=np.arange(5.0))
+    more = t.add(3, wealth=7.0)
+    assert len(t) == 8 and more.tolist() == [5, 6, 7]
+    assert (t["employer"] == -1).all() and t["wealth"][-1] == 7.0
+    gone = t.remove(t["wealth"] < 2)
+    assert gone.tolist() == [0, 1] and t.ids.tolist() == [2, 3, 4, 5, 6, 7]
+    t.remove(np.array([6]))
+    assert t["wealth"][t.rows([4, 7])].tolist() == [4.0, 7.0]
+    assert t.add(1).tolist() == [8]  # ids are never reused
+    with pytest.raises(KeyError):
+        t.rows([1])
+
+
+def test_masked_view_scatters_writes():
+    t = AgentTable(HOUSEHOLD_SCHEMA)
+    t.add(6, deposits=np.arange(6.0))
+    rich = t.where(t["deposits"] > 3)
+    assert rich.ids.tolist() == [4, 5]
+    rich["deposits"] = rich["deposits"] * 2
+    assert t["deposits"].tolist() == [0, 1, 2, 3, 8, 10]
+
+
+def test_class_steps_conserve_money_and_give_inequality():
+    reg = ParameterRegistry.from_files()
+    store = AgentStore.initial(reg, population={"households": 1000, "cfirms": 20})
+    hh, firms = store.households, store.cfirms
+    rng = np.random.default_rng(1)
+    assert hire(hh, firms, np.full(len(firms), 40), rng) == 800
+    assert firms["employees"].sum() == (hh["employer"] >= 0).sum() == 800
+    every10 = np.arange(len(hh)) % 10 == 0
+    employed = int((hh["employer"][every10] >= 0).sum())
+    assert fire(hh, firms, every10) == employed and (hh["employer"][every10] < 0).all()
+    assert firms["employees"].sum() == 800 - employed
+    hh["wage"] = rng.lognormal(0.0, 0.5, len(hh))
+    banks = store.banks
+    before = hh["deposits"].sum() + firms["deposits"].sum()
+    ctx = fm_new_context("ledger")
+    fm_start_period(ctx, 1)
+    bill = pay_wages(hh, firms, banks, ctx)
+    assert np.isclose(hh["deposits"].sum() + firms["deposits"].sum(), before)
+    assert np.isclose(bill, hh["income"].sum())
+    spent = consume(hh, firms, 50.0, banks, ctx)
+    assert np.isclose(spent, 50.0) and np.isclose(hh["deposits"].sum() + firms["deposits"].sum(), before)
+    capital = banks["capital"].sum()
+    paid = pay_deposit_interest(hh, banks, 0.01, ctx).sum()
+    # Interest is the banks' expense, and their deposit book matches their customers'
+    assert np.isclose(banks["capital"].sum(), capital - paid)
+    assert np.isclose(banks["deposits"].sum(), hh["deposits"].sum() + firms["deposits"].sum())
+    fm_assert_ok(ctx)
+    m = inequality(hh)
+    assert 0.2 < m["Gini_income"] < 1.0 and 0.0 < m["Gini_wealth"] < m["Gini_income"]
+    assert set(m) == {"Gini_income", "Gini_wealth", "Top10_income", "Top10_wealth"}
+
+
+def test_inequality_block_matches_per_period_snapshots():
+    t = AgentTable(HOUSEHOLD_SCHEMA)
+    t.add(300)
+    rng = np.random.default_rng(2)
+    block, expected, rows = InequalityBlock(len(t), block=4), [], []
+    for period in range(1, 11):
+        t["income"] = rng.lognormal(0.0, 0.6, len(t))
+        t["wealth"] = rng.pareto(2.0, len(t))
+        m = inequality(t)
+        expected.append((period, m["Gini_income"], m["Gini_wealth"], m["Top10_income"], m["Top10_wealth"]))
+        if block.add(period, t):
+            rows += block.flush()
+    rows += block.flush()
+    assert [r[0] for r in rows] == list(range(1, 11))
+    np.testing.assert_allclose(np.array(rows), np.array(expected), rtol=1e-12)
+    with pytest.raises(ValueError, match="300 households"):
+        block.add(11, AgentTable(HOUSEHOLD_SCHEMA))
+
+
+def test_initial_store_has_paper_population():
+    reg = ParameterRegistry.from_files()
+    store = AgentStore.initial(reg)
+    assert {c: len(t) for c, t in store} == {"households": 8000, "cfirms": 200, "kfirms": 50, "banks": 10}
+    assert np.isin(store.cfirms["bank"], store.banks.ids).all()
+    assert np.isclose(store.households["deposits"].sum(), 100.0)
+    a, b = AgentStore.initial(reg, seed=7), AgentStore.initial(reg, seed=7)
+    np.testing.assert_array_equal(a.cfirms["bank"], b.cfirms["bank"])
+    assert not np.array_equal(a.cfirms["bank"], AgentStore.initial(reg, seed=8).cfirms["bank"])
+
+
+def test_slice2_household_path_keeps_series_and_resumes(tmp_path):
+    import pandas as pd
+
+    from s120_inequality_innovation.core.checkpoint import Checkpoint
+    from s120_inequality_innovation.core.slice2_engine import run_slice2
+
+    reg = ParameterRegistry.from_files()
+    plain, _, _ = run_slice2(reg, horizon=60, outdir=tmp_path / "plain", seed=4)
+    full, _, _ = run_slice2(reg, horizon=60, outdir=tmp_path / "full", seed=4, households=400)
+    assert pd.read_csv(full).equals(pd.read_csv(plain))
+    ineq = pd.read_csv(tmp_path / "full" / "inequality.csv")
+    assert len(ineq) == 60 and ineq["Gini_income"].between(-1e-12, 1).all() and ineq["Gini_income"].iloc[-1] > 0
+    run_slice2(reg, horizon=35, outdir=tmp_path / "part", seed=4, households=400, checkpoint_every=10)
+    # Each checkpoint names its own store; superseded stores are removed
+    assert Checkpoint.load(tmp_path / "part").extras["agents"] == "agents_t30.npz"
+    assert sorted(p.name for p in (tmp_path / "part").glob("agents_*")) == ["agents_t30.npz"]
+    # A store written by a checkpoint that never completed is not picked up
+    AgentStore.initial(reg, population={"households": 400}).save(tmp_path / "part" / "agents_t40.npz")
+    run_slice2(reg, horizon=60, outdir=tmp_path / "part", seed=4, households=400, resume_from=tmp_path / "part")
+    assert pd.read_csv(tmp_path / "part" / "inequality.csv").equals(ineq)
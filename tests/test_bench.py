@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import json
+
+from s120_inequality_innovation.bench.__main__ import compare, main
+from s120_inequality_innovation.bench.suite import BenchConfig, run_case
+
+
+def _result(rate, rss=50.0, written=1000):
+    return {"unit": "periods", "rate": rate, "peak_rss_mb": rss, "bytes_written": written}
+
+
+def test_run_case_reports_rate_rss_and_bytes():
+    res = run_case("slice1", BenchConfig(horizon=20, mc=1))
+    assert res["count"] == 20
+    assert res["rate"] > 0
+    assert res["peak_rss_mb"] > 0
+    assert res["bytes_written"] > 0
+
+
+def test_compare_flags_regressions_beyond_threshold(tmp_path):
+    meta = {"config": {"horizon": 10}}
+    base = {"meta": meta, "results": {"a": _result(100.0), "b": _result(100.0), "c": _result(100.0)}}
+    cur = {"meta": meta, "results": {"a": _result(90.0), "b": _result(70.0), "c": _result(100.0, rss=60.0)}}
+    regs = compare(cur, base, threshold=0.15)
+    assert len(regs) == 2
+    assert any(" b " in r and "rate" in r for r in regs)
+    assert any(" c " in r and "peak_rss_mb" in r for r in regs)
+
+    (tmp_path / "base.json").write_text(json.dumps(base))
+    (tmp_path / "cur.json").write_text(json.dumps(cur))
+    args = ["compare", str(tmp_path / "cur.json"), "--baseline", str(tmp_path / "base.json")]
+    assert main(args) == 1
+    assert main(args + ["--threshold", "0.5"]) == 0
@@ -0,0 +1,59 @@
+import json
+import os
+from pathlib import Path
+
+from s120_inequality_innovation.io import catalog
+from s120_inequality_innovation.io.catalog import Catalog, locate, main
+from s120_inequality_innovation.mc.runner import ENGINE_VERSION, run_baseline_smoke
+
+
+def test_runner_records_runs_and_queries_are_indexed(tmp_path: Path, capsys, monkeypatch):
+    monkeypatch.setenv("S120_CATALOG", str(tmp_path / "catalog.sqlite"))
+    runs = run_baseline_smoke(tmp_path / "baseline", overrides={"meta": {"horizon": 10, "mc_runs": 3}}, jobs=2)
+    with Catalog(Path(os.environ["S120_CATALOG"])) as cat:
+        recs = cat.find(scenario="baseline", status="complete", under=tmp_path)
+        assert sorted(r.path for r in recs) == sorted(p.resolve() for p in runs)
+        meta = json.loads((runs[1] / "meta.json").read_text(encoding="utf-8"))
+        hit = cat.find(config_hash=meta["config_hash"], seeds=meta["seeds"], run_id=2, under=tmp_path)
+        assert [r.path for r in hit] == [runs[1].resolve()]
+        assert hit[0].engine_version == ENGINE_VERSION and hit[0].horizon == 10
+        assert hit[0].file("series").exists()
+        plan = " ".join(str(r[-1]) for r in cat._con.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM runs WHERE config_hash=? AND seeds_hash=?", ("a", "b")))
+        assert "INDEX runs_config" in plan
+    assert locate("baseline", tmp_path / "missing") in {p.resolve() for p in runs}
+    assert locate("nope", tmp_path / "missing") == tmp_path / "missing"
+
+    assert main(["find", "--scenario", "baseline", "--run-id", "3"]) == 0
+    assert str(runs[2].resolve()) in capsys.readouterr().out
+
+
+def test_rebuild_indexes_existing_meta_files(tmp_path: Path):
+    run = tmp_path / "golden" / "tax_theta1.5"
+    run.mkdir(parents=True)
+    (run / "meta.json").write_text(json.dumps({"scenario": "tax_theta1.5", "seed": 7, "java_run_ok": False}))
+    (run / "series.csv").write_text("t\n")
+    with Catalog(tmp_path / "cat.sqlite") as cat:
+        assert cat.index_tree(tmp_path / "golden") == 1
+        (rec,) = cat.find(seed=7)
+        assert (rec.scenario, rec.status, rec.files["series"]) == ("tax_theta1.5", "failed", "series.csv")
+        (run / "meta.json").unlink()
+        (run / "series.csv").unlink()
+        run.rmdir()
+        assert cat.prune_missing() == 1 and cat.find() == []
+
+
+def test_recording_is_opt_in_and_reuses_one_connection(tmp_path: Path, monkeypatch):
+    monkeypatch.delenv("S120_CATALOG", raising=False)
+    assert catalog.catalog_path() is None and catalog.catalog_path(reading=True) == catalog.DEFAULT_CATALOG
+    catalog.record_run(tmp_path / "a", {"seed": 1}, "running")
+    assert not any(k[1] == str(catalog.DEFAULT_CATALOG) for k in catalog._SHARED)
+    monkeypatch.setenv("S120_CATALOG", "on")
+    assert catalog.catalog_path() == catalog.DEFAULT_CATALOG and catalog.DEFAULT_CATALOG.is_absolute()
+    monkeypatch.setenv("S120_CATALOG", str(tmp_path / "cat.sqlite"))
+    for i in range(3):
+        catalog.record_run(tmp_path / f"run_{i:03d}", {"seed": i}, "running")
+    catalog.set_run_status(tmp_path / "run_001", "complete")
+    shared = catalog._shared()
+    assert shared is catalog._shared()
+    assert len(shared.find(under=tmp_path)) == 3 and shared.counts() == {"running": 2, "complete": 1}
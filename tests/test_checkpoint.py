@@ -0,0 +1,60 @@
+from pathlib import Path
+
+from s120_inequality_innovation.core.registry import ParameterRegistry
+from s120_inequality_innovation.core.slice2_engine import run_slice2
+from s120_inequality_innovation.core.slice3_engine import run_slice3
+from s120_inequality_innovation.mc.runner import run_baseline_smoke
+
+
+def test_slice_resume_is_bit_for_bit(tmp_path: Path):
+    reg = ParameterRegistry.from_files()
+    full = run_slice2(reg, horizon=240, outdir=tmp_path / "full", seed=9)
+    # "Crash" after t=150, then resume the same directory to the full horizon
+    run_slice2(reg, horizon=160, outdir=tmp_path / "part", seed=9, checkpoint_every=50)
+    part = run_slice2(reg, horizon=240, outdir=tmp_path / "part", seed=9, resume_from=tmp_path / "part")
+    for a, b in zip(full, part):
+        assert a.read_bytes() == b.read_bytes()
+
+    run_slice3(reg, horizon=120, outdir=tmp_path / "s3_full")
+    run_slice3(reg, horizon=70, outdir=tmp_path / "s3_a", checkpoint_every=30)
+    run_slice3(reg, horizon=120, outdir=tmp_path / "s3_b", resume_from=tmp_path / "s3_a" / "checkpoint.json")
+    for name in ["series.csv", "events.csv", "notes_gov_identity.csv"]:
+        assert (tmp_path / "s3_full" / name).read_bytes() == (tmp_path / "s3_b" / name).read_bytes()
+
+
+def test_mc_resume_matches_uninterrupted(tmp_path: Path):
+    full = {"meta": {"horizon": 30, "mc_runs": 2}}
+    short = {"meta": {"horizon": 25, "mc_runs": 2}}
+    run_baseline_smoke(tmp_path / "full", overrides=full)
+    run_baseline_smoke(tmp_path / "part", overrides=short, checkpoint_every=10)
+    run_baseline_smoke(tmp_path / "part", overrides=full, resume_from=tmp_path / "part")
+    for run in ["run_001", "run_002"]:
+        a = (tmp_path / "full" / run / "series.csv").read_bytes()
+        assert a == (tmp_path / "part" / run / "series.csv").read_bytes()
+    assert (tmp_path / "full" / "summary_mc.csv").read_bytes() == (tmp_path / "part" / "summary_mc.csv").read_bytes()
+
+
+def test_fork_from_burn_in_records_fork_point(tmp_path: Path):
+    import json
+
+    full = {"meta": {"horizon": 30, "mc_runs": 2}}
+    run_baseline_smoke(tmp_path / "cold", overrides=full)
+    run_baseline_smoke(tmp_path / "burn", overrides={"meta": {"horizon": 12, "mc_runs": 2}}, checkpoint_every=12)
+    run_baseline_smoke(tmp_path / "warm", overrides=full, resume_from=tmp_path / "burn")
+    for run in ["run_001", "run_002"]:
+        assert (tmp_path / "cold" / run / "series.csv").read_bytes() == (tmp_path / "warm" / run / "series.csv").read_bytes()
+        assert json.loads((tmp_path / "warm" / run / "meta.json").read_text())["fork_t"] == 12
+
+
+def test_burn_in_fork_respects_each_scenarios_window(tmp_path: Path, monkeypatch):
+    import pytest
+
+    from s120_inequality_innovation.mc import sweeps
+
+    calls = []
+    monkeypatch.setattr(sweeps, "_run_scenario", lambda *a, **k: calls.append(a[1]))
+    late = {"meta": {"eval_window_start": 700}}
+    assert sweeps._burn_in(tmp_path, 600, scenarios=[late]) == tmp_path / "burnin_t600"
+    assert calls == [{"meta": {"horizon": 600}}]
+    with pytest.raises(ValueError, match=r"\[1, 99\]"):
+        sweeps._burn_in(tmp_path, 150, scenarios=[late, {"meta": {"eval_window_start": 99}}])
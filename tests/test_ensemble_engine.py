@@ -0,0 +1,26 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from s120_inequality_innovation.core.registry import ParameterRegistry
+from s120_inequality_innovation.core.ensemble_engine import run_slice1_ensemble, run_slice2_ensemble
+from s120_inequality_innovation.core.slice1_engine import run_slice1
+from s120_inequality_innovation.core.slice2_engine import run_slice2
+
+
+def test_ensemble_matches_scalar_engines(tmp_path: Path):
+    reg = ParameterRegistry.from_files()
+    s1, _ = run_slice1(reg, horizon=40, outdir=tmp_path / "s1")
+    e1 = run_slice1_ensemble(reg, horizon=40, outdir=tmp_path / "e1", n_runs=3)
+    ref = pd.read_csv(s1)
+    for p in e1:
+        np.testing.assert_allclose(pd.read_csv(p).to_numpy(), ref.to_numpy(), rtol=1e-12)
+
+    seeds = [123, 7, 2024]
+    e2 = run_slice2_ensemble(reg, horizon=200, outdir=tmp_path / "e2", seeds=seeds)
+    for seed, p in zip(seeds, e2):
+        s2, _, d2 = run_slice2(reg, horizon=200, outdir=tmp_path / f"s2_{seed}", seed=seed)
+        np.testing.assert_allclose(pd.read_csv(p).to_numpy(), pd.read_csv(s2).to_numpy(), rtol=1e-12)
+        diag = pd.read_csv(p.parent / "diag_innovation.csv")
+        assert diag.equals(pd.read_csv(d2))
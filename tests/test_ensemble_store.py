@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from s120_inequality_innovation.io.ensemble_store import EnsembleStore
+from s120_inequality_innovation.mc.runner import run_baseline_smoke
+
+
+def test_store_matches_series_and_slices_by_metric(tmp_path: Path):
+    runs = run_baseline_smoke(tmp_path, overrides={"meta": {"horizon": 30, "mc_runs": 3}})
+    store = EnsembleStore.open(tmp_path)
+    assert store[:, 10:21, "GDP"].shape == (3, 11)
+    for i, rd in enumerate(runs):
+        df = pd.read_csv(rd / "series.csv", float_precision="round_trip")
+        for m in store.metrics:
+            np.testing.assert_allclose(store[i, 1:31, m], df[m].to_numpy(), rtol=1e-12)
+    assert list(store.progress) == [30, 30, 30]
+    assert np.isnan(store[:, 0]).all()
+    summary = pd.read_csv(tmp_path / "summary_mc.csv")
+    np.testing.assert_allclose(summary["GDP_end"], store[:, 30, "GDP"])
+
+
+def test_store_is_enlarged_and_continued_on_resume(tmp_path: Path):
+    full = {"meta": {"horizon": 40, "mc_runs": 2}}
+    run_baseline_smoke(tmp_path / "full", overrides=full)
+    run_baseline_smoke(tmp_path / "part", overrides={"meta": {"horizon": 25, "mc_runs": 2}}, checkpoint_every=20)
+    run_baseline_smoke(tmp_path / "part", overrides=full, resume_from=tmp_path / "part")
+    a, b = EnsembleStore.open(tmp_path / "full"), EnsembleStore.open(tmp_path / "part")
+    assert b.data.shape == a.data.shape
+    np.testing.assert_array_equal(a[:, 1:], b[:, 1:])
+    np.testing.assert_array_equal(a.last(), b.last())
+
+
+def test_store_from_other_runs_is_replaced(tmp_path: Path):
+    old = EnsembleStore.ensure(tmp_path, ["GDP"], 2, 5, seeds={"rng_model": 1}, config_hash="a", model_hash="m")
+    old.append(0, 5, [1.0])
+    old.flush()
+    del old
+    same = EnsembleStore.ensure(tmp_path, ["GDP"], 2, 8, seeds={"rng_model": 1}, config_hash="b", model_hash="m")
+    assert list(same.progress) == [5, 0] and same.meta["config_hash"] == "b"
+    del same
+    for seeds, config, model in [({"rng_model": 2}, "b", "m"), ({"rng_model": 1}, "c", "n")]:
+        new = EnsembleStore.ensure(tmp_path, ["GDP"], 2, 8, seeds=seeds, config_hash=config, model_hash=model)
+        assert list(new.progress) == [0, 0] and np.isnan(new[:, 5, "GDP"]).all()
+        assert new.meta["seeds"] == seeds and new.meta["config_hash"] == config
+        new.append(0, 5, [1.0])
+        new.flush()
+        del new
@@ -17,3 +17,46 @@ def test_flowmatrix_consistency(tmp_path: Path):
         assert float(r) <= 1e-10
         assert float(c) <= 1e-10
 
+
+
+def test_flow_ledger_detects_unbalanced_column():
+    import pytest
+    from sfctools.core.flow_matrix import Accounts
+    from s120_inequality_innovation.core.flowmatrix_glue import fm_new_context, fm_start_period, fm_assert_ok
+
+    ctx = fm_new_context("ledger")
+    fm_start_period(ctx, 1)
+    ctx.fm.log_flow((Accounts.CA, Accounts.CA), 5.0, "HH", "FirmC", "consumption")
+    ctx.fm.log_flow((Accounts.KA, Accounts.KA), 5.0, "FirmC", "HH", "consumption")
+    fm_assert_ok(ctx)
+    assert ctx.last_residuals == (0.0, 0.0)
+    ctx.fm.log_flow((Accounts.CA, Accounts.CA), 2.0, "FirmC", "HH", "wages")
+    with pytest.raises(RuntimeError):
+        fm_assert_ok(ctx)
+    fm_start_period(ctx, 2)
+    fm_assert_ok(ctx)
+
+
+def test_flow_ledger_detects_unbalanced_row():
+    import pytest
+    from sfctools.core.flow_matrix import Accounts
+    from s120_inequality_innovation.core.flowmatrix_glue import fm_new_context, fm_start_period, fm_assert_ok
+
+    ctx = fm_new_context("ledger")
+    fm_start_period(ctx, 1)
+    # CA leg out of FirmC, KA leg into FirmC: the column nets to zero but neither row closes
+    ctx.fm.log_flow((Accounts.CA, Accounts.KA), 3.0, "FirmC", "FirmC", "investment")
+    with pytest.raises(RuntimeError, match="Inconsistent Row"):
+        fm_assert_ok(ctx)
+    fm_start_period(ctx, 2)
+    ctx.fm.log_flow((Accounts.CA, Accounts.KA), 3.0, "FirmC", "HH", "investment")
+    ctx.fm.log_flow((Accounts.KA, Accounts.CA), 3.0, "HH", "FirmC", "investment")
+    fm_assert_ok(ctx)
+    assert ctx.last_residuals == (0.0, 0.0)
+
+
+def test_sfctools_backend_still_available(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("S120_FM_BACKEND", "sfctools")
+    reg = ParameterRegistry.from_files()
+    res = run_simulation(reg, horizon=2, artifacts_dir=tmp_path)
+    assert len(res.fm_residuals_csv.read_text(encoding="utf-8").strip().splitlines()) == 1 + 2 * 5
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from s120_inequality_innovation.core.flowmatrix_glue import (
+    LedgerAccounts as A, VerifyPolicy, fm_assert_ok, fm_end_period, fm_new_context, fm_start_period,
+)
+from s120_inequality_innovation.core.registry import ParameterRegistry
+from s120_inequality_innovation.core.slice3_engine import run_slice3
+from s120_inequality_innovation.io.sinks import load_columns
+
+
+def _period(ctx, t, leak_at=None):
+    """Balanced flows with cut-points 3 and 12; ``leak_at`` adds a one-sided flow before that cut-point."""
+    fm_start_period(ctx, t)
+    for step in (3, 12):
+        ctx.fm.log_flow((A.CA, A.CA), 5.0, "HH", "FirmC", "consumption")
+        ctx.fm.log_flow((A.KA, A.KA), 5.0, "FirmC", "HH", "consumption")
+        if step == leak_at:
+            ctx.fm.log_flow((A.CA, A.CA), 2.0, "FirmC", "HH", "wages")
+        fm_assert_ok(ctx, step)
+    fm_end_period(ctx)
+
+
+@pytest.mark.parametrize("mode", ["end-of-period", "every:2", "checksum"])
+def test_policies_leave_results_unchanged(tmp_path: Path, monkeypatch, mode):
+    reg = ParameterRegistry.from_files()
+    run_slice3(reg, horizon=30, outdir=tmp_path / "strict")
+    monkeypatch.setenv("S120_FM_VERIFY", mode)
+    run_slice3(reg, horizon=30, outdir=tmp_path / "deferred")
+    for stem in ("series", "events"):
+        a, b = load_columns(tmp_path / "strict" / stem), load_columns(tmp_path / "deferred" / stem)
+        for k in a:
+            np.testing.assert_array_equal(a[k], b[k])
+
+
+@pytest.mark.parametrize("mode", ["end-of-period", "checksum+journal"])
+def test_deferred_failure_is_located_by_replay(mode):
+    ctx = fm_new_context("ledger", verify=mode)
+    _period(ctx, 1)
+    with pytest.raises(RuntimeError, match=r"period 2: Inconsistent Column.*first failing check: step 12"):
+        _period(ctx, 2, leak_at=12)
+
+
+def test_checksum_keeps_no_journal_and_checks_rows():
+    ctx = fm_new_context("ledger", verify="checksum")
+    _period(ctx, 1)
+    assert ctx.fm.journal is None
+    with pytest.raises(RuntimeError, match=r"period 2: Inconsistent Column checksum"):
+        _period(ctx, 2, leak_at=12)
+    fm_start_period(ctx, 3)
+    ctx.fm.log_flow((A.CA, A.KA), 3.0, "FirmC", "FirmC", "investment")
+    with pytest.raises(RuntimeError, match=r"period 3: Inconsistent Row checksum"):
+        fm_end_period(ctx)
+
+
+def test_every_k_only_verifies_sampled_periods():
+    ctx = fm_new_context("ledger", verify="every:2")
+    _period(ctx, 1, leak_at=3)
+    with pytest.raises(RuntimeError, match="step 3"):
+        _period(ctx, 2, leak_at=3)
+
+
+@pytest.mark.parametrize("mode", ["end-of-period", "every:2", "checksum"])
+def test_residuals_are_never_carried_into_a_new_period(mode):
+    strict = fm_new_context("ledger", verify="strict")
+    _period(strict, 1)
+    assert strict.last_residuals == (0.0, 0.0) and strict.last_checked == (1, 12)
+    fm_start_period(strict, 2)
+    assert strict.last_residuals is None and strict.last_checked is None
+    ctx = fm_new_context("ledger", verify=mode)
+    ctx.last_residuals, ctx.last_checked = (9.0, 9.0), (0, 3)
+    _period(ctx, 1)
+    assert ctx.last_residuals is None and ctx.last_checked is None
+
+
+def test_parse_policy():
+    assert VerifyPolicy.parse(None).strict
+    assert VerifyPolicy.parse("every_5") == VerifyPolicy("every", 5)
+    assert VerifyPolicy.parse("END_OF_PERIOD").mode == "end-of-period"
+    assert VerifyPolicy.parse("checksum+journal") == VerifyPolicy("checksum", journal=True)
+    for bad in ("every:0", "every", "sometimes"):
+        with pytest.raises(ValueError):
+            VerifyPolicy.parse(bad)
@@ -0,0 +1,18 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_entry_points_do_not_import_heavy_dependencies():
+    # Generous time budget: this guards the lazy imports, timing is checked by `make import-budget`
+    proc = subprocess.run(
+        [sys.executable, str(ROOT / "scripts" / "import_budget.py"), "--json", "--budget", "10", "--top", "0"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    res = json.loads(proc.stdout)["results"]
+    assert {m: r["heavy"] for m, r in res.items() if r["heavy"]} == {}
+    assert proc.returncode == 0
@@ -0,0 +1,37 @@
+import numpy as np
+
+from s120_inequality_innovation.io.metrics import compute_inequality_df, gini, lorenz_curve, top_share
+
+
+def _gini_ref(x):
+    x = np.sort(np.asarray(x, dtype=float))
+    cumx = np.cumsum(x)
+    return (x.size + 1 - 2 * (cumx.sum() / cumx[-1])) / x.size
+
+
+def test_batched_metrics_match_per_row():
+    x = np.random.default_rng(5).lognormal(0.0, 1.0, size=(3, 40, 50))
+    g = gini(x)
+    assert g.shape == (3, 40)
+    np.testing.assert_allclose(g[1, 7], _gini_ref(x[1, 7]), rtol=1e-12)
+    assert isinstance(gini(x[0, 0]), float)
+    assert abs(top_share(x[2, 3], 0.1) - np.sort(x[2, 3])[-5:].sum() / x[2, 3].sum()) < 1e-9
+    p, L = lorenz_curve(x)
+    assert p.shape == (51,) and L.shape == (3, 40, 51)
+    np.testing.assert_allclose(L[..., -1], 1.0)
+    assert gini([0.0, 0.0]) == 0.0 and np.isnan(gini([]))
+
+
+def test_integer_weights_equal_replication():
+    rng = np.random.default_rng(8)
+    x = rng.lognormal(size=(6, 10))
+    w = np.full(10, 2.0)
+    dup = np.repeat(x, 2, axis=-1)
+    np.testing.assert_allclose(gini(x, weights=w), gini(dup), rtol=1e-12)
+    np.testing.assert_allclose(top_share(x, 0.1, weights=w), top_share(dup, 0.1), rtol=1e-9)
+    df = compute_inequality_df(x, x * 3)
+    # The table keeps its original two columns unless top shares are asked for
+    assert list(df.columns) == ["Gini_income", "Gini_wealth"] and len(df) == 6
+    full = compute_inequality_df(x, x * 3, top_shares=True)
+    assert list(full.columns) == ["Gini_income", "Gini_wealth", "Top10_income", "Top10_wealth"]
+    assert full[["Gini_income", "Gini_wealth"]].equals(df)
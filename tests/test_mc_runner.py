@@ -0,0 +1,16 @@
+from pathlib import Path
+
+from s120_inequality_innovation.mc.runner import run_baseline_smoke
+
+
+def test_baseline_smoke_identical_across_jobs(tmp_path: Path):
+    overrides = {"meta": {"horizon": 20, "mc_runs": 4}}
+    serial = run_baseline_smoke(tmp_path / "serial", overrides=overrides, jobs=1)
+    pooled = run_baseline_smoke(tmp_path / "pooled", overrides=overrides, jobs=3)
+    assert [p.name for p in serial] == [p.name for p in pooled]
+    for a, b in zip(serial, pooled):
+        assert (a / "series.csv").read_bytes() == (b / "series.csv").read_bytes()
+    s = (tmp_path / "serial" / "summary_mc.csv").read_bytes()
+    assert s == (tmp_path / "pooled" / "summary_mc.csv").read_bytes()
+    # Runs draw from distinct spawned streams
+    assert (serial[0] / "series.csv").read_bytes() != (serial[1] / "series.csv").read_bytes()
@@ -0,0 +1,41 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from s120_inequality_innovation.io.online_stats import WindowStats, pool
+from s120_inequality_innovation.mc.runner import run_baseline_smoke
+
+
+def test_window_stats_match_batch_estimates():
+    x = np.random.default_rng(3).normal(50.0, 2.0, size=(200, 2)).cumsum(axis=0)
+    ws = WindowStats(["a", "b"], 21, 180)
+    for t, row in enumerate(x, start=1):
+        ws.update(t, row)
+    w = x[20:180]
+    assert ws.n == len(w)
+    np.testing.assert_allclose(ws.mean, w.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(ws.var, w.var(axis=0, ddof=1), rtol=1e-10)
+    np.testing.assert_array_equal(ws.min, w.min(axis=0))
+    np.testing.assert_array_equal(ws.max, w.max(axis=0))
+    d = w - w.mean(axis=0)
+    np.testing.assert_allclose(ws.autocov1, (d[1:] * d[:-1]).sum(axis=0) / len(w), rtol=1e-8)
+
+    pooled = pool([ws, WindowStats.from_dict(ws.to_dict())])
+    assert pooled["a"]["n_runs"] == 2
+    np.testing.assert_allclose(pooled["a"]["var"], np.concatenate([w[:, 0], w[:, 0]]).var(ddof=1), rtol=1e-10)
+
+
+def test_runner_stats_agree_with_series_and_survive_resume(tmp_path: Path):
+    full = {"meta": {"horizon": 40, "mc_runs": 2, "eval_window_start": 10, "eval_window_end": 40}}
+    short = {"meta": {"horizon": 25, "mc_runs": 2, "eval_window_start": 10, "eval_window_end": 40}}
+    run_baseline_smoke(tmp_path / "full", overrides=full)
+    run_baseline_smoke(tmp_path / "part", overrides=short, checkpoint_every=20)
+    run_baseline_smoke(tmp_path / "part", overrides=full, resume_from=tmp_path / "part")
+    for run in ["run_001", "run_002"]:
+        ws = WindowStats.load(tmp_path / "full" / run)
+        df = pd.read_csv(tmp_path / "full" / run / "series.csv", float_precision="round_trip")
+        expect = df[df["t"] >= 11].drop(columns="t").mean()
+        for m, v in ws.means().items():
+            assert abs(v - expect[m]) <= 1e-12 * max(1.0, abs(expect[m]))
+        assert WindowStats.load(tmp_path / "part" / run).to_dict() == ws.to_dict()
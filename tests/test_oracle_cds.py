@@ -0,0 +1,29 @@
+import os
+from pathlib import Path
+
+from s120_inequality_innovation.oracle.cds import archive_args
+
+
+def test_cds_archive_is_created_reused_and_invalidated(tmp_path: Path):
+    lib = tmp_path / "lib"
+    lib.mkdir()
+    (lib / "a.jar").write_bytes(b"a")
+    (lib / "b.jar").write_bytes(b"b")
+    cp = f"{lib}/*"
+    root = tmp_path / "cds"
+    args, mode, archive = archive_args(cp, root=root)
+    assert mode == "create" and args == [f"-XX:ArchiveClassesAtExit={archive}"]
+    # A concurrent JVM does not race the dump
+    assert archive_args(cp, root=root)[1].startswith("off:")
+    archive.write_bytes(b"jsa")  # what the first JVM leaves at exit
+    args, mode, same = archive_args(cp, root=root)
+    assert mode == "use" and same == archive and f"-XX:SharedArchiveFile={archive}" in args
+    # Rebuilding a jar selects a new archive and drops the stale one
+    (lib / "b.jar").write_bytes(b"bb")
+    _, mode, fresh = archive_args(cp, root=root)
+    assert mode == "create" and fresh != archive and not archive.exists()
+    # Loose class directories cannot be archived
+    classes = tmp_path / "classes"
+    classes.mkdir()
+    (classes / "X.class").write_bytes(b"")
+    assert archive_args(f"{classes}{os.pathsep}{cp}", root=root)[1].startswith("off:")
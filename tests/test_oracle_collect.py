@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from s120_inequality_innovation.oracle import raw_collect
+from s120_inequality_innovation.oracle.cli import _collect_from_raw_dir
+
+
+def _write_raw(d: Path):
+    t = np.arange(1, 11)
+    pd.DataFrame({"t": t, "v": 100.0 + t}).to_csv(d / "data_nominalGDP.csv", index=False)
+    pd.DataFrame({"t": t, "v": 0.05 + 0 * t}).to_csv(d / "data_unemployment.csv", index=False)
+    pd.DataFrame({"t": t, "v": 40.0 + t}).to_csv(d / "data_workersNominalConsumption.csv", index=False)
+    pd.DataFrame({"t": t, "v": 10.0 + 0 * t}).to_csv(d / "data_managersNominalConsumption.csv", index=False)
+    pd.DataFrame({"t": t, "v": 1.01 ** t}).to_csv(d / "data_cAvPrice.csv", index=False)
+    pd.DataFrame({"t": t, "f1": 1.0 * t, "f2": 3.0 * t}).to_csv(d / "data_cProductivity.csv", index=False)
+    pd.DataFrame({"t": t, "v": 50.0 + 0 * t}).to_csv(d / "data_cFirmsAggregateDebt.csv", index=False)
+    # Headerless two-column report
+    (d / "data_nominalInvestment.csv").write_text("".join(f"{i},{5.0 * i}\n" for i in t))
+
+
+def test_collect_indexes_once_and_reuses_parsed_cache(tmp_path: Path, monkeypatch):
+    _write_raw(tmp_path)
+    df, used = _collect_from_raw_dir(tmp_path)
+    assert list(df["t"]) == list(range(1, 11))
+    assert df["CONS"].iloc[0] == 51.0 and df["INV"].iloc[2] == 15.0
+    np.testing.assert_allclose(df["PROD_C"], 2.0 * np.arange(1, 11))
+    assert np.isnan(df["INFL"].iloc[0]) and abs(df["INFL"].iloc[1] - 0.01) < 1e-12
+    np.testing.assert_allclose(df["Debt_GDP"], 50.0 / (100.0 + np.arange(1, 11)))
+    assert used[0] == "data_nominalGDP.csv" and len(used) == 8
+
+    def boom(path):
+        raise AssertionError(f"re-parsed {path}")
+
+    monkeypatch.setitem(raw_collect._PARSERS, "first", boom)
+    monkeypatch.setitem(raw_collect._PARSERS, "rowmean", boom)
+    again, used_again = _collect_from_raw_dir(tmp_path)
+    pd.testing.assert_frame_equal(df, again)
+    assert used_again == used
+    # A rewritten file (new size/mtime) is parsed again
+    monkeypatch.undo()
+    pd.DataFrame({"t": np.arange(1, 11), "v": 200.0}).to_csv(tmp_path / "data_nominalGDP.csv", index=False)
+    assert _collect_from_raw_dir(tmp_path)[0]["GDP"].iloc[0] == 200.0
+
+
+def test_in_memory_reports_match_raw_csv_collection(tmp_path: Path):
+    from s120_inequality_innovation.oracle.cli import _collect_from_arrays
+
+    _write_raw(tmp_path)
+    from_disk, _ = _collect_from_raw_dir(tmp_path, use_cache=False)
+    reports = {}
+    for f in sorted(tmp_path.glob("*.csv")):
+        header = None if f.name == "data_nominalInvestment.csv" else 0
+        reports[f.stem] = pd.read_csv(f, header=header).to_numpy()[:, 1:].squeeze()
+    from_memory, used = _collect_from_arrays(reports)
+    pd.testing.assert_frame_equal(from_disk, from_memory, check_index_type=False)
+    assert used[0] == "memory:data_nominalGDP"
+
+
+def test_capture_scratch_dir_is_removed_when_collection_fails(tmp_path: Path, monkeypatch):
+    from s120_inequality_innovation.oracle import cli
+
+    made = []
+    real_mkdtemp = cli.tempfile.mkdtemp
+
+    def mkdtemp(prefix="", dir=None):
+        made.append(Path(real_mkdtemp(prefix=prefix, dir=tmp_path)))
+        return str(made[-1])
+
+    def boom(*args, **kwargs):
+        raise RuntimeError("collection failed")
+
+    monkeypatch.setattr(cli.tempfile, "mkdtemp", mkdtemp)
+    monkeypatch.setattr(cli, "_collect_and_write_canonical", boom)
+    monkeypatch.delenv("S120_ORACLE_XML", raising=False)
+    monkeypatch.setattr(cli, "_resolve_xml", lambda scenario: None)
+    spec = cli.OracleRunSpec(name="baseline", overrides={})
+    with pytest.raises(RuntimeError, match="collection failed"):
+        cli.run_oracle_scenario(spec, tmp_path / "out", classpath="", capture=True)
+    assert len(made) == 1 and not made[0].exists()
@@ -0,0 +1,37 @@
+import json
+from pathlib import Path
+
+from s120_inequality_innovation.oracle.cli import OracleRunSpec
+from s120_inequality_innovation.oracle.pool import OracleExecutor, ensemble_jobs
+
+
+def test_executor_writes_golden_layout_per_seed(tmp_path: Path, monkeypatch):
+    # No oracle installed: each job still writes meta.json and the canonical series skeleton
+    for var in ["S120_ORACLE_CLASSPATH", "S120_ORACLE_XML", "S120_ALLOW_FALLBACK"]:
+        monkeypatch.delenv(var, raising=False)
+    specs = [OracleRunSpec("baseline", overrides={}), OracleRunSpec("wage_tu4", overrides={"wage_rigidity": {"tu": 4}})]
+    jobs = ensemble_jobs(specs, tmp_path, seeds=[11, 12])
+    with OracleExecutor(2) as ex:
+        out = ex.map(jobs)
+    assert out == [j.outdir / "series.csv" for j in jobs]
+    meta = json.loads((tmp_path / "wage_tu4" / "run_002" / "meta.json").read_text())
+    assert meta["seed"] == 12 and meta["tu"] == 4 and meta["java_run_ok"] is False
+    assert ensemble_jobs(specs[:1], tmp_path, seeds=[5])[0].outdir == tmp_path / "baseline"
+
+
+def test_worker_reports_jvm_start_failure_without_retrying(tmp_path: Path, monkeypatch):
+    from s120_inequality_innovation.oracle import cli, pool
+
+    def boom(*a, **k):
+        raise RuntimeError("no libjvm.so")
+
+    monkeypatch.chdir(tmp_path)  # the scenario XML copy goes under ./artifacts
+    for key in pool._WORKER:
+        monkeypatch.setitem(pool._WORKER, key, pool._WORKER[key])
+    monkeypatch.setattr(pool, "start_jvm", boom)
+    monkeypatch.setattr(cli, "run_java_oracle", lambda *a, **k: (_ for _ in ()).throw(AssertionError("retried")))
+    pool._init_worker("oracle.jar", None)
+    pool._run_job(pool.OracleJob(OracleRunSpec("baseline", overrides={}), tmp_path / "baseline",
+                                 xml=tmp_path / "main.xml"))
+    meta = json.loads((tmp_path / "baseline" / "meta.json").read_text())
+    assert meta["java_run_ok"] is False and meta["java_error"] == "no libjvm.so"
@@ -0,0 +1,66 @@
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from s120_inequality_innovation.oracle.xml_profile import write_lean_xml
+
+MAIN = """<beans xmlns="http://www.springframework.org/schema/beans">
+  <import resource="reports.xml"/>
+  <bean id="fileNamePrefix" class="java.lang.String"><constructor-arg value="data/"/></bean>
+  <bean id="taxPolicy" class="model.Taxes"><property name="theta" value="0.5"/></bean>
+  <bean id="reportList" class="java.util.ArrayList">
+    <constructor-arg><list><ref bean="nominalGDPReport"/><ref bean="bankLeverageReport"/></list></constructor-arg>
+  </bean>
+</beans>"""
+REPORTS = """<beans xmlns="http://www.springframework.org/schema/beans">
+  <bean id="nominalGDPReport" class="jmab.report.CSVReportingStrategy"/>
+  <bean id="bankLeverageReport" class="jmab.report.CSVReportingStrategy"/>
+  <bean id="cAvPriceReport" class="jmab.report.CSVReportingStrategy"/>
+</beans>"""
+
+
+def test_lean_profile_prunes_reports_and_applies_mapped_overrides(tmp_path: Path):
+    (tmp_path / "main.xml").write_text(MAIN)
+    (tmp_path / "reports.xml").write_text(REPORTS)
+    pmap = tmp_path / "map.yaml"
+    pmap.write_text('"beans/bean[id=taxPolicy]/property[name=theta]@value": "taxes.theta_progressive"\n')
+    out = tmp_path / "lean" / "main_lean.xml"
+    info = write_lean_xml(tmp_path / "main.xml", out, tmp_path / "raw",
+                          {"taxes": {"theta_progressive": 1.5}, "wage_rigidity": {"tu": 4}}, param_map=pmap)
+    assert info["pruned_reports"] == ["bankLeverageReport"]
+    assert info["overrides_applied"] == {"taxes.theta_progressive": 1.5}
+    assert info["overrides_unmapped"] == ["wage_rigidity.tu"]
+    text = out.read_text()
+    assert 'value="1.5"' in text and "bankLeverageReport" not in text and str(tmp_path / "raw") in text
+    imp = ET.parse(out).getroot().find("{http://www.springframework.org/schema/beans}import").attrib["resource"]
+    reports = (out.parent / imp).read_text()
+    assert "nominalGDPReport" in reports and "cAvPriceReport" in reports and "bankLeverageReport" not in reports
+
+
+CAPTURED = """<beans xmlns="http://www.springframework.org/schema/beans">
+  <bean id="fileNamePrefix" class="java.lang.String"><constructor-arg value="data/"/></bean>
+  <bean id="nominalGDPReport" class="net.sourceforge.jabm.report.ReportVariableWriterReport">
+    <constructor-arg>
+      <bean class="net.sourceforge.jabm.report.CSVWriter">
+        <constructor-arg><ref bean="fileNamePrefix"/></constructor-arg>
+        <constructor-arg value="data_nominalGDP.csv"/>
+      </bean>
+    </constructor-arg>
+  </bean>
+  <bean id="cProductivityWriter" class="net.sourceforge.jabm.report.CSVWriter">
+    <property name="fileNamePrefix" ref="fileNamePrefix"/><property name="numColumns" value="200"/>
+  </bean>
+  <bean id="consoleWriter" class="net.sourceforge.jabm.report.CSVWriter"/>
+</beans>"""
+
+
+def test_capture_swaps_file_writers_for_the_hook(tmp_path: Path):
+    (tmp_path / "main.xml").write_text(CAPTURED)
+    out = tmp_path / "cap" / "main_capture.xml"
+    info = write_lean_xml(tmp_path / "main.xml", out, tmp_path / "raw", prune=False, capture=True)
+    assert info["captured_reports"] == ["data_nominalGDP", "cProductivityWriter"] and info["pruned_reports"] == []
+    beans = {b.attrib.get("id"): b for b in ET.parse(out).getroot().iter("{http://www.springframework.org/schema/beans}bean")}
+    hooks = [b for b in beans.values() if b.attrib["class"] == "s120.capture.ReportCapture"]
+    assert len(hooks) == 2 and "fileNamePrefix" not in ET.tostring(beans["nominalGDPReport"], encoding="unicode")
+    cols = beans["cProductivityWriter"].find("{http://www.springframework.org/schema/beans}property")
+    assert cols.attrib == {"name": "numColumns", "value": "200"}
+    assert beans["consoleWriter"].attrib["class"].endswith("CSVWriter")
@@ -1,5 +1,7 @@
 from pathlib import Path
 
+import pytest
+
 from s120_inequality_innovation.core.registry import ParameterRegistry
 
 
@@ -14,3 +16,39 @@ def test_params_load_and_validate():
     # config hash stable for same file
     assert len(reg.config_hash()) == 12
 
+
+def test_compiled_view_is_frozen_and_matches_get():
+    reg = ParameterRegistry.from_files(overrides={"wage_rigidity": {"tu": 4}})
+    p = reg.compiled()
+    assert p is reg.compiled()
+    assert p.wage_rigidity.tu == 4 == reg.get("wage_rigidity.tu")
+    assert p.inventories.nu_target == reg.get("inventories.nu_target")
+    assert p.get("rates.i_l0") == reg.get("rates.i_l0") and p.get("rates.nope", 1.5) == 1.5
+    with pytest.raises(AttributeError):
+        p.wage_rigidity.tu = 5
+    with pytest.raises(AttributeError):
+        p.wage_rigidity.extra = 1
+
+
+def test_yaml_is_parsed_once_and_overrides_do_not_leak(monkeypatch):
+    from s120_inequality_innovation.core import registry
+
+    ParameterRegistry.from_files()
+    calls = []
+    monkeypatch.setattr(registry.yaml, "safe_load", lambda f: calls.append(f) or {})
+    a = ParameterRegistry.from_files(overrides={"taxes": {"theta_progressive": 1.5}})
+    b = ParameterRegistry.from_files()
+    assert calls == []
+    assert a.get("taxes.theta_progressive") == 1.5 and b.get("taxes.theta_progressive") == 0.0
+    c = b.with_overrides({"taxes": {"theta_progressive": 1.5}})
+    assert c.config_hash() == a.config_hash() and b.get("taxes.theta_progressive") == 0.0
+
+
+def test_compiled_registry_pickles_for_process_pools():
+    import pickle
+
+    reg = ParameterRegistry.from_files()
+    reg.compiled()
+    back = pickle.loads(pickle.dumps(reg))
+    assert back == reg and back.config_hash() == reg.config_hash()
+    assert back.compiled().wage_rigidity.tu == reg.compiled().wage_rigidity.tu
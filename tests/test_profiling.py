@@ -0,0 +1,51 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from s120_inequality_innovation.core.profiling import (
+    PROFILE_LABELS, NullProfiler, StepProfiler, merge, profiler_from_env, report,
+)
+from s120_inequality_innovation.core.registry import ParameterRegistry
+from s120_inequality_innovation.core.slice2_engine import run_slice2, step12_sales
+from s120_inequality_innovation.mc.runner import run_baseline_smoke
+
+
+def test_disabled_profiler_leaves_step_functions_untouched(tmp_path: Path, monkeypatch):
+    monkeypatch.delenv("S120_PROFILE", raising=False)
+    prof = profiler_from_env()
+    assert isinstance(prof, NullProfiler) and prof.wrap(step12_sales, 12) is step12_sales
+    run_slice2(ParameterRegistry.from_files(), horizon=5, outdir=tmp_path)
+    assert not (tmp_path / "profile.json").exists()
+
+
+def test_slice2_profile_counts_steps_and_checks(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("S120_PROFILE", "alloc")
+    run_slice2(ParameterRegistry.from_files(), horizon=12, outdir=tmp_path, checkpoint_every=5)
+    prof = json.loads((tmp_path / "profile.json").read_text(encoding="utf-8"))
+    calls = dict(zip(prof["labels"], prof["calls"]))
+    assert calls["01_production_planning"] == calls["12_consumption_market"] == 12
+    # Steps 1 and 3 are timed on their own; slice2 has no step 2 logic
+    assert calls["03_prices_interest_reservation_wage_revision"] == 12 and calls["02_labor_demand"] == 0
+    assert calls["fm_check"] == 4 * 12 and calls["checkpoint"] == 2 and calls["09_production"] == 0
+    assert prof["alloc"] and all(sum(h) == c for h, c in zip(prof["hist"], prof["calls"]))
+    assert "fm_check" in report(merge([prof, prof]))
+
+
+def test_sweep_style_report_merges_runs(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("S120_PROFILE", "1")
+    run_baseline_smoke(tmp_path, overrides={"meta": {"horizon": 10, "mc_runs": 2}})
+    merged = json.loads((tmp_path / "profile.json").read_text(encoding="utf-8"))
+    assert merged["runs"] == 2 and merged["labels"] == PROFILE_LABELS
+    assert merged["calls"][PROFILE_LABELS.index("output")] == 20
+    assert "output" in (tmp_path / "profile.txt").read_text(encoding="utf-8")
+
+
+def test_wrapped_step_records_wall_and_cpu():
+    prof = StepProfiler()
+    f = prof.wrap(lambda x: x + 1, "02_labor_demand")
+    assert f(1) == 2 and f.__wrapped__(1) == 2
+    i = prof.index(2)
+    assert prof.calls[i] == 1 and prof.wall_ns[i] > 0
+    assert prof.calls.dtype == prof.hist.dtype == np.int64 and prof.hist[i].sum() == 1
+    assert json.loads(json.dumps(prof.to_dict()))["calls"][i] == 1
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from s120_inequality_innovation.io.resources import rollup
+from s120_inequality_innovation.mc.ensemble_runner import run_baseline_ensemble
+from s120_inequality_innovation.mc.runner import run_baseline_smoke
+from s120_inequality_innovation.mc.sweeps import _summary_row
+
+
+def test_runs_record_resources_in_meta(tmp_path: Path):
+    runs = run_baseline_smoke(tmp_path, overrides={"meta": {"horizon": 12, "mc_runs": 2}})
+    for rd in runs:
+        res = json.loads((rd / "meta.json").read_text())["resources"]
+        assert res["periods"] == 12
+        assert res["wall_s"] > 0 and res["periods_per_s"] > 0
+        assert res["peak_rss_mb"] > 0 and res["bytes_written"] > 0
+        assert {"cpu_user_s", "cpu_sys_s"} <= set(res)
+    total = rollup(runs)
+    assert total["runs"] == 2 and total["periods"] == 24
+
+    rows = _summary_row("s", {"GDP": {"mean": 1.0, "ci_low": 0.9, "ci_high": 1.1, "n_runs": 2}},
+                        {"GDP": {"mean": 0.5}}, runs)
+    assert rows[0]["res_periods"] == 24 and rows[0]["res_runs"] == 2
+
+
+def test_vectorized_ensemble_splits_cost_per_run(tmp_path: Path):
+    runs = run_baseline_ensemble(tmp_path, horizon=10, n_runs=3)
+    res = [json.loads((s.parent / "meta.json").read_text())["resources"] for s in runs]
+    assert all(r["shared_by"] == 3 and r["periods"] == 10 for r in res)
+    assert res[0]["wall_s"] == res[1]["wall_s"]
@@ -0,0 +1,38 @@
+from pathlib import Path
+
+from s120_inequality_innovation.mc.cache import ResultCache
+
+
+def test_cache_hits_identical_configs(tmp_path: Path):
+    cache = ResultCache(tmp_path / "cache")
+    small = {"meta": {"horizon": 15, "mc_runs": 2}}
+    cache.run(tmp_path / "base", overrides=small)
+    # Same resolved parameters as the baseline (theta defaults to 0.0)
+    same = {"meta": {"horizon": 15, "mc_runs": 2}, "taxes": {"theta_progressive": 0.0}}
+    runs = cache.run(tmp_path / "theta_0.0", overrides=same)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert (runs[0] / "series.csv").read_bytes() == (tmp_path / "base" / "run_001" / "series.csv").read_bytes()
+    cache.run(tmp_path / "theta_0.0", overrides=same, force=True)
+    cache.run(tmp_path / "fork", overrides=small, variant={"fork_t": 5})
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert ResultCache(tmp_path / "cache").stats()["total_hits"] == 1
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path):
+    cache = ResultCache(tmp_path / "cache", max_bytes=1)
+    cache.run(tmp_path / "a", overrides={"meta": {"horizon": 5, "mc_runs": 1}})
+    cache.run(tmp_path / "b", overrides={"meta": {"horizon": 6, "mc_runs": 1}})
+    assert cache.stats()["entries"] == 1
+
+
+def test_cache_key_covers_run_options(tmp_path: Path, monkeypatch):
+    cache = ResultCache(tmp_path / "cache")
+    small = {"meta": {"horizon": 8, "mc_runs": 1}}
+    cache.run(tmp_path / "a", overrides=small, jobs=1)
+    cache.run(tmp_path / "b", overrides=small, jobs=2, store=True)  # neutral or default options share the entry
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.run(tmp_path / "c", overrides=small, checkpoint_every=4)
+    cache.run(tmp_path / "d", overrides=small, store=False)
+    monkeypatch.setenv("S120_FM_VERIFY", "checksum")
+    cache.run(tmp_path / "e", overrides=small)
+    assert (cache.hits, cache.misses) == (1, 4)
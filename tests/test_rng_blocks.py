@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from s120_inequality_innovation.core.rng import (
+    AGENT_CLASSES, BlockDraws, agent_stream, class_stream, innovation_gains, load_seeds, normal_rows,
+)
+
+
+SD = (0.2, 0.1, 0.08, 0.001, 0.002)
+
+
+@pytest.mark.parametrize("block", [1, 7, 1024])
+def test_block_rows_match_scalar_draws(block):
+    ref = np.random.default_rng(42)
+    expected = [[ref.normal(0, s) for s in SD] for _ in range(50)]
+    gen = np.random.default_rng(42)
+    draws = BlockDraws(gen, normal_rows(SD), block=block, remaining=50)
+    assert [draws() for _ in range(50)] == expected
+    # The generator ends where the scalar calls left it
+    assert gen.bit_generator.state == ref.bit_generator.state
+
+
+def test_restore_resumes_mid_block():
+    draws = BlockDraws(np.random.default_rng(3), normal_rows(SD), block=16)
+    head = [draws() for _ in range(21)]
+    saved = draws.state()
+    tail = [draws() for _ in range(30)]
+    again = BlockDraws(np.random.default_rng(0), normal_rows(SD), block=4)
+    again.restore(saved)
+    assert [again() for _ in range(30)] == tail and len(head) == 21
+
+
+def test_restore_replays_a_short_final_block_exactly():
+    # 10 periods in blocks of 4: the last block holds only 2 rows
+    ref = np.random.default_rng(5)
+    full = BlockDraws(ref, normal_rows(SD), block=4, remaining=10)
+    rows = [full() for _ in range(10)]
+    part = BlockDraws(np.random.default_rng(5), normal_rows(SD), block=4, remaining=10)
+    [part() for _ in range(9)]
+    gen = np.random.default_rng(0)
+    again = BlockDraws(gen, normal_rows(SD), block=4, remaining=1)
+    again.restore(part.state())
+    assert again() == rows[9] and gen.bit_generator.state == ref.bit_generator.state
+
+
+@pytest.mark.parametrize("xi_inn", [0.0, 0.015, 0.1, 0.3, 1.0])
+@pytest.mark.parametrize("bit_gen", [np.random.PCG64, np.random.Philox])
+def test_innovation_gains_match_per_period_draws(xi_inn, bit_gen):
+    ref = np.random.Generator(bit_gen(11))
+    expected = np.zeros(2000)
+    for t in range(2000):
+        if ref.random() < xi_inn:
+            expected[t] = abs(ref.normal(0.0, 0.01))
+    gen = np.random.Generator(bit_gen(11))
+    np.testing.assert_array_equal(innovation_gains(gen, xi_inn, 2000), expected)
+    assert str(gen.bit_generator.state) == str(ref.bit_generator.state)
+
+
+def test_innovation_gains_concatenate_across_blocks():
+    whole = innovation_gains(np.random.default_rng(9), 0.3, 100)
+    gen = np.random.default_rng(9)
+    parts = np.concatenate([innovation_gains(gen, 0.3, 37), innovation_gains(gen, 0.3, 63)])
+    np.testing.assert_array_equal(parts, whole)
+
+
+def test_agent_streams_are_reproducible_and_distinct():
+    seeds = load_seeds()
+    draws = {c: agent_stream(seeds, 2, "rng_match", c).random(4) for c in AGENT_CLASSES}
+    np.testing.assert_array_equal(draws["banks"], agent_stream(seeds, 2, "rng_match", "banks").random(4))
+    assert len({tuple(v) for v in draws.values()}) == len(AGENT_CLASSES)
+    assert not np.array_equal(draws["banks"], agent_stream(seeds, 3, "rng_match", "banks").random(4))
+    with pytest.raises(ValueError, match="agent class"):
+        agent_stream(seeds, 1, "rng_match", "workers")
+    np.testing.assert_array_equal(
+        class_stream(np.random.SeedSequence(seeds["rng_match"], spawn_key=(1,)), "banks").random(4), draws["banks"])
+
+
+def test_store_set_up_and_matching_streams_are_independent():
+    init, match = class_stream(7, "households", "init"), class_stream(7, "households", "match")
+    assert not np.array_equal(init.random(8), match.random(8))
+    np.testing.assert_array_equal(class_stream(7, "households").random(8), class_stream(7, "households", "init").random(8))
+    with pytest.raises(ValueError, match="purpose"):
+        class_stream(7, "households", "wages")
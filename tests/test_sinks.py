@@ -0,0 +1,23 @@
+from pathlib import Path
+
+import numpy as np
+
+from s120_inequality_innovation.core.registry import ParameterRegistry
+from s120_inequality_innovation.core.slice2_engine import run_slice2
+from s120_inequality_innovation.io.sinks import SinkFactory, load_columns
+
+
+def test_sink_backends_agree(tmp_path: Path):
+    reg = ParameterRegistry.from_files()
+    csv_series, _, _ = run_slice2(reg, horizon=30, outdir=tmp_path / "csv", sinks=SinkFactory("csv", block_rows=7))
+    npz_series, _, _ = run_slice2(reg, horizon=30, outdir=tmp_path / "npz", sinks="npz")
+    mem = SinkFactory("memory")
+    mem_series, _, _ = run_slice2(reg, horizon=30, outdir=tmp_path / "mem", sinks=mem)
+    assert npz_series.suffix == ".npz" and not (tmp_path / "mem" / "series.csv").exists()
+    a = load_columns(csv_series.with_suffix(""))
+    b = load_columns(npz_series.with_suffix(""))
+    c = mem.opened[mem_series].columns_dict()
+    for col in ["t", "GDP", "UNEMP", "PROD_C"]:
+        np.testing.assert_array_equal(a[col], b[col])
+        np.testing.assert_array_equal(a[col], c[col])
+    assert len(a["t"]) == 30
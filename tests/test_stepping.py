@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+from s120_inequality_innovation.core.registry import ParameterRegistry
+from s120_inequality_innovation.core.scheduler import run_simulation
+from s120_inequality_innovation.core.slice2_engine import run_slice2, stream_slice2
+from s120_inequality_innovation.core.stepping import Collector, accumulate, stop_when, to_sink
+from s120_inequality_innovation.io.online_stats import WindowStats
+from s120_inequality_innovation.io.sinks import SERIES_PROD_SCHEMA, SinkFactory, load_columns
+
+
+def test_stream_records_match_written_series(tmp_path: Path):
+    reg = ParameterRegistry.from_files()
+    run_slice2(reg, horizon=40, outdir=tmp_path / "disk", seed=5)
+    disk = load_columns(tmp_path / "disk" / "series")
+    rows = [rec.copy() for rec in stream_slice2(reg, horizon=40, outdir=None, seed=5)]
+    table = np.stack(rows)
+    for name in ("t", "GDP", "UNEMP", "PROD_C"):
+        np.testing.assert_array_equal(table[name], disk[name])
+
+
+def test_subscribers_write_accumulate_and_stop_early(tmp_path: Path):
+    reg = ParameterRegistry.from_files()
+    mem = SinkFactory("memory")
+    sink = mem(tmp_path / "copy", SERIES_PROD_SCHEMA)
+    stats = WindowStats([c for c, _ in SERIES_PROD_SCHEMA[1:]], 1, 100)
+    seen = Collector()
+    run_slice2(reg, horizon=100, outdir=tmp_path / "run", seed=5,
+               subscribers=[to_sink(sink), accumulate(stats), seen, stop_when(lambda r: r["t"] == 25)])
+    sink.close()
+    assert len(seen.table()) == 25 and stats.n == 25
+    written = load_columns(tmp_path / "run" / "series")
+    np.testing.assert_array_equal(sink.table()["GDP"], written["GDP"])
+    # Stopped runs still finish cleanly: end-of-run files are saved
+    assert (tmp_path / "run" / "window_stats.json").exists()
+
+
+def test_scheduler_stream_reports_period_residuals(tmp_path: Path):
+    seen = Collector()
+    res = run_simulation(ParameterRegistry.from_files(), horizon=3, artifacts_dir=tmp_path, subscribers=[seen])
+    assert res.timeline_csv.exists()
+    assert list(seen.table()["t"]) == [1, 2, 3]